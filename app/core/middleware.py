@@ -1,11 +1,18 @@
+import asyncio
+import base64
+import hashlib
+import json
 import time
 import uuid
-from typing import Callable
+from typing import Callable, Optional
 
-from fastapi import Request, Response
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.redis_client import redis_client
 
 logger = get_logger("middleware")
 
@@ -81,3 +88,179 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
 
         response = await call_next(request)
         return response
+
+
+class IdempotencyMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware to replay responses of mutating requests sent with an
+    Idempotency-Key header.
+
+    The first request with a key stores its status code and body in Redis;
+    retries with the same key get the stored response without reaching the
+    endpoint, and concurrent duplicates wait until the first request finishes.
+    Keys are scoped to the authenticated user, so a retry still matches after
+    the access token was refreshed. Anonymous requests and the auth endpoints,
+    whose cookies are not replayed, are always processed.
+    """
+
+    HEADER = "Idempotency-Key"
+    METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+    EXCLUDED_PATH_PREFIXES = ("/api/v1/auth/",)
+    MAX_KEY_LENGTH = 255
+    REPLAYED_HEADERS_EXCLUDED = {"content-length", "set-cookie"}
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        """
+        Process request once per Idempotency-Key.
+        """
+        idempotency_key = request.headers.get(self.HEADER)
+
+        if (
+            request.method not in self.METHODS
+            or not idempotency_key
+            or request.url.path.startswith(self.EXCLUDED_PATH_PREFIXES)
+        ):
+            return await call_next(request)
+
+        if len(idempotency_key) > self.MAX_KEY_LENGTH:
+            return JSONResponse(
+                status_code=400,
+                content={"detail": f"{self.HEADER} must be at most {self.MAX_KEY_LENGTH} characters"},
+            )
+
+        body = await request.body()
+        fingerprint = hashlib.sha256(
+            f"{request.method} {request.url.path}?{request.url.query}".encode() + b"\n" + body
+        ).hexdigest()
+
+        redis_key = None
+        try:
+            caller = await self._caller(request)
+            if caller is not None:
+                redis_key = f"idempotency:{caller}:{idempotency_key}"
+                stored = await self._acquire_or_wait(redis_key, fingerprint)
+        except Exception as exc:
+            logger.warning(f"Idempotency store unavailable, processing request: {str(exc)}")
+            return await call_next(request)
+
+        # Anonymous callers cannot be told apart, so their keys are not tracked.
+        if redis_key is None:
+            return await call_next(request)
+
+        if stored is not None:
+            return self._replay(stored, fingerprint)
+
+        try:
+            response = await call_next(request)
+        except Exception:
+            await self._release(redis_key)
+            raise
+
+        if response.status_code >= 500:
+            await self._release(redis_key)
+            return response
+
+        response_body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name not in self.REPLAYED_HEADERS_EXCLUDED
+        }
+
+        try:
+            await redis_client.set(
+                redis_key,
+                json.dumps(
+                    {
+                        "state": "completed",
+                        "fingerprint": fingerprint,
+                        "status_code": response.status_code,
+                        "headers": headers,
+                        "body": base64.b64encode(response_body).decode(),
+                    }
+                ),
+                ex=settings.idempotency_settings.IDEMPOTENCY_TTL_SECONDS,
+            )
+        except Exception as exc:
+            logger.warning(f"Failed to store idempotent response: {str(exc)}")
+
+        replayable = Response(content=response_body, status_code=response.status_code)
+        replayable.raw_headers = response.raw_headers
+        return replayable
+
+    @staticmethod
+    async def _caller(request: Request) -> Optional[str]:
+        """
+        Return the subject of the request's access token, or None if it has no
+        valid one. The claims stay on request.state for the endpoint.
+        """
+        # Imported here: app.utils.jwt loads the app.services package, which
+        # imports app.utils.jwt back, so it cannot be the first to load it.
+        from app.utils.jwt import get_access_claims
+
+        try:
+            claims = await get_access_claims(request)
+        except HTTPException:
+            return None
+
+        return str(claims["sub"])
+
+    async def _acquire_or_wait(self, redis_key: str, fingerprint: str) -> Optional[dict]:
+        """
+        Take the in-flight lock for the key and return None, or return the
+        stored state of the request that already holds the key.
+        """
+        idempotency_settings = settings.idempotency_settings
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + idempotency_settings.IDEMPOTENCY_WAIT_TIMEOUT_SECONDS
+        in_flight = json.dumps({"state": "in_flight", "fingerprint": fingerprint})
+
+        while True:
+            acquired = await redis_client.set(
+                redis_key,
+                in_flight,
+                nx=True,
+                ex=idempotency_settings.IDEMPOTENCY_LOCK_TTL_SECONDS,
+            )
+            if acquired:
+                return None
+
+            raw_state = await redis_client.get(redis_key)
+            if raw_state:
+                state = json.loads(raw_state)
+                if state["state"] == "completed" or state["fingerprint"] != fingerprint:
+                    return state
+
+            if loop.time() >= deadline:
+                return {"state": "in_flight", "fingerprint": fingerprint}
+
+            await asyncio.sleep(idempotency_settings.IDEMPOTENCY_POLL_INTERVAL_MS / 1000)
+
+    async def _release(self, redis_key: str) -> None:
+        try:
+            await redis_client.delete(redis_key)
+        except Exception as exc:
+            logger.warning(f"Failed to release idempotency key: {str(exc)}")
+
+    def _replay(self, stored: dict, fingerprint: str) -> Response:
+        if stored["fingerprint"] != fingerprint:
+            return JSONResponse(
+                status_code=422,
+                content={"detail": f"{self.HEADER} was already used for a different request"},
+            )
+
+        if stored["state"] != "completed":
+            return JSONResponse(
+                status_code=409,
+                content={"detail": f"A request with this {self.HEADER} is still being processed"},
+            )
+
+        logger.info(f"Replaying stored response for {self.HEADER}")
+
+        response = Response(
+            content=base64.b64decode(stored["body"]),
+            status_code=stored["status_code"],
+            headers=stored["headers"],
+        )
+        response.headers["Idempotent-Replayed"] = "true"
+        return response
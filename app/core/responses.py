@@ -0,0 +1,33 @@
+from functools import lru_cache
+from typing import Any, Type
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """
+    Get the cached TypeAdapter of list[model], to validate or serialize a list in one pass.
+    """
+    return TypeAdapter(list[model])
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSON response that takes Pydantic models, lists of models or plain JSON data
+    and encodes them straight to bytes with pydantic-core, instead of dumping
+    models to dicts first and encoding the dicts again with the json module.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+
+        if isinstance(content, list) and content:
+            model = type(content[0])
+            if issubclass(model, BaseModel) and all(type(item) is model for item in content):
+                return list_adapter(model).dump_json(content)
+
+        return to_json(content)
@@ -84,12 +84,122 @@ class AuthSettings(BaseSettings):
     )
 
 
+class VoteSettings(BaseSettings):
+    VOTE_BATCH_MAX_SIZE: int = 500
+    VOTE_INGESTION_MODE: str = "direct"  # direct or queue
+    VOTE_QUEUE_STREAM: str = "votes:ingest"
+    VOTE_QUEUE_GROUP: str = "votes-flusher"
+    VOTE_QUEUE_BATCH_SIZE: int = 500
+    VOTE_QUEUE_LINGER_MS: int = 200
+    VOTE_QUEUE_CLAIM_IDLE_MS: int = 60000
+    VOTE_RECEIPT_TTL_SECONDS: int = 86400
+    TALLY_RECONCILE_INTERVAL_SECONDS: int = 60
+    TALLY_RECONCILE_GRACE_SECONDS: int = 3600
+    TALLY_RETENTION_SECONDS: int = 604800
+    VOTE_LOG_BUFFER_SIZE: int = 10000
+    VOTE_LOG_BATCH_SIZE: int = 1000
+    VOTE_LOG_FLUSH_INTERVAL_MS: int = 500
+    VOTE_STREAM_CHUNK_SIZE: int = 1000
+
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=False, extra="ignore"
+    )
+
+
+class IdempotencySettings(BaseSettings):
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_LOCK_TTL_SECONDS: int = 30
+    IDEMPOTENCY_WAIT_TIMEOUT_SECONDS: float = 10.0
+    IDEMPOTENCY_POLL_INTERVAL_MS: int = 50
+
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=False, extra="ignore"
+    )
+
+
+class ResultsSettings(BaseSettings):
+    RESULTS_STALENESS_SECONDS: int = 5
+    RESULTS_REFRESH_INTERVAL_SECONDS: int = 2
+    RESULTS_STREAM_TICK_MS: int = 250
+    RESULTS_STREAM_HEARTBEAT_SECONDS: int = 15
+
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=False, extra="ignore"
+    )
+
+
+class ElectionCacheSettings(BaseSettings):
+    ELECTION_CACHE_TTL_SECONDS: int = 300
+    ELECTION_CACHE_XFETCH_BETA: float = 1.0
+
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=False, extra="ignore"
+    )
+
+
+class VersionSettings(BaseSettings):
+    VERSION_KEY_TTL_SECONDS: int = 604800
+
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=False, extra="ignore"
+    )
+
+
+class CountSettings(BaseSettings):
+    COUNT_EXACT_LIMIT: int = 10000
+    COUNT_RECONCILE_INTERVAL_SECONDS: int = 300
+    COUNT_ESTIMATE_TOLERANCE: float = 0.1
+
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=False, extra="ignore"
+    )
+
+
+class PasswordHashSettings(BaseSettings):
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=False, extra="ignore"
+    )
+
+
+class PrincipalCacheSettings(BaseSettings):
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 900
+
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=False, extra="ignore"
+    )
+
+
+class TokenRevocationSettings(BaseSettings):
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100000
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    TOKEN_REVOCATION_BLOOM_REBUILD_SECONDS: int = 3600
+
+    model_config = SettingsConfigDict(
+        env_file=".env", case_sensitive=False, extra="ignore"
+    )
+
+
 class Settings(BaseSettings):
     app_settings: AppSettings = AppSettings()
     database_settings: DatabaseSettings = DatabaseSettings()
     redis_settings: RedisSettings = RedisSettings()
     logging_settings: LoggingSettings = LoggingSettings()
     auth_settings: AuthSettings = AuthSettings()
+    vote_settings: VoteSettings = VoteSettings()
+    idempotency_settings: IdempotencySettings = IdempotencySettings()
+    results_settings: ResultsSettings = ResultsSettings()
+    election_cache_settings: ElectionCacheSettings = ElectionCacheSettings()
+    version_settings: VersionSettings = VersionSettings()
+    count_settings: CountSettings = CountSettings()
+    password_hash_settings: PasswordHashSettings = PasswordHashSettings()
+    principal_cache_settings: PrincipalCacheSettings = PrincipalCacheSettings()
+    token_revocation_settings: TokenRevocationSettings = TokenRevocationSettings()
 
 
 settings = Settings()
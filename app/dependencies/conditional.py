@@ -0,0 +1,29 @@
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    """
+    Build a 304 response if the If-None-Match header of the request matches etag.
+    """
+    if etag is None:
+        return None
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored.
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" not in candidates and etag not in candidates:
+        return None
+
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def etag_headers(etag: Optional[str]) -> dict[str, str]:
+    """
+    Build the ETag header of a response, if an ETag could be computed.
+    """
+    return {"ETag": etag} if etag else {}
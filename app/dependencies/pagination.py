@@ -0,0 +1,60 @@
+from typing import Optional
+
+from fastapi import Query
+
+from app.exceptions.user import ValidationError
+from app.schemas.pagination import TotalCount
+from app.utils.cursor import decode_cursor, decode_rank_cursor
+
+
+def get_cursor(
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from the X-Next-Cursor header of the previous page"
+    ),
+) -> Optional[tuple]:
+    """
+    Decode the keyset cursor of a list request.
+    """
+    if cursor is None:
+        return None
+
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise ValidationError("Invalid cursor")
+
+
+def get_rank_cursor(
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from the X-Next-Cursor header of the previous page"
+    ),
+) -> Optional[tuple]:
+    """
+    Decode the keyset cursor of a ranked search request.
+    """
+    if cursor is None:
+        return None
+
+    try:
+        return decode_rank_cursor(cursor)
+    except ValueError:
+        raise ValidationError("Invalid cursor")
+
+
+def cursor_headers(next_cursor: Optional[str]) -> dict[str, str]:
+    """
+    Build the pagination headers of a list response.
+    """
+    headers = {"X-Has-More": "true" if next_cursor else "false"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return headers
+
+
+def total_headers(total: Optional[TotalCount]) -> dict[str, str]:
+    """
+    Build the total headers of a list response.
+    """
+    if total is None:
+        return {}
+    return {"X-Total-Count": str(total.value), "X-Total-Count-Kind": total.kind.value}
@@ -10,9 +10,9 @@ from app.exceptions.user import (
     TokenBlacklistedError,
     TokenNotFoundError,
 )
-from app.models import User
+from app.schemas.user import Principal
 from app.services.user import user_service
-from app.utils.jwt import is_token_blacklisted, is_token_type
+from app.utils.jwt import get_access_claims, is_token_blacklisted, is_token_type
 
 logger = get_logger("token_dependency")
 
@@ -65,14 +65,14 @@ async def validate_refresh_token(
 
 
 async def validate_access_token(
+    request: Request,
     access_token: str = Depends(get_access_token_from_cookie),
 ) -> str:
     """
-    Validate access token (correct type).
+    Validate access token (signature, expiry and type), sharing the claims
+    decoded for the request.
     """
-    if not is_token_type(access_token, "access"):
-        logger.warning("Invalid access token type")
-        raise InvalidTokenTypeError("Invalid token type")
+    await get_access_claims(request)
 
     return access_token
 
@@ -80,9 +80,10 @@ async def validate_access_token(
 async def get_current_user(
     request: Request,
     session: AsyncSession = Depends(get_db),
-) -> User:
+) -> Principal:
     """
-    Get current authenticated user from token.
+    Get current authenticated user from token. The token is verified and the
+    user loaded once per request, however many dependencies ask for them.
     """
     return await user_service.get_user_by_token(request, session)
 
@@ -90,7 +91,7 @@ async def get_current_user(
 async def get_optional_user(
     request: Request,
     session: AsyncSession = Depends(get_db),
-) -> User | None:
+) -> Principal | None:
     """
     Get current authenticated user from token if available, otherwise return None.
     """
@@ -1,5 +1,7 @@
 from fastapi import HTTPException, status
 
+from app.schemas.vote import VoteRejectionReason
+
 
 class UserNotFoundError(HTTPException):
     """Exception raised when user is not found."""
@@ -29,6 +31,13 @@ class TokenNotFoundError(HTTPException):
         super().__init__(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
 
 
+class TokenInvalidError(HTTPException):
+    """Exception raised when token cannot be verified or has expired."""
+
+    def __init__(self, detail: str = "Invalid or expired token"):
+        super().__init__(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
 class InvalidTokenTypeError(HTTPException):
     """Exception raised when token type is invalid."""
 
@@ -63,3 +72,42 @@ class ValidationError(HTTPException):
     def __init__(self, detail: str = "Validation error"):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
+
+class ServiceBusyError(HTTPException):
+    """Exception raised when a bounded resource is saturated and the request should be retried."""
+
+    def __init__(self, detail: str = "Service busy, retry later", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class VoteRejectedError(HTTPException):
+    """Exception raised when election rules reject a vote."""
+
+    STATUS_CODES = {
+        VoteRejectionReason.ELECTION_NOT_FOUND: status.HTTP_404_NOT_FOUND,
+        VoteRejectionReason.CANDIDATE_NOT_IN_ELECTION: status.HTTP_400_BAD_REQUEST,
+        VoteRejectionReason.MULTIPLE_CHOICE_ELECTION: status.HTTP_400_BAD_REQUEST,
+    }
+
+    MESSAGES = {
+        VoteRejectionReason.ELECTION_NOT_FOUND: "Election not found",
+        VoteRejectionReason.ELECTION_NOT_STARTED: "Election has not started yet",
+        VoteRejectionReason.ELECTION_ENDED: "Election has already ended",
+        VoteRejectionReason.CANDIDATE_NOT_IN_ELECTION: "Candidate does not belong to this election",
+        VoteRejectionReason.ALREADY_VOTED_FOR_CANDIDATE: "You have already voted for this candidate",
+        VoteRejectionReason.VOTE_LIMIT_REACHED: "Vote limit reached, update an existing vote instead",
+        VoteRejectionReason.REVOTING_DISABLED: "Vote limit reached and revoting is disabled for this election",
+        VoteRejectionReason.MULTIPLE_CHOICE_ELECTION: "Election allows several votes per voter, cast or update them individually",
+        VoteRejectionReason.ELECTION_CHANGED: "Election or candidate changed before the vote was stored",
+    }
+
+    def __init__(self, reason: VoteRejectionReason):
+        self.reason = reason
+        super().__init__(
+            status_code=self.STATUS_CODES.get(reason, status.HTTP_409_CONFLICT),
+            detail={"reason": reason.value, "message": self.MESSAGES[reason]},
+        )
@@ -1,10 +1,16 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from app.core.middleware import LoggingMiddleware, RequestContextMiddleware
+from app.core.middleware import (
+    IdempotencyMiddleware,
+    LoggingMiddleware,
+    RequestContextMiddleware,
+)
 from app.core.logging_config import get_logger, setup_logging
 from app.core.settings import settings
 from app.routers.auth import router as auth_router
@@ -13,19 +19,63 @@ from app.routers.healthcheck import router as healthcheck_router
 from app.routers.user import router as user_router
 from app.routers.user_profile import router as user_profile_router
 from app.routers.vote import router as vote_router
+from app.services.password_hasher import password_hasher
+from app.services.principal_cache import principal_cache
+from app.services.results_broadcaster import results_broadcaster
+from app.services.token_revocation import token_revocation
+from app.services.vote_log import vote_log_buffer
+from app.utils.jwt import migrate_legacy_blacklist
+from app.workers.count_reconciler import count_reconciler
+from app.workers.results_refresher import results_refresher
+from app.workers.tally_reconciler import tally_reconciler
+from app.workers.vote_queue import vote_queue_flusher
 
 setup_logging()
 logger = get_logger("app")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start and stop background workers.
+    """
+    await password_hasher.start()
+    await principal_cache.start()
+    await token_revocation.start()
+    await migrate_legacy_blacklist()
+    await vote_log_buffer.start()
+    if settings.vote_settings.VOTE_INGESTION_MODE == "queue":
+        await vote_queue_flusher.start()
+    await tally_reconciler.start()
+    await count_reconciler.start()
+    await results_refresher.start()
+    await results_broadcaster.start()
+
+    yield
+
+    logger.info("Application shutting down...")
+    await vote_queue_flusher.stop()
+    await results_broadcaster.stop()
+    await results_refresher.stop()
+    await count_reconciler.stop()
+    await tally_reconciler.stop()
+    await vote_log_buffer.stop()
+    await token_revocation.stop()
+    await principal_cache.stop()
+    await password_hasher.stop()
+
+
 app = FastAPI(
     title="Election Backend",
     description="Backend for the Election System",
     version="0.1.0",
     docs_url="/docs",
+    lifespan=lifespan,
 )
 
 logger.info("Application starting up...")
 
+app.add_middleware(IdempotencyMiddleware)
 app.add_middleware(RequestContextMiddleware)
 app.add_middleware(LoggingMiddleware)
 
@@ -30,9 +30,11 @@ class Election(IdMixin, Base):
     __table_args__ = (
         Index('idx_election_start_date', 'start_date'),
         Index('idx_election_end_date', 'end_date'),
-        Index('idx_election_is_public', 'is_public'),
-        Index('idx_election_created_at', 'created_at'),
+        Index('idx_election_created_at_id', 'created_at', 'id'),
         Index('idx_election_dates', 'start_date', 'end_date'),
+        Index('idx_election_public_created_at_id', 'is_public', 'created_at', 'id'),
+        Index('idx_election_public_end_start', 'is_public', 'end_date', 'start_date'),
+        Index('idx_election_owner_created_at_id', 'owner_id', 'created_at', 'id'),
     )
 
     # Relationships
@@ -46,7 +48,7 @@ class Election(IdMixin, Base):
     candidates: Mapped[list["Candidate"]] = relationship("Candidate", back_populates="election", cascade="all, delete-orphan")
     votes: Mapped[list["Vote"]] = relationship("Vote", back_populates="election")
     accesses: Mapped[list["ElectionAccess"]] = relationship("ElectionAccess", back_populates="election")
-    results_cache: Mapped[Optional["ElectionResultsCache"]] = relationship("ElectionResultsCache", back_populates="election", uselist=False)
+    results_cache: Mapped[Optional["ElectionResultsCache"]] = relationship("ElectionResultsCache", back_populates="election", uselist=False, cascade="all, delete-orphan")
     attachments: Mapped[list["Attachment"]] = relationship("Attachment", back_populates="election")
 
     def __repr__(self):
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import String, DateTime, Index
+from sqlalchemy import String, DateTime, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -28,10 +28,12 @@ class User(IdMixin, Base):
     first_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     last_name: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None, nullable=True)
+    # Tokens carry the generation they were issued at; bumping it revokes them all.
+    token_generation: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
 
     __table_args__ = (
         Index('idx_user_phone', 'phone'),
-        Index('idx_user_created_at', 'created_at'),
+        Index('idx_user_created_at_id', 'created_at', 'id'),
     )
 
     # Relationships
@@ -1,7 +1,7 @@
 from datetime import date, datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey, DateTime, Date
+from sqlalchemy import String, ForeignKey, DateTime, Date, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -25,6 +25,10 @@ class UserProfile(IdMixin, Base):
     address: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None, nullable=True)
 
+    __table_args__ = (
+        Index('idx_user_profile_created_at_id', 'created_at', 'id'),
+    )
+
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="profile")
 
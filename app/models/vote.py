@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey, DateTime, Index
+from sqlalchemy import String, ForeignKey, DateTime, Index, Boolean, false, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -21,20 +21,35 @@ class Vote(IdMixin, Base):
     voter_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), nullable=False)
     candidate_id: Mapped[str] = mapped_column(String(36), ForeignKey("candidates.id"), nullable=False)
     created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None, nullable=True)
+    # True for the ballot of a voter in an election with max_votes == 1. The
+    # partial unique index below then allows one such ballot per voter.
+    single_choice: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false(), nullable=False)
 
     __table_args__ = (
         Index('idx_vote_election_id', 'election_id'),
         Index('idx_vote_voter_id', 'voter_id'),
         Index('idx_vote_candidate_id', 'candidate_id'),
-        Index('idx_vote_created_at', 'created_at'),
+        Index('idx_vote_created_at_id', 'created_at', 'id'),
         Index('idx_vote_election_voter', 'election_id', 'voter_id'),
+        Index(
+            'uq_vote_single_choice_election_voter',
+            'election_id',
+            'voter_id',
+            unique=True,
+            postgresql_where=text('single_choice'),
+            sqlite_where=text('single_choice'),
+        ),
     )
 
     # Relationships
     election: Mapped["Election"] = relationship("Election", back_populates="votes")
     voter: Mapped["User"] = relationship("User", back_populates="votes", foreign_keys=[voter_id])
     candidate: Mapped["Candidate"] = relationship("Candidate", back_populates="votes")
-    logs: Mapped[list["VoteLog"]] = relationship("VoteLog", back_populates="vote")
+    logs: Mapped[list["VoteLog"]] = relationship(
+        "VoteLog",
+        back_populates="vote",
+        primaryjoin="Vote.id == foreign(VoteLog.vote_id)",
+    )
 
     def __repr__(self):
         return f"<Vote(id={self.id}, election_id={self.election_id}, voter_id={self.voter_id}, candidate_id={self.candidate_id})>"
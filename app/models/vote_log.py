@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 
-from sqlalchemy import String, ForeignKey, DateTime, Index
+from sqlalchemy import String, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -14,7 +14,8 @@ if TYPE_CHECKING:
 class VoteLog(IdMixin, Base):
     __tablename__ = "vote_logs"
 
-    vote_id: Mapped[str] = mapped_column(String(36), ForeignKey("votes.id"), nullable=False)
+    # Not a foreign key, so the audit trail outlives deleted votes.
+    vote_id: Mapped[str] = mapped_column(String(36), nullable=False)
     action: Mapped[str] = mapped_column(String, nullable=False)
     timestamp: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None, nullable=True)
 
@@ -24,7 +25,11 @@ class VoteLog(IdMixin, Base):
     )
 
     # Relationships
-    vote: Mapped["Vote"] = relationship("Vote", back_populates="logs")
+    vote: Mapped[Optional["Vote"]] = relationship(
+        "Vote",
+        back_populates="logs",
+        primaryjoin="foreign(VoteLog.vote_id) == Vote.id",
+    )
 
     def __repr__(self):
         return f"<VoteLog(id={self.id}, vote_id={self.vote_id}, action='{self.action}')>"
@@ -1,6 +1,6 @@
-from typing import Any, Type
+from typing import Any, Optional, Type
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, literal, select, text, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -49,6 +49,31 @@ class BaseRepository:
             logger.error(f"Error creating {self.log_data_name}: {str(e)}")
             raise
 
+    async def create_many(
+        self,
+        data: list[dict[str, Any]],
+    ) -> int:
+        if not data:
+            return 0
+
+        try:
+            await self.session.execute(insert(self.model), data)
+            await self.session.commit()
+
+            return len(data)
+
+        except IntegrityError as e:
+            await self.session.rollback()
+            logger.error(
+                f"Database integrity error creating {self.log_data_name} batch: {str(e)}"
+            )
+            raise ValueError(str(e))
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error creating {self.log_data_name} batch: {str(e)}")
+            raise
+
     async def update(
         self,
         data: Any,
@@ -149,9 +174,12 @@ class BaseRepository:
     async def read_many(
         self,
         condition: Any = False,
+        options: Any = None,
     ) -> Any:
         try:
-            result = await self.session.execute(select(self.model).where(condition))
+            result = await self.session.execute(
+                select(self.model).where(condition).options(*(options or []))
+            )
             data = result.scalars().all()
 
             if not data:
@@ -164,25 +192,83 @@ class BaseRepository:
             logger.error(f"Error reading {self.log_data_name}: {str(e)}")
             raise
 
-    async def read_paginated(
+    async def read_keyset(
         self,
         condition: Any = True,
-        page: int = 1,
-        page_size: int = 0,
-    ) -> Any:
+        after: Any = None,
+        limit: int = 10,
+        options: Any = None,
+    ) -> tuple[list[Any], bool]:
+        """
+        Read up to limit rows ordered by (created_at, id), starting after the
+        (created_at, id) key of the previous page. Rows without created_at come
+        last, ordered by id. Returns the rows and whether more rows follow.
+        """
         try:
-            offset = (page - 1) * page_size
+            model = self.model
+            base_query = select(model).where(condition).options(*(options or []))
+            data: list[Any] = []
+
+            # Each part is a plain range scan over the (created_at, id) index.
+            if after is None or after[0] is not None:
+                dated_query = base_query.where(model.created_at.is_not(None))
+                if after is not None:
+                    dated_query = dated_query.where(
+                        tuple_(model.created_at, model.id) > tuple_(*after)
+                    )
+                result = await self.session.execute(
+                    dated_query.order_by(model.created_at, model.id).limit(limit + 1)
+                )
+                data.extend(result.scalars().all())
+
+            if len(data) <= limit:
+                undated_query = base_query.where(model.created_at.is_(None))
+                if after is not None and after[0] is None:
+                    undated_query = undated_query.where(model.id > after[1])
+                result = await self.session.execute(
+                    undated_query.order_by(model.id).limit(limit + 1 - len(data))
+                )
+                data.extend(result.scalars().all())
+
+            return data[:limit], len(data) > limit
+
+        except Exception as e:
+            logger.error(f"Error reading {self.log_data_name}: {str(e)}")
+            raise
+
+    async def count(self, condition: Any = True, limit: Optional[int] = None) -> int:
+        """
+        Count the rows matching condition. With a limit, counting stops after
+        limit rows, so the cost is bounded whatever the size of the table.
+        """
+        try:
+            query = select(literal(1)).select_from(self.model).where(condition)
+            if limit is not None:
+                query = query.limit(limit)
+
             result = await self.session.execute(
-                select(self.model).where(condition).offset(offset).limit(page_size)
+                select(func.count()).select_from(query.subquery())
             )
-            data = result.scalars().all()
+            return result.scalar_one()
 
-            if not data:
-                logger.warning(f"{self.log_data_name} not found.")
-                return []
+        except Exception as e:
+            logger.error(f"Error counting {self.log_data_name}: {str(e)}")
+            raise
 
-            return data
+    async def estimate_count(self) -> Optional[int]:
+        """
+        Read the planner's row estimate of the whole table from pg_class.
+        Returns None if the table has not been analyzed yet.
+        """
+        try:
+            result = await self.session.execute(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)"),
+                {"table_name": self.model.__tablename__},
+            )
+            estimate = result.scalar_one_or_none()
+
+            return int(estimate) if estimate is not None and estimate >= 0 else None
 
         except Exception as e:
-            logger.error(f"Error reading {self.log_data_name}: {str(e)}")
+            logger.error(f"Error estimating {self.log_data_name} count: {str(e)}")
             raise
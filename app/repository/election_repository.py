@@ -1,10 +1,204 @@
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import delete, insert, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.logging_config import get_logger
+from app.models.attachment import Attachment
+from app.models.candidates import Candidate
 from app.models.election import Election
+from app.models.election_setting import ElectionSetting
 from app.repository.base_repository import BaseRepository
 
+logger = get_logger("election_repo")
+
+# An election matches through its own text or the text of any candidate; it is
+# ranked by its best match. Both branches are served by the GIN indexes on the
+# generated search_vector columns.
+_SEARCH_QUERY = """
+    WITH query AS (
+        SELECT to_tsquery('simple', :tsquery) AS q
+    ), matches AS (
+        SELECT e.id, ts_rank(e.search_vector, query.q) AS rank
+        FROM elections e, query
+        WHERE e.search_vector @@ query.q
+        UNION ALL
+        SELECT c.election_id, ts_rank(c.search_vector, query.q) AS rank
+        FROM candidates c, query
+        WHERE c.search_vector @@ query.q
+    ), ranked AS (
+        SELECT id, CAST(max(rank) AS REAL) AS rank
+        FROM matches
+        GROUP BY id
+    )
+    SELECT id, rank
+    FROM ranked
+    {after}
+    ORDER BY rank DESC, id
+    LIMIT :limit
+"""
+
+_SEARCH_AFTER = """
+    WHERE rank < CAST(:after_rank AS REAL)
+       OR (rank = CAST(:after_rank AS REAL) AND id > :after_id)
+"""
+
 
 class ElectionRepository(BaseRepository):
     def __init__(self, session: AsyncSession):
         super().__init__(model=Election, session=session, log_data_name="Election")
 
+    async def create_aggregate(
+        self,
+        election: Election,
+        setting: dict[str, Any],
+        candidates: list[dict[str, Any]],
+        attachments: list[dict[str, Any]],
+    ) -> Election:
+        """
+        Insert an election with its settings, candidates and attachments in one
+        transaction: one INSERT per table, multi-row for candidates and
+        attachments, and a single commit.
+        """
+        try:
+            self.session.add(election)
+            await self.session.flush()
+
+            await self._insert_children(election.id, ElectionSetting, [setting])
+            await self._insert_children(election.id, Candidate, candidates)
+            await self._insert_children(election.id, Attachment, attachments)
+
+            await self.session.commit()
+
+            return election
+
+        except IntegrityError as e:
+            await self.session.rollback()
+            logger.error(
+                f"Database integrity error creating {self.log_data_name}: {str(e)}"
+            )
+            raise ValueError(str(e))
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error creating {self.log_data_name}: {str(e)}")
+            raise
+
+    async def update_aggregate(
+        self,
+        election_id: str,
+        changes: dict[str, Any],
+        setting: Optional[dict[str, Any]] = None,
+        setting_fields: Iterable[str] = (),
+        candidates: Optional[list[dict[str, Any]]] = None,
+        attachments: Optional[list[dict[str, Any]]] = None,
+    ) -> None:
+        """
+        Update an election and its children in one transaction and commit once.
+        The settings row is upserted: created from setting if missing, otherwise
+        only setting_fields are overwritten. Candidates and attachments that are
+        given replace the existing ones with one DELETE and one multi-row INSERT.
+        """
+        try:
+            if changes:
+                await self.session.execute(
+                    update(Election).where(Election.id == election_id).values(**changes)
+                )
+
+            if setting is not None:
+                statement = pg_insert(ElectionSetting).values(
+                    election_id=election_id, **setting
+                )
+                overwrite = {field: statement.excluded[field] for field in setting_fields}
+                await self.session.execute(
+                    statement.on_conflict_do_update(
+                        index_elements=[ElectionSetting.election_id], set_=overwrite
+                    )
+                    if overwrite
+                    else statement.on_conflict_do_nothing(
+                        index_elements=[ElectionSetting.election_id]
+                    )
+                )
+
+            if candidates is not None:
+                await self.session.execute(
+                    delete(Candidate).where(Candidate.election_id == election_id)
+                )
+                await self._insert_children(election_id, Candidate, candidates)
+
+            if attachments is not None:
+                await self.session.execute(
+                    delete(Attachment).where(Attachment.election_id == election_id)
+                )
+                await self._insert_children(election_id, Attachment, attachments)
+
+            await self.session.commit()
+
+        except IntegrityError as e:
+            await self.session.rollback()
+            logger.error(
+                f"Database integrity error updating {self.log_data_name}: {str(e)}"
+            )
+            raise ValueError(str(e))
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error updating {self.log_data_name}: {str(e)}")
+            raise
+
+    async def _insert_children(
+        self, election_id: str, model: Any, rows: list[dict[str, Any]]
+    ) -> None:
+        if not rows:
+            return
+
+        await self.session.execute(
+            insert(model), [{**row, "election_id": election_id} for row in rows]
+        )
+
+    async def read_open_windows(
+        self, now: datetime, ended_after: datetime
+    ) -> list[tuple[str, datetime]]:
+        """
+        Read the (id, end_date) pairs of elections that have started and have
+        not ended before ended_after.
+        """
+        try:
+            result = await self.session.execute(
+                select(Election.id, Election.end_date).where(
+                    Election.start_date <= now, Election.end_date >= ended_after
+                )
+            )
+            return [tuple(row) for row in result.all()]
+
+        except Exception as e:
+            logger.error(f"Error reading open {self.log_data_name} ids: {str(e)}")
+            raise
+
+    async def search(
+        self, tsquery: str, after: Optional[tuple] = None, limit: int = 10
+    ) -> tuple[list[tuple[str, float]], bool]:
+        """
+        Read the (id, rank) pairs of the elections matching a tsquery, best
+        match first, continuing after the (rank, id) key of a previous page.
+        Returns the page and whether more rows follow.
+        """
+        try:
+            params = {"tsquery": tsquery, "limit": limit + 1}
+            if after is not None:
+                params["after_rank"], params["after_id"] = after
+
+            result = await self.session.execute(
+                text(_SEARCH_QUERY.format(after=_SEARCH_AFTER if after is not None else "")),
+                params,
+            )
+            rows = [(row.id, row.rank) for row in result]
+
+            return rows[:limit], len(rows) > limit
+
+        except Exception as e:
+            logger.error(f"Error searching {self.log_data_name}: {str(e)}")
+            raise
@@ -1,10 +1,82 @@
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.logging_config import get_logger
+from app.models.candidates import Candidate
 from app.models.election_results_cache import ElectionResultsCache
+from app.models.vote import Vote
 from app.repository.base_repository import BaseRepository
 
+logger = get_logger("election_results_cache_repo")
+
 
 class ElectionResultsCacheRepository(BaseRepository):
     def __init__(self, session: AsyncSession):
         super().__init__(model=ElectionResultsCache, session=session, log_data_name="ElectionResultsCache")
 
+    async def read_vote_counts(self, election_id: str) -> list[Any]:
+        """
+        Count the votes of every candidate of an election in a single GROUP BY.
+        Candidates without votes are included with a count of zero.
+        """
+        try:
+            votes = func.count(Vote.id).label("votes")
+            result = await self.session.execute(
+                select(Candidate.id.label("candidate_id"), Candidate.name, votes)
+                .outerjoin(Vote, Vote.candidate_id == Candidate.id)
+                .where(Candidate.election_id == election_id)
+                .group_by(Candidate.id, Candidate.name)
+                .order_by(votes.desc(), Candidate.name)
+            )
+            return list(result.all())
+
+        except Exception as e:
+            logger.error(f"Error counting votes for {self.log_data_name}: {str(e)}")
+            raise
+
+    async def upsert(
+        self, election_id: str, results_json: str, updated_at: datetime
+    ) -> None:
+        """
+        Store the serialized results of an election. A snapshot never replaces
+        one that was computed later.
+        """
+        try:
+            stmt = insert(ElectionResultsCache).values(
+                id=str(uuid4()),
+                election_id=election_id,
+                results_json=results_json,
+                updated_at=updated_at,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ElectionResultsCache.election_id],
+                set_={
+                    "results_json": stmt.excluded.results_json,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+                where=or_(
+                    ElectionResultsCache.updated_at.is_(None),
+                    ElectionResultsCache.updated_at <= stmt.excluded.updated_at,
+                ),
+            )
+
+            await self.session.execute(stmt)
+            await self.session.commit()
+
+        except IntegrityError as e:
+            await self.session.rollback()
+            logger.error(
+                f"Database integrity error storing {self.log_data_name}: {str(e)}"
+            )
+            raise ValueError(str(e))
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error storing {self.log_data_name}: {str(e)}")
+            raise
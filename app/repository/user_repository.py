@@ -1,10 +1,38 @@
+from typing import Optional
+
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.logging_config import get_logger
 from app.models.user import User
 from app.repository.base_repository import BaseRepository
 
+logger = get_logger("user_repo")
+
 
 class UserRepository(BaseRepository):
     def __init__(self, session: AsyncSession):
         super().__init__(model=User, session=session, log_data_name="User")
 
+    async def bump_token_generation(self, user_id: str) -> Optional[int]:
+        """
+        Move the token generation of a user on in one UPDATE ... RETURNING and
+        commit. Returns the new generation, or None if the user does not exist.
+        """
+        try:
+            result = await self.session.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(token_generation=User.token_generation + 1)
+                .returning(User.token_generation)
+            )
+            generation = result.scalar_one_or_none()
+
+            await self.session.commit()
+
+            return generation
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error bumping {self.log_data_name} token generation: {str(e)}")
+            raise
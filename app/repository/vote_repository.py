@@ -1,10 +1,628 @@
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, Optional
+from uuid import uuid4
+
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    String,
+    and_,
+    case,
+    delete,
+    exists,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.core.logging_config import get_logger
+from app.models.candidates import Candidate
+from app.models.election import Election
+from app.models.election_setting import ElectionSetting
 from app.models.vote import Vote
 from app.repository.base_repository import BaseRepository
+from app.schemas.vote import VoteRejectionReason
+
+logger = get_logger("vote_repo")
 
 
 class VoteRepository(BaseRepository):
     def __init__(self, session: AsyncSession):
         super().__init__(model=Vote, session=session, log_data_name="Vote")
 
+    async def cast_vote(
+        self,
+        election_id: str,
+        voter_id: str,
+        candidate_id: str,
+        now: datetime,
+    ) -> tuple[Optional[Vote], Optional[VoteRejectionReason]]:
+        """
+        Insert a vote in one round trip, but only if the election rules allow it.
+
+        The election window, candidate membership, ElectionSetting.max_votes and
+        allow_revoting are evaluated in a CTE; the INSERT ... SELECT only fires
+        when no rule rejected the ballot, and the rejection reason is returned
+        alongside the inserted id. In single-choice elections the ballot is
+        flagged so the partial unique index rejects a concurrent second ballot
+        of the same voter; losing that race is reported like the limit check.
+        """
+        try:
+            vote_id = str(uuid4())
+
+            ballot = select(literal(election_id, String).label("election_id")).cte("ballot")
+
+            votes_cast = (
+                select(func.count(Vote.id))
+                .where(Vote.election_id == election_id, Vote.voter_id == voter_id)
+                .scalar_subquery()
+            )
+            already_voted_for_candidate = exists().where(
+                Vote.election_id == election_id,
+                Vote.voter_id == voter_id,
+                Vote.candidate_id == candidate_id,
+            )
+            max_votes = func.coalesce(ElectionSetting.max_votes, 1)
+            allow_revoting = func.coalesce(ElectionSetting.allow_revoting, True)
+
+            rejection_reason = case(
+                (Election.id.is_(None), VoteRejectionReason.ELECTION_NOT_FOUND.value),
+                (Election.start_date > now, VoteRejectionReason.ELECTION_NOT_STARTED.value),
+                (Election.end_date < now, VoteRejectionReason.ELECTION_ENDED.value),
+                (Candidate.id.is_(None), VoteRejectionReason.CANDIDATE_NOT_IN_ELECTION.value),
+                (
+                    already_voted_for_candidate,
+                    VoteRejectionReason.ALREADY_VOTED_FOR_CANDIDATE.value,
+                ),
+                (
+                    votes_cast >= max_votes,
+                    case(
+                        (allow_revoting, VoteRejectionReason.VOTE_LIMIT_REACHED.value),
+                        else_=VoteRejectionReason.REVOTING_DISABLED.value,
+                    ),
+                ),
+                else_=None,
+            )
+
+            checks = (
+                select(
+                    rejection_reason.label("rejection_reason"),
+                    (max_votes == 1).label("single_choice"),
+                    allow_revoting.label("allow_revoting"),
+                )
+                .select_from(ballot)
+                .outerjoin(Election, Election.id == ballot.c.election_id)
+                .outerjoin(
+                    Candidate,
+                    and_(Candidate.id == candidate_id, Candidate.election_id == Election.id),
+                )
+                .outerjoin(ElectionSetting, ElectionSetting.election_id == Election.id)
+                .cte("checks")
+            )
+
+            inserted = (
+                insert(Vote)
+                .from_select(
+                    ["id", "election_id", "voter_id", "candidate_id", "created_at", "single_choice"],
+                    select(
+                        literal(vote_id, String),
+                        literal(election_id, String),
+                        literal(voter_id, String),
+                        literal(candidate_id, String),
+                        literal(now, DateTime),
+                        checks.c.single_choice,
+                    )
+                    .select_from(checks)
+                    .where(checks.c.rejection_reason.is_(None)),
+                )
+                .on_conflict_do_nothing(
+                    index_elements=[Vote.election_id, Vote.voter_id],
+                    index_where=Vote.single_choice,
+                )
+                .returning(Vote.id)
+                .cte("inserted")
+            )
+
+            result = await self.session.execute(
+                select(checks.c.rejection_reason, checks.c.allow_revoting, inserted.c.id)
+                .select_from(checks)
+                .outerjoin(inserted, true())
+            )
+            row = result.one()
+
+            reason = None
+            if row.rejection_reason is not None:
+                reason = VoteRejectionReason(row.rejection_reason)
+            elif row.id is None:
+                reason = (
+                    VoteRejectionReason.VOTE_LIMIT_REACHED
+                    if row.allow_revoting
+                    else VoteRejectionReason.REVOTING_DISABLED
+                )
+
+            if reason is not None:
+                await self.session.rollback()
+                logger.warning(f"{self.log_data_name} rejected: {reason.value}")
+                return None, reason
+
+            await self.session.commit()
+
+            return (
+                Vote(
+                    id=vote_id,
+                    election_id=election_id,
+                    voter_id=voter_id,
+                    candidate_id=candidate_id,
+                    created_at=now,
+                ),
+                None,
+            )
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error casting {self.log_data_name}: {str(e)}")
+            raise
+
+    async def insert_ballots(self, data: list[dict[str, Any]]) -> set[str]:
+        """
+        Insert validated ballots with one multi-row INSERT ... ON CONFLICT DO
+        NOTHING ... RETURNING and commit. Like cast_vote, a single-choice ballot
+        that lost the race against a concurrent one is skipped by the partial
+        unique index rather than failing the batch. Returns the inserted ids.
+        """
+        if not data:
+            return set()
+
+        try:
+            result = await self.session.execute(
+                insert(Vote)
+                .values(data)
+                .on_conflict_do_nothing(
+                    index_elements=[Vote.election_id, Vote.voter_id],
+                    index_where=Vote.single_choice,
+                )
+                .returning(Vote.id)
+            )
+            inserted_ids = set(result.scalars().all())
+
+            await self.session.commit()
+
+            return inserted_ids
+
+        except IntegrityError as e:
+            await self.session.rollback()
+            logger.error(
+                f"Database integrity error inserting {self.log_data_name} ballots: {str(e)}"
+            )
+            raise ValueError(str(e))
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error inserting {self.log_data_name} ballots: {str(e)}")
+            raise
+
+    async def replace_vote(
+        self,
+        election_id: str,
+        voter_id: str,
+        candidate_id: str,
+        now: datetime,
+    ) -> tuple[Optional[Vote], Optional[str], Optional[VoteRejectionReason]]:
+        """
+        Cast the ballot of a voter in a single-choice election, or move it to
+        another candidate, in one INSERT ... ON CONFLICT DO UPDATE ... RETURNING.
+
+        The conflict target is the partial unique index on (election_id,
+        voter_id), so concurrent requests of one voter serialize on the row
+        instead of racing. The update only fires when the candidate changes and
+        ElectionSetting.allow_revoting is not disabled.
+
+        Returns the ballot, the candidate it pointed to before the statement
+        (None when it was inserted, candidate_id when it was left unchanged) and
+        the rejection reason.
+        """
+        try:
+            vote_id = str(uuid4())
+
+            ballot = select(literal(election_id, String).label("election_id")).cte("ballot")
+            previous = aliased(Vote, name="previous")
+
+            max_votes = func.coalesce(ElectionSetting.max_votes, 1)
+            allow_revoting = func.coalesce(ElectionSetting.allow_revoting, True)
+
+            rejection_reason = case(
+                (Election.id.is_(None), VoteRejectionReason.ELECTION_NOT_FOUND.value),
+                (Election.start_date > now, VoteRejectionReason.ELECTION_NOT_STARTED.value),
+                (Election.end_date < now, VoteRejectionReason.ELECTION_ENDED.value),
+                (Candidate.id.is_(None), VoteRejectionReason.CANDIDATE_NOT_IN_ELECTION.value),
+                (max_votes != 1, VoteRejectionReason.MULTIPLE_CHOICE_ELECTION.value),
+                else_=None,
+            )
+
+            checks = (
+                select(
+                    rejection_reason.label("rejection_reason"),
+                    allow_revoting.label("allow_revoting"),
+                    previous.id.label("previous_id"),
+                    previous.candidate_id.label("previous_candidate_id"),
+                    previous.created_at.label("previous_created_at"),
+                )
+                .select_from(ballot)
+                .outerjoin(Election, Election.id == ballot.c.election_id)
+                .outerjoin(
+                    Candidate,
+                    and_(Candidate.id == candidate_id, Candidate.election_id == Election.id),
+                )
+                .outerjoin(ElectionSetting, ElectionSetting.election_id == Election.id)
+                .outerjoin(
+                    previous,
+                    and_(
+                        previous.election_id == Election.id,
+                        previous.voter_id == voter_id,
+                        previous.single_choice,
+                    ),
+                )
+                .cte("checks")
+            )
+
+            upsert = insert(Vote).from_select(
+                ["id", "election_id", "voter_id", "candidate_id", "created_at", "single_choice"],
+                select(
+                    literal(vote_id, String),
+                    literal(election_id, String),
+                    literal(voter_id, String),
+                    literal(candidate_id, String),
+                    literal(now, DateTime),
+                    literal(True, Boolean),
+                )
+                .select_from(checks)
+                .where(checks.c.rejection_reason.is_(None)),
+            )
+            revoting_disabled = (
+                select(ElectionSetting.id)
+                .where(
+                    ElectionSetting.election_id == election_id,
+                    ElectionSetting.allow_revoting.is_(False),
+                )
+                .exists()
+            )
+            upserted = (
+                upsert.on_conflict_do_update(
+                    index_elements=[Vote.election_id, Vote.voter_id],
+                    index_where=Vote.single_choice,
+                    set_={
+                        "candidate_id": upsert.excluded.candidate_id,
+                        "created_at": upsert.excluded.created_at,
+                    },
+                    where=and_(
+                        Vote.candidate_id != upsert.excluded.candidate_id,
+                        ~revoting_disabled,
+                    ),
+                )
+                # xmax is only zero for a freshly inserted row version.
+                .returning(
+                    Vote.id,
+                    Vote.created_at,
+                    literal_column("xmax = 0", Boolean).label("inserted"),
+                )
+                .cte("upserted")
+            )
+
+            result = await self.session.execute(
+                select(
+                    checks.c.rejection_reason,
+                    checks.c.allow_revoting,
+                    checks.c.previous_id,
+                    checks.c.previous_candidate_id,
+                    checks.c.previous_created_at,
+                    upserted.c.id,
+                    upserted.c.created_at,
+                    upserted.c.inserted,
+                )
+                .select_from(checks)
+                .outerjoin(upserted, true())
+            )
+            row = result.one()
+
+            if row.id is not None:
+                await self.session.commit()
+                return (
+                    Vote(
+                        id=row.id,
+                        election_id=election_id,
+                        voter_id=voter_id,
+                        candidate_id=candidate_id,
+                        created_at=row.created_at,
+                        single_choice=True,
+                    ),
+                    None if row.inserted else row.previous_candidate_id,
+                    None,
+                )
+
+            await self.session.rollback()
+
+            if row.rejection_reason is None and row.previous_candidate_id == candidate_id:
+                return (
+                    Vote(
+                        id=row.previous_id,
+                        election_id=election_id,
+                        voter_id=voter_id,
+                        candidate_id=candidate_id,
+                        created_at=row.previous_created_at,
+                        single_choice=True,
+                    ),
+                    candidate_id,
+                    None,
+                )
+
+            if row.rejection_reason is not None:
+                reason = VoteRejectionReason(row.rejection_reason)
+            elif not row.allow_revoting:
+                reason = VoteRejectionReason.REVOTING_DISABLED
+            else:
+                reason = VoteRejectionReason.ALREADY_VOTED_FOR_CANDIDATE
+
+            logger.warning(f"{self.log_data_name} replacement rejected: {reason.value}")
+            return None, None, reason
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error replacing {self.log_data_name}: {str(e)}")
+            raise
+
+    async def update_owned(
+        self,
+        vote_id: str,
+        voter_id: str,
+        candidate_id: Optional[str],
+        now: datetime,
+    ) -> tuple[Optional[Any], Optional[VoteRejectionReason]]:
+        """
+        Move a vote of a voter to another candidate of its election in one
+        UPDATE ... RETURNING and commit, but only if the election rules allow it.
+
+        The previous row is locked in a CTE and checked like cast_vote: the
+        election window, candidate membership, another vote of the voter for the
+        same candidate and, when the candidate changes, allow_revoting. The vote
+        keeps its election, so max_votes and the single-choice index still hold.
+        The returned row also carries previous_candidate_id. Returns (None,
+        None) when no vote with this id belongs to the voter.
+        """
+        try:
+            previous = (
+                select(Vote.id, Vote.election_id, Vote.candidate_id)
+                .where(Vote.id == vote_id, Vote.voter_id == voter_id)
+                .with_for_update(of=Vote)
+                .cte("previous")
+            )
+
+            target_candidate = func.coalesce(
+                literal(candidate_id, String), previous.c.candidate_id
+            )
+            already_voted_for_candidate = exists().where(
+                Vote.election_id == previous.c.election_id,
+                Vote.voter_id == voter_id,
+                Vote.candidate_id == target_candidate,
+                Vote.id != previous.c.id,
+            )
+            allow_revoting = func.coalesce(ElectionSetting.allow_revoting, True)
+
+            rejection_reason = case(
+                (Election.start_date > now, VoteRejectionReason.ELECTION_NOT_STARTED.value),
+                (Election.end_date < now, VoteRejectionReason.ELECTION_ENDED.value),
+                (Candidate.id.is_(None), VoteRejectionReason.CANDIDATE_NOT_IN_ELECTION.value),
+                (
+                    already_voted_for_candidate,
+                    VoteRejectionReason.ALREADY_VOTED_FOR_CANDIDATE.value,
+                ),
+                (
+                    and_(previous.c.candidate_id != target_candidate, ~allow_revoting),
+                    VoteRejectionReason.REVOTING_DISABLED.value,
+                ),
+                else_=None,
+            )
+
+            checks = (
+                select(
+                    previous.c.id.label("previous_id"),
+                    previous.c.candidate_id.label("previous_candidate_id"),
+                    target_candidate.label("candidate_id"),
+                    rejection_reason.label("rejection_reason"),
+                )
+                .select_from(previous)
+                .join(Election, Election.id == previous.c.election_id)
+                .outerjoin(
+                    Candidate,
+                    and_(
+                        Candidate.id == target_candidate,
+                        Candidate.election_id == previous.c.election_id,
+                    ),
+                )
+                .outerjoin(ElectionSetting, ElectionSetting.election_id == Election.id)
+                .cte("checks")
+            )
+
+            updated = (
+                update(Vote)
+                .where(Vote.id == checks.c.previous_id, checks.c.rejection_reason.is_(None))
+                .values(candidate_id=checks.c.candidate_id)
+                .returning(
+                    Vote.id,
+                    Vote.election_id,
+                    Vote.voter_id,
+                    Vote.candidate_id,
+                    Vote.created_at,
+                )
+                .cte("updated")
+            )
+
+            result = await self.session.execute(
+                select(
+                    updated.c.id,
+                    updated.c.election_id,
+                    updated.c.voter_id,
+                    updated.c.candidate_id,
+                    updated.c.created_at,
+                    checks.c.previous_candidate_id,
+                    checks.c.rejection_reason,
+                )
+                .select_from(checks)
+                .outerjoin(updated, true())
+            )
+            row = result.one_or_none()
+
+            if row is None or row.rejection_reason is not None:
+                await self.session.rollback()
+                if row is None:
+                    return None, None
+
+                reason = VoteRejectionReason(row.rejection_reason)
+                logger.warning(f"{self.log_data_name} update rejected: {reason.value}")
+                return None, reason
+
+            await self.session.commit()
+
+            return row, None
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error updating {self.log_data_name}: {str(e)}")
+            raise
+
+    async def delete_owned(self, vote_id: str, voter_id: str) -> Optional[Any]:
+        """
+        Delete a vote of a voter in one DELETE ... RETURNING and commit. Returns
+        the deleted row, or None when no vote with this id belongs to the voter.
+        """
+        try:
+            result = await self.session.execute(
+                delete(Vote)
+                .where(Vote.id == vote_id, Vote.voter_id == voter_id)
+                .returning(
+                    Vote.id,
+                    Vote.election_id,
+                    Vote.voter_id,
+                    Vote.candidate_id,
+                    Vote.created_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            row = result.one_or_none()
+
+            await self.session.commit()
+
+            return row
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error deleting {self.log_data_name}: {str(e)}")
+            raise
+
+    async def read_voter_id(self, vote_id: str) -> Optional[str]:
+        """Read the owner of a vote, or None if the vote does not exist."""
+        try:
+            result = await self.session.execute(
+                select(Vote.voter_id).where(Vote.id == vote_id)
+            )
+            return result.scalar_one_or_none()
+
+        except Exception as e:
+            logger.error(f"Error reading {self.log_data_name} owner: {str(e)}")
+            raise
+
+    async def stream_rows(
+        self, condition: Any, chunk_size: int
+    ) -> AsyncIterator[list[Any]]:
+        """
+        Read the votes matching condition through a server-side cursor, in
+        chunks of up to chunk_size rows. Plain rows are read instead of ORM
+        objects so nothing accumulates in the session's identity map.
+        """
+        try:
+            result = await self.session.stream(
+                select(*Vote.__table__.columns)
+                .where(condition)
+                .execution_options(yield_per=chunk_size)
+            )
+            async for rows in result.partitions():
+                yield rows
+
+        except Exception as e:
+            logger.error(f"Error streaming {self.log_data_name}: {str(e)}")
+            raise
+
+    async def read_ballot_rules(self, election_ids: Iterable[str]) -> list[Any]:
+        """
+        Read the voting window, settings and candidate ids of several elections
+        in one query. Each row is one (election, candidate) pair.
+        """
+        try:
+            result = await self.session.execute(
+                select(
+                    Election.id.label("election_id"),
+                    Election.start_date,
+                    Election.end_date,
+                    func.coalesce(ElectionSetting.max_votes, 1).label("max_votes"),
+                    func.coalesce(ElectionSetting.allow_revoting, True).label(
+                        "allow_revoting"
+                    ),
+                    Candidate.id.label("candidate_id"),
+                )
+                .outerjoin(ElectionSetting, ElectionSetting.election_id == Election.id)
+                .outerjoin(Candidate, Candidate.election_id == Election.id)
+                .where(Election.id.in_(list(election_ids)))
+            )
+            return list(result.all())
+
+        except Exception as e:
+            logger.error(f"Error reading ballot rules: {str(e)}")
+            raise
+
+    async def read_voter_ballots(
+        self, election_voter_pairs: Iterable[tuple[str, str]]
+    ) -> list[Any]:
+        """
+        Read the id, election_id, voter_id and candidate_id of every vote already
+        cast by the given voters in the given elections.
+        """
+        pairs = list(election_voter_pairs)
+        if not pairs:
+            return []
+
+        try:
+            result = await self.session.execute(
+                select(
+                    Vote.id, Vote.election_id, Vote.voter_id, Vote.candidate_id
+                ).where(
+                    tuple_(Vote.election_id, Vote.voter_id).in_(pairs)
+                )
+            )
+            return list(result.all())
+
+        except Exception as e:
+            logger.error(f"Error reading {self.log_data_name} ballots: {str(e)}")
+            raise
+
+    async def count_by_candidate(self, election_id: str) -> dict[str, int]:
+        """
+        Count the votes of an election per candidate with a single GROUP BY.
+        """
+        try:
+            result = await self.session.execute(
+                select(Vote.candidate_id, func.count(Vote.id))
+                .where(Vote.election_id == election_id)
+                .group_by(Vote.candidate_id)
+            )
+            return {candidate_id: count for candidate_id, count in result.all()}
+
+        except Exception as e:
+            logger.error(f"Error counting {self.log_data_name} by candidate: {str(e)}")
+            raise
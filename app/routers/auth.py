@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging_config import get_logger
+from app.core.responses import ModelJSONResponse
 from app.dependencies.database import get_db
 from app.dependencies.token import (
     get_access_token_from_cookie,
@@ -13,8 +13,7 @@ from app.schemas.auth import (
     LoginRequest,
     RegisterRequest,
 )
-from app.models.user import User
-from app.schemas.user import UserResponse
+from app.schemas.user import Principal, UserResponse
 from app.services.auth import auth_service
 
 router = APIRouter(tags=["auth"])
@@ -26,7 +25,7 @@ async def register(
     request: Request,
     register_data: RegisterRequest,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Register a new user. Tokens are set in httpOnly cookies.
     """
@@ -37,10 +36,10 @@ async def register(
     logger.info(f"User registered successfully: {user.id}")
     
     response_data = {
-        "user": UserResponse.model_validate(user).model_dump(mode='json'),
+        "user": UserResponse.model_validate(user),
     }
     
-    json_response = JSONResponse(content=response_data, status_code=201)
+    json_response = ModelJSONResponse(content=response_data, status_code=201)
     auth_service.set_tokens_in_cookies(json_response, tokens)
     
     return json_response
@@ -51,7 +50,7 @@ async def login(
     request: Request,
     login_data: LoginRequest,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Authenticate user. Tokens are set in httpOnly cookies.
     """
@@ -62,10 +61,10 @@ async def login(
     logger.info(f"User logged in successfully: {user.id}")
     
     response_data = {
-        "user": user.model_dump(mode='json'),
+        "user": user,
     }
     
-    json_response = JSONResponse(content=response_data)
+    json_response = ModelJSONResponse(content=response_data)
     auth_service.set_tokens_in_cookies(json_response, tokens)
     
     return json_response
@@ -76,7 +75,7 @@ async def refresh(
     request: Request,
     refresh_token: str = Depends(validate_refresh_token),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Refresh access token using refresh token. New tokens are set in httpOnly cookies.
     """
@@ -86,7 +85,7 @@ async def refresh(
 
     logger.info("Token refreshed successfully")
     
-    json_response = JSONResponse(content={"detail": "Tokens refreshed successfully"})
+    json_response = ModelJSONResponse(content={"detail": "Tokens refreshed successfully"})
     auth_service.set_tokens_in_cookies(json_response, tokens)
     
     return json_response
@@ -97,7 +96,7 @@ async def logout(
     request: Request,
     access_token: str = Depends(get_access_token_from_cookie),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Logout user by blacklisting tokens.
     """
@@ -107,16 +106,36 @@ async def logout(
 
     logger.info("User logged out successfully")
     
-    json_response = JSONResponse(content={"detail": "Logged out successfully"})
+    json_response = ModelJSONResponse(content={"detail": "Logged out successfully"})
     auth_service.clear_tokens_in_cookies(json_response)
     
     return json_response
 
 
+@router.post("/logout-all")
+async def logout_all(
+    current_user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> ModelJSONResponse:
+    """
+    Logout user from every session by revoking all of their tokens.
+    """
+    logger.info(f"Logout everywhere request for user: {current_user.id}")
+
+    await auth_service.logout_all(session, current_user.id)
+
+    logger.info("User logged out everywhere successfully")
+
+    json_response = ModelJSONResponse(content={"detail": "Logged out from all sessions"})
+    auth_service.clear_tokens_in_cookies(json_response)
+
+    return json_response
+
+
 @router.get("/me")
 async def get_me(
-    current_user: User = Depends(get_current_user),
-) -> JSONResponse:
+    current_user: Principal = Depends(get_current_user),
+) -> ModelJSONResponse:
     """
     Get current authenticated user information.
     """
@@ -124,5 +143,5 @@ async def get_me(
     
     user_response = UserResponse.model_validate(current_user)
     
-    return JSONResponse(content=user_response.model_dump(mode='json'))
+    return ModelJSONResponse(content=user_response)
 
@@ -1,15 +1,38 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging_config import get_logger
+from app.core.responses import ModelJSONResponse
+from app.db.database import async_session_maker
+from app.dependencies.conditional import etag_headers, not_modified
 from app.dependencies.database import get_db
+from app.dependencies.pagination import (
+    cursor_headers,
+    get_cursor,
+    get_rank_cursor,
+    total_headers,
+)
 from app.dependencies.token import get_current_user
-from app.models.user import User
-from app.schemas.election import ElectionCreate, ElectionUpdate, ElectionResponse
+from app.schemas.election import (
+    ElectionCreate,
+    ElectionFilter,
+    ElectionResponse,
+    ElectionUpdate,
+)
+from app.schemas.pagination import TotalMode
+from app.schemas.user import Principal
 from app.services.election import election_service
+from app.services.results_broadcaster import results_broadcaster
+from app.services.versions import (
+    ELECTION_LIST_VERSION_KEY,
+    election_version_key,
+    results_version_key,
+    version_service,
+)
+from app.services.vote import vote_service
 
 router = APIRouter(tags=["elections"])
 logger = get_logger("election_router")
@@ -18,9 +41,9 @@ logger = get_logger("election_router")
 @router.post("", status_code=201)
 async def create_election(
     election_data: ElectionCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Create a new election with candidates and settings.
     Requires authentication.
@@ -35,49 +58,162 @@ async def create_election(
 
     logger.info(f"Election created successfully: {election.id}")
     
-    return JSONResponse(
-        content=election.model_dump(mode='json'), status_code=201
+    return ModelJSONResponse(
+        content=election, status_code=201
     )
 
 
 @router.get("")
 async def get_all_elections(
-    page: int = Query(1, ge=1, description="Page number"),
+    request: Request,
+    filters: ElectionFilter = Depends(),
+    after: Optional[tuple] = Depends(get_cursor),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    total: Optional[TotalMode] = Query(
+        None, description="Return the total in X-Total-Count: estimate or exact"
+    ),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> Response:
     """
-    Get all elections with pagination.
+    Get a page of elections, optionally filtered by status, visibility, owner
+    and date range. The cursor of the next page is returned in the
+    X-Next-Cursor header, and the total in X-Total-Count when asked for.
     """
-    logger.info(f"Getting all elections - page: {page}, page_size: {page_size}")
+    logger.info(f"Getting all elections - after: {after}, page_size: {page_size}")
 
-    elections = await election_service.get_all_elections(
-        session, page=page, page_size=page_size
+    # Status filters depend on the clock as well as on the data, so their
+    # results cannot be validated against the list version.
+    etag = (
+        None
+        if filters.status is not None
+        else await version_service.etag(ELECTION_LIST_VERSION_KEY, variant=request.url.query)
     )
+    cached_response = not_modified(request, etag)
+    if cached_response is not None:
+        return cached_response
 
-    response_data = [election.model_dump(mode='json') for election in elections]
-    
-    return JSONResponse(content=response_data)
+    elections, next_cursor = await election_service.get_all_elections(
+        session, after=after, page_size=page_size, filters=filters
+    )
+    total_count = (
+        await election_service.count_elections(session, total, filters) if total else None
+    )
+
+    return ModelJSONResponse(
+        content=elections,
+        headers={
+            **cursor_headers(next_cursor),
+            **total_headers(total_count),
+            **etag_headers(etag),
+        },
+    )
+
+
+@router.get("/search")
+async def search_elections(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to search for"),
+    after: Optional[tuple] = Depends(get_rank_cursor),
+    page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    session: AsyncSession = Depends(get_db),
+) -> ModelJSONResponse:
+    """
+    Search elections by words in their title, description and candidates, best
+    match first. Each word matches as a prefix. The cursor of the next page is
+    returned in the X-Next-Cursor header.
+    """
+    logger.info(f"Searching elections - q: {q}, after: {after}, page_size: {page_size}")
+
+    elections, next_cursor = await election_service.search_elections(
+        session, query=q, after=after, page_size=page_size
+    )
+
+    return ModelJSONResponse(content=elections, headers=cursor_headers(next_cursor))
 
 
 @router.get("/{election_id}")
 async def get_election_by_id(
     election_id: str,
+    request: Request,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> Response:
     """
-    Get election by ID.
+    Get election by ID, served from the election cache.
     """
     logger.info(f"Getting election: {election_id}")
 
-    election = await election_service.get_election_by_id(session, election_id)
+    # The version is read first, so a change committed while the election is
+    # read can only make the ETag older than the body, never newer.
+    etag = await version_service.etag(election_version_key(election_id))
+    cached_response = not_modified(request, etag)
+    if cached_response is not None:
+        return cached_response
+
+    election_json = await election_service.get_election_json(session, election_id)
+
+    if election_json is None:
+        from app.exceptions.user import UserNotFoundError
+
+        raise UserNotFoundError(f"Election with id {election_id} not found")
+
+    return Response(
+        content=election_json, media_type="application/json", headers=etag_headers(etag)
+    )
+
+
+@router.get("/{election_id}/results")
+async def get_election_results(
+    election_id: str,
+    request: Request,
+    session: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    Get per-candidate results of an election, served from the results cache.
+    """
+    logger.info(f"Getting results for election: {election_id}")
 
-    if not election:
+    etag = await version_service.etag(results_version_key(election_id))
+    cached_response = not_modified(request, etag)
+    if cached_response is not None:
+        return cached_response
+
+    results_json = await election_service.get_election_results(session, election_id)
+
+    if results_json is None:
         from app.exceptions.user import UserNotFoundError
 
         raise UserNotFoundError(f"Election with id {election_id} not found")
 
-    return JSONResponse(content=election.model_dump(mode='json'))
+    return Response(
+        content=results_json, media_type="application/json", headers=etag_headers(etag)
+    )
+
+
+@router.get("/{election_id}/results/stream")
+async def stream_election_results(
+    election_id: str,
+) -> StreamingResponse:
+    """
+    Stream live per-candidate vote count deltas of an election as Server-Sent Events.
+    """
+    logger.info(f"Opening results stream for election: {election_id}")
+
+    # The stream outlives the request scope, so the session is not taken from
+    # get_db to avoid holding a connection for the lifetime of the stream.
+    async def load_snapshot():
+        async with async_session_maker() as session:
+            return await vote_service.get_election_tally(session, election_id)
+
+    if not await load_snapshot():
+        from app.exceptions.user import UserNotFoundError
+
+        raise UserNotFoundError(f"Election with id {election_id} not found")
+
+    # The stream reads its own snapshot once it has subscribed to the deltas.
+    return StreamingResponse(
+        results_broadcaster.events(election_id, load_snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.put("/{election_id}")
@@ -85,7 +221,7 @@ async def update_election(
     election_id: str,
     election_data: ElectionUpdate,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Update election information.
     """
@@ -97,14 +233,14 @@ async def update_election(
 
     logger.info(f"Election updated successfully: {election.id}")
     
-    return JSONResponse(content=election.model_dump(mode='json'))
+    return ModelJSONResponse(content=election)
 
 
 @router.delete("/{election_id}")
 async def delete_election(
     election_id: str,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Delete election by ID.
     """
@@ -114,7 +250,7 @@ async def delete_election(
 
     logger.info(f"Election deleted successfully: {election_id}")
     
-    return JSONResponse(
+    return ModelJSONResponse(
         content={"detail": f"Election with id {election_id} deleted successfully"},
         status_code=200,
     )
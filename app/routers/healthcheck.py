@@ -1,19 +1,28 @@
 from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
 from app.core.logging_config import get_logger
+from app.core.responses import ModelJSONResponse
 from app.db.database import async_session_maker
 from app.db.redis_client import redis_client
 from app.dependencies.token import get_current_user
 from app.models import User
+from app.services.password_hasher import password_hasher
+from app.services.principal_cache import principal_cache
+from app.services.results_broadcaster import results_broadcaster
+from app.services.token_revocation import token_revocation
+from app.services.vote_log import vote_log_buffer
+from app.workers.count_reconciler import count_reconciler
+from app.workers.results_refresher import results_refresher
+from app.workers.tally_reconciler import tally_reconciler
+from app.workers.vote_queue import vote_queue_flusher
 
 router = APIRouter()
 logger = get_logger("healthcheck")
 
 
 @router.get("/")
-def healthcheck() -> JSONResponse:
+def healthcheck() -> ModelJSONResponse:
     """
     Root endpoint for health checks.
     """
@@ -22,7 +31,7 @@ def healthcheck() -> JSONResponse:
     response_data = {"status_code": 200, "detail": "ok", "result": "working"}
     logger.info(f"Health check completed successfully")
 
-    return JSONResponse(content=response_data)
+    return ModelJSONResponse(content=response_data)
 
 
 @router.get("/postgresql")
@@ -36,13 +45,13 @@ async def health_db():
         async with async_session_maker() as session:
             result = await session.execute(text("SELECT 1"))
             if result.scalar() == 1:
-                return JSONResponse(content={"status": "ok"})
+                return ModelJSONResponse(content={"status": "ok"})
             else:
-                return JSONResponse(
+                return ModelJSONResponse(
                     content={"status": "error", "detail": "Unexpected result from DB"}
                 )
     except Exception as e:
-        return JSONResponse(content={"status": "error", "detail": str(e)})
+        return ModelJSONResponse(content={"status": "error", "detail": str(e)})
 
 
 @router.get("/redis")
@@ -57,25 +66,47 @@ async def health_redis():
         await redis_client.close()
 
         if pong:
-            return JSONResponse(content={"status": "ok", "detail": "Redis is healthy"})
+            return ModelJSONResponse(content={"status": "ok", "detail": "Redis is healthy"})
         else:
-            return JSONResponse(
+            return ModelJSONResponse(
                 content={"status": "error", "detail": "Redis did not respond with PONG"}
             )
     except Exception as e:
-        return JSONResponse(content={"status": "error", "detail": str(e)})
+        return ModelJSONResponse(content={"status": "error", "detail": str(e)})
+
+
+@router.get("/metrics")
+async def health_metrics() -> ModelJSONResponse:
+    """
+    Runtime metrics of background workers.
+    """
+    logger.info(f"Metrics requested")
+
+    return ModelJSONResponse(
+        content={
+            "vote_queue": await vote_queue_flusher.metrics(),
+            "tally_reconciler": tally_reconciler.metrics(),
+            "count_reconciler": count_reconciler.metrics(),
+            "results_refresher": results_refresher.metrics(),
+            "results_stream": results_broadcaster.metrics(),
+            "vote_log": vote_log_buffer.metrics(),
+            "password_hasher": password_hasher.metrics(),
+            "principal_cache": principal_cache.metrics(),
+            "token_revocation": token_revocation.metrics(),
+        }
+    )
 
 
 @router.get("/protected")
 async def protected_endpoint(
     auth: User = Depends(get_current_user),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Protected endpoint that requires a valid JWT token.
     """
     logger.info(f"Protected endpoint accessed")
 
-    return JSONResponse(
+    return ModelJSONResponse(
         content={
             "message": "Authentication successful!",
             "authenticated": True,
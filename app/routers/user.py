@@ -1,12 +1,16 @@
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, Query
-from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging_config import get_logger
+from app.core.responses import ModelJSONResponse
 from app.dependencies.database import get_db
-from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.dependencies.pagination import cursor_headers, get_cursor, total_headers
+from app.dependencies.token import get_optional_user
+from app.schemas.pagination import TotalMode
+from app.schemas.user import Principal, UserCreate, UserUpdate, UserResponse
+from app.services.auth import auth_service
 from app.services.user import user_service
 
 router = APIRouter(tags=["users"])
@@ -17,7 +21,7 @@ logger = get_logger("user_router")
 async def create_user(
     user_data: UserCreate,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Create a new user.
     """
@@ -27,34 +31,43 @@ async def create_user(
 
     logger.info(f"User created successfully: {user.id}")
     
-    return JSONResponse(
-        content=user.model_dump(mode='json'), status_code=201
+    return ModelJSONResponse(
+        content=user, status_code=201
     )
 
 
 @router.get("")
 async def get_all_users(
-    page: int = Query(1, ge=1, description="Page number"),
+    after: Optional[tuple] = Depends(get_cursor),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    total: Optional[TotalMode] = Query(
+        None, description="Return the total in X-Total-Count: estimate or exact"
+    ),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
-    Get all users with pagination.
+    Get a page of users. The cursor of the next page is returned in the
+    X-Next-Cursor header, and the total in X-Total-Count when asked for.
     """
-    logger.info(f"Getting all users - page: {page}, page_size: {page_size}")
+    logger.info(f"Getting all users - after: {after}, page_size: {page_size}")
 
-    users = await user_service.get_all_users(session, page=page, page_size=page_size)
+    users, next_cursor = await user_service.get_all_users(
+        session, after=after, page_size=page_size
+    )
 
-    response_data = [user.model_dump(mode='json') for user in users]
-    
-    return JSONResponse(content=response_data)
+    total_count = await user_service.count_users(session, total) if total else None
+
+    return ModelJSONResponse(
+        content=users,
+        headers={**cursor_headers(next_cursor), **total_headers(total_count)},
+    )
 
 
 @router.get("/{user_id}")
 async def get_user_by_id(
     user_id: str,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Get user by ID.
     """
@@ -67,7 +80,7 @@ async def get_user_by_id(
 
         raise UserNotFoundError(f"User with id {user_id} not found")
 
-    return JSONResponse(content=user.model_dump(mode='json'))
+    return ModelJSONResponse(content=user)
 
 
 @router.put("/{user_id}")
@@ -75,24 +88,31 @@ async def update_user(
     user_id: str,
     user_data: UserUpdate,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+    current_user: Optional[Principal] = Depends(get_optional_user),
+) -> ModelJSONResponse:
     """
-    Update user information.
+    Update user information. A password change revokes every token of the
+    user; users changing their own password get new tokens in httpOnly cookies.
     """
     logger.info(f"Updating user: {user_id}")
 
     user = await user_service.update_user(session, user_id, user_data)
 
     logger.info(f"User updated successfully: {user.id}")
-    
-    return JSONResponse(content=user.model_dump(mode='json'))
+
+    json_response = ModelJSONResponse(content=user)
+    if user_data.password is not None and current_user and current_user.id == user_id:
+        tokens = await auth_service.reissue_tokens(session, user_id)
+        auth_service.set_tokens_in_cookies(json_response, tokens)
+
+    return json_response
 
 
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: str,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Delete user by ID.
     """
@@ -102,7 +122,7 @@ async def delete_user(
 
     logger.info(f"User deleted successfully: {user_id}")
     
-    return JSONResponse(
+    return ModelJSONResponse(
         content={"detail": f"User with id {user_id} deleted successfully"},
         status_code=200,
     )
@@ -1,11 +1,15 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query
-from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging_config import get_logger
+from app.core.responses import ModelJSONResponse
 from app.dependencies.database import get_db
+from app.dependencies.pagination import cursor_headers, get_cursor, total_headers
 from app.dependencies.token import get_current_user
-from app.models.user import User
+from app.schemas.pagination import TotalMode
+from app.schemas.user import Principal
 from app.schemas.user_profile import (
     UserProfileCreate,
     UserProfileUpdate,
@@ -21,7 +25,7 @@ logger = get_logger("user_profile_router")
 async def create_user_profile(
     profile_data: UserProfileCreate,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Create a new user profile.
     """
@@ -33,38 +37,47 @@ async def create_user_profile(
 
     logger.info(f"User profile created successfully: {profile.id}")
 
-    return JSONResponse(
-        content=profile.model_dump(mode="json"), status_code=201
+    return ModelJSONResponse(
+        content=profile, status_code=201
     )
 
 
 @router.get("")
 async def get_all_user_profiles(
-    page: int = Query(1, ge=1, description="Page number"),
+    after: Optional[tuple] = Depends(get_cursor),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    total: Optional[TotalMode] = Query(
+        None, description="Return the total in X-Total-Count: estimate or exact"
+    ),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
-    Get all user profiles with pagination.
+    Get a page of user profiles. The cursor of the next page is returned in
+    the X-Next-Cursor header, and the total in X-Total-Count when asked for.
     """
     logger.info(
-        f"Getting all user profiles - page: {page}, page_size: {page_size}"
+        f"Getting all user profiles - after: {after}, page_size: {page_size}"
     )
 
-    profiles = await user_profile_service.get_all_user_profiles(
-        session, page=page, page_size=page_size
+    profiles, next_cursor = await user_profile_service.get_all_user_profiles(
+        session, after=after, page_size=page_size
     )
 
-    response_data = [profile.model_dump(mode="json") for profile in profiles]
+    total_count = (
+        await user_profile_service.count_user_profiles(session, total) if total else None
+    )
 
-    return JSONResponse(content=response_data)
+    return ModelJSONResponse(
+        content=profiles,
+        headers={**cursor_headers(next_cursor), **total_headers(total_count)},
+    )
 
 
 @router.get("/me/profile")
 async def get_my_profile(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Get current user's profile.
     """
@@ -81,14 +94,14 @@ async def get_my_profile(
             f"User profile for user {current_user.id} not found"
         )
 
-    return JSONResponse(content=profile.model_dump(mode="json"))
+    return ModelJSONResponse(content=profile)
 
 
 @router.get("/user/{user_id}")
 async def get_user_profile_by_user_id(
     user_id: str,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Get user profile by user ID.
     """
@@ -105,14 +118,14 @@ async def get_user_profile_by_user_id(
             f"User profile for user {user_id} not found"
         )
 
-    return JSONResponse(content=profile.model_dump(mode="json"))
+    return ModelJSONResponse(content=profile)
 
 
 @router.get("/{profile_id}")
 async def get_user_profile_by_id(
     profile_id: str,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Get user profile by ID.
     """
@@ -129,15 +142,15 @@ async def get_user_profile_by_id(
             f"User profile with id {profile_id} not found"
         )
 
-    return JSONResponse(content=profile.model_dump(mode="json"))
+    return ModelJSONResponse(content=profile)
 
 
 @router.put("/me/profile")
 async def update_my_profile(
     profile_data: UserProfileUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Update current user's profile.
     """
@@ -149,7 +162,7 @@ async def update_my_profile(
 
     logger.info(f"User profile updated successfully: {profile.id}")
 
-    return JSONResponse(content=profile.model_dump(mode="json"))
+    return ModelJSONResponse(content=profile)
 
 
 @router.put("/user/{user_id}")
@@ -157,7 +170,7 @@ async def update_user_profile_by_user_id(
     user_id: str,
     profile_data: UserProfileUpdate,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Update user profile by user ID.
     """
@@ -169,7 +182,7 @@ async def update_user_profile_by_user_id(
 
     logger.info(f"User profile updated successfully: {profile.id}")
 
-    return JSONResponse(content=profile.model_dump(mode="json"))
+    return ModelJSONResponse(content=profile)
 
 
 @router.put("/{profile_id}")
@@ -177,7 +190,7 @@ async def update_user_profile(
     profile_id: str,
     profile_data: UserProfileUpdate,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Update user profile information.
     """
@@ -189,14 +202,14 @@ async def update_user_profile(
 
     logger.info(f"User profile updated successfully: {profile.id}")
 
-    return JSONResponse(content=profile.model_dump(mode="json"))
+    return ModelJSONResponse(content=profile)
 
 
 @router.delete("/me/profile")
 async def delete_my_profile(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Delete current user's profile.
     """
@@ -208,7 +221,7 @@ async def delete_my_profile(
 
     logger.info(f"User profile deleted successfully for user: {current_user.id}")
 
-    return JSONResponse(
+    return ModelJSONResponse(
         content={
             "detail": f"User profile for user {current_user.id} deleted successfully"
         },
@@ -220,7 +233,7 @@ async def delete_my_profile(
 async def delete_user_profile_by_user_id(
     user_id: str,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Delete user profile by user ID.
     """
@@ -230,7 +243,7 @@ async def delete_user_profile_by_user_id(
 
     logger.info(f"User profile deleted successfully for user: {user_id}")
 
-    return JSONResponse(
+    return ModelJSONResponse(
         content={
             "detail": f"User profile for user {user_id} deleted successfully"
         },
@@ -242,7 +255,7 @@ async def delete_user_profile_by_user_id(
 async def delete_user_profile(
     profile_id: str,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Delete user profile by ID.
     """
@@ -252,7 +265,7 @@ async def delete_user_profile(
 
     logger.info(f"User profile deleted successfully: {profile_id}")
 
-    return JSONResponse(
+    return ModelJSONResponse(
         content={
             "detail": f"User profile with id {profile_id} deleted successfully"
         },
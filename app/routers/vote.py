@@ -1,14 +1,27 @@
-from typing import List
+from typing import AsyncIterator, Callable, List, Optional
 
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging_config import get_logger
+from app.core.responses import ModelJSONResponse
+from app.db.database import async_session_maker
+from app.dependencies.conditional import etag_headers, not_modified
 from app.dependencies.database import get_db
+from app.dependencies.pagination import cursor_headers, get_cursor, total_headers
 from app.dependencies.token import get_current_user
-from app.models.user import User
-from app.schemas.vote import VoteCreate, VoteUpdate, VoteResponse
+from app.schemas.pagination import TotalMode
+from app.schemas.user import Principal
+from app.schemas.vote import (
+    VoteBatchCreate,
+    VoteChoice,
+    VoteCreate,
+    VoteReceipt,
+    VoteResponse,
+    VoteUpdate,
+)
+from app.services.versions import VOTE_LIST_VERSION_KEY, version_service
 from app.services.vote import vote_service
 
 router = APIRouter(tags=["votes"])
@@ -18,11 +31,11 @@ logger = get_logger("vote_router")
 @router.post("", status_code=201)
 async def create_vote(
     vote_data: VoteCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
-    Create a new vote.
+    Create a new vote. Returns 202 with a receipt when votes are queued.
     """
     logger.info(
         f"Creating vote for election {vote_data.election_id} by user {current_user.id}"
@@ -30,36 +43,102 @@ async def create_vote(
 
     vote = await vote_service.create_vote(session, vote_data, current_user)
 
+    if isinstance(vote, VoteReceipt):
+        logger.info(f"Vote queued: {vote.vote_id}")
+
+        return ModelJSONResponse(
+            content=vote, status_code=202
+        )
+
     logger.info(f"Vote created successfully: {vote.id}")
     
-    return JSONResponse(
-        content=vote.model_dump(mode='json'), status_code=201
+    return ModelJSONResponse(
+        content=vote, status_code=201
     )
 
 
+@router.post("/batch")
+async def create_votes_batch(
+    batch_data: VoteBatchCreate,
+    current_user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> ModelJSONResponse:
+    """
+    Create several votes in one transaction and report the outcome of each.
+    """
+    logger.info(
+        f"Creating batch of {len(batch_data.votes)} votes by user {current_user.id}"
+    )
+
+    result = await vote_service.create_votes_batch(session, batch_data, current_user)
+
+    logger.info(
+        f"Vote batch processed: {result.accepted} accepted, {result.rejected} rejected"
+    )
+
+    return ModelJSONResponse(content=result)
+
+
 @router.get("")
 async def get_all_votes(
-    page: int = Query(1, ge=1, description="Page number"),
+    request: Request,
+    after: Optional[tuple] = Depends(get_cursor),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page"),
+    total: Optional[TotalMode] = Query(
+        None, description="Return the total in X-Total-Count: estimate or exact"
+    ),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> Response:
     """
-    Get all votes with pagination.
+    Get a page of votes. The cursor of the next page is returned in the
+    X-Next-Cursor header, and the total in X-Total-Count when asked for.
     """
-    logger.info(f"Getting all votes - page: {page}, page_size: {page_size}")
+    logger.info(f"Getting all votes - after: {after}, page_size: {page_size}")
 
-    votes = await vote_service.get_all_votes(session, page=page, page_size=page_size)
+    etag = await version_service.etag(VOTE_LIST_VERSION_KEY, variant=request.url.query)
+    cached_response = not_modified(request, etag)
+    if cached_response is not None:
+        return cached_response
 
-    response_data = [vote.model_dump(mode='json') for vote in votes]
-    
-    return JSONResponse(content=response_data)
+    votes, next_cursor = await vote_service.get_all_votes(
+        session, after=after, page_size=page_size
+    )
+    total_count = await vote_service.count_votes(session, total) if total else None
+
+    return ModelJSONResponse(
+        content=votes,
+        headers={
+            **cursor_headers(next_cursor),
+            **total_headers(total_count),
+            **etag_headers(etag),
+        },
+    )
+
+
+@router.get("/receipts/{vote_id}")
+async def get_vote_receipt(
+    vote_id: str,
+) -> ModelJSONResponse:
+    """
+    Get the processing status of a queued vote.
+    """
+    logger.info(f"Getting receipt for vote: {vote_id}")
+
+    receipt = await vote_service.get_vote_receipt(vote_id)
+
+    if not receipt:
+        from app.exceptions.user import VoteNotFoundError
+
+        raise VoteNotFoundError(f"Receipt for vote {vote_id} not found")
+
+    return ModelJSONResponse(content=receipt)
 
 
 @router.get("/{vote_id}")
 async def get_vote_by_id(
     vote_id: str,
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Get vote by ID.
     """
@@ -72,49 +151,65 @@ async def get_vote_by_id(
 
         raise VoteNotFoundError(f"Vote with id {vote_id} not found")
 
-    return JSONResponse(content=vote.model_dump(mode='json'))
+    return ModelJSONResponse(content=vote)
 
 
 @router.get("/election/{election_id}")
 async def get_votes_by_election(
     election_id: str,
-    session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> StreamingResponse:
     """
-    Get all votes for a specific election.
+    Get all votes for a specific election, streamed as a JSON array.
     """
     logger.info(f"Getting votes for election: {election_id}")
 
-    votes = await vote_service.get_votes_by_election(session, election_id)
+    return StreamingResponse(
+        _stream_in_session(vote_service.stream_votes_by_election, election_id),
+        media_type="application/json",
+    )
 
-    response_data = [vote.model_dump(mode='json') for vote in votes]
-    
-    return JSONResponse(content=response_data)
+
+@router.get("/election/{election_id}/tally")
+async def get_election_tally(
+    election_id: str,
+    session: AsyncSession = Depends(get_db),
+) -> ModelJSONResponse:
+    """
+    Get live per-candidate vote counts for a specific election.
+    """
+    logger.info(f"Getting tally for election: {election_id}")
+
+    tally = await vote_service.get_election_tally(session, election_id)
+
+    if not tally:
+        from app.exceptions.user import UserNotFoundError
+
+        raise UserNotFoundError(f"Election with id {election_id} not found")
+
+    return ModelJSONResponse(content=tally)
 
 
 @router.get("/user/{user_id}")
 async def get_votes_by_user(
     user_id: str,
-    session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> StreamingResponse:
     """
-    Get all votes by a specific user.
+    Get all votes by a specific user, streamed as a JSON array.
     """
     logger.info(f"Getting votes for user: {user_id}")
 
-    votes = await vote_service.get_votes_by_user(session, user_id)
-
-    response_data = [vote.model_dump(mode='json') for vote in votes]
-    
-    return JSONResponse(content=response_data)
+    return StreamingResponse(
+        _stream_in_session(vote_service.stream_votes_by_user, user_id),
+        media_type="application/json",
+    )
 
 
 @router.get("/election/{election_id}/my-vote")
 async def get_my_vote_for_election(
     election_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Get current user's vote for a specific election.
     """
@@ -133,18 +228,41 @@ async def get_my_vote_for_election(
             f"Vote for election {election_id} by user {current_user.id} not found"
         )
 
-    return JSONResponse(content=vote.model_dump(mode='json'))
+    return ModelJSONResponse(content=vote)
+
+
+@router.put("/election/{election_id}/my-vote")
+async def replace_my_vote_for_election(
+    election_id: str,
+    choice: VoteChoice,
+    current_user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> ModelJSONResponse:
+    """
+    Cast or replace current user's vote in a single-choice election.
+    """
+    logger.info(
+        f"Replacing vote for election {election_id} by user {current_user.id}"
+    )
+
+    vote = await vote_service.replace_user_vote(
+        session, election_id, choice, current_user
+    )
+
+    logger.info(f"Vote for election {election_id} now points to {vote.candidate_id}")
+
+    return ModelJSONResponse(content=vote)
 
 
 @router.put("/{vote_id}")
 async def update_vote(
     vote_id: str,
     vote_data: VoteUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
-    Update vote information.
+    Move a vote to another candidate of its election.
     """
     logger.info(f"Updating vote: {vote_id}")
 
@@ -152,15 +270,15 @@ async def update_vote(
 
     logger.info(f"Vote updated successfully: {vote.id}")
     
-    return JSONResponse(content=vote.model_dump(mode='json'))
+    return ModelJSONResponse(content=vote)
 
 
 @router.delete("/{vote_id}")
 async def delete_vote(
     vote_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
-) -> JSONResponse:
+) -> ModelJSONResponse:
     """
     Delete vote by ID.
     """
@@ -170,8 +288,17 @@ async def delete_vote(
 
     logger.info(f"Vote deleted successfully: {vote_id}")
     
-    return JSONResponse(
+    return ModelJSONResponse(
         content={"detail": f"Vote with id {vote_id} deleted successfully"},
         status_code=200,
     )
 
+
+async def _stream_in_session(
+    stream: Callable[..., AsyncIterator[bytes]], *args
+) -> AsyncIterator[bytes]:
+    # The body is produced after the endpoint returns, so the session is opened
+    # for the lifetime of the stream instead of being taken from get_db.
+    async with async_session_maker() as session:
+        async for chunk in stream(session, *args):
+            yield chunk
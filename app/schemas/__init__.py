@@ -3,6 +3,7 @@ from app.schemas.user import (
     UserCreate,
     UserUpdate,
     UserResponse,
+    Principal,
     UserInDB,
 )
 from app.schemas.user_profile import (
@@ -28,6 +29,8 @@ from app.schemas.election import (
     ElectionCreate,
     ElectionUpdate,
     ElectionResponse,
+    ElectionStatus,
+    ElectionFilter,
 )
 from app.schemas.election_setting import (
     ElectionSettingBase,
@@ -64,6 +67,8 @@ from app.schemas.election_results_cache import (
     ElectionResultsCacheCreate,
     ElectionResultsCacheUpdate,
     ElectionResultsCacheResponse,
+    ElectionResultCandidate,
+    ElectionResults,
 )
 from app.schemas.attachment import (
     AttachmentBase,
@@ -95,6 +100,11 @@ from app.schemas.password_reset_token import (
     PasswordResetTokenUpdate,
     PasswordResetTokenResponse,
 )
+from app.schemas.pagination import (
+    TotalMode,
+    TotalKind,
+    TotalCount,
+)
 
 __all__ = [
     # User schemas
@@ -102,6 +112,7 @@ __all__ = [
     "UserCreate",
     "UserUpdate",
     "UserResponse",
+    "Principal",
     "UserInDB",
     # UserProfile schemas
     "UserProfileBase",
@@ -123,6 +134,8 @@ __all__ = [
     "ElectionCreate",
     "ElectionUpdate",
     "ElectionResponse",
+    "ElectionStatus",
+    "ElectionFilter",
     # ElectionSetting schemas
     "ElectionSettingBase",
     "ElectionSettingCreate",
@@ -153,6 +166,8 @@ __all__ = [
     "ElectionResultsCacheCreate",
     "ElectionResultsCacheUpdate",
     "ElectionResultsCacheResponse",
+    "ElectionResultCandidate",
+    "ElectionResults",
     # Attachment schemas
     "AttachmentBase",
     "AttachmentCreate",
@@ -178,5 +193,8 @@ __all__ = [
     "PasswordResetTokenCreate",
     "PasswordResetTokenUpdate",
     "PasswordResetTokenResponse",
+    # Pagination schemas
+    "TotalMode",
+    "TotalKind",
+    "TotalCount",
 ]
-
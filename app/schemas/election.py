@@ -1,7 +1,8 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from enum import Enum
 from typing import Optional, List
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 from app.schemas.candidate import CandidateCreate, CandidateResponse
 from app.schemas.election_setting import (
@@ -50,3 +51,27 @@ class ElectionResponse(ElectionBase):
     settings: Optional[ElectionSettingResponse] = None
     attachments: List[AttachmentResponse] = []
 
+
+class ElectionStatus(str, Enum):
+    """Status of an election relative to its voting window."""
+    UPCOMING = "upcoming"
+    ACTIVE = "active"
+    FINISHED = "finished"
+
+
+class ElectionFilter(BaseModel):
+    """Query filters for listing elections."""
+
+    status: Optional[ElectionStatus] = Field(None, description="Voting window status at request time")
+    is_public: Optional[bool] = None
+    owner_id: Optional[str] = None
+    date_from: Optional[datetime] = Field(None, description="Only elections whose voting window ends at or after this date")
+    date_to: Optional[datetime] = Field(None, description="Only elections whose voting window starts at or before this date")
+
+    @field_validator("date_from", "date_to")
+    @classmethod
+    def to_naive_utc(cls, v: Optional[datetime]) -> Optional[datetime]:
+        """Election dates are stored as naive UTC."""
+        if v is not None and v.tzinfo is not None:
+            return v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict
 
@@ -27,3 +27,18 @@ class ElectionResultsCacheResponse(ElectionResultsCacheBase):
     election_id: str
     updated_at: Optional[datetime] = None
 
+
+class ElectionResultCandidate(BaseModel):
+    """Schema for the vote count of a single candidate."""
+    candidate_id: str
+    name: str
+    votes: int
+    percentage: float
+
+
+class ElectionResults(BaseModel):
+    """Schema for aggregated election results stored in the results cache."""
+    election_id: str
+    total_votes: int
+    candidates: List[ElectionResultCandidate]
+    computed_at: datetime
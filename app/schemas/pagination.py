@@ -0,0 +1,23 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class TotalMode(str, Enum):
+    """How a list endpoint should count its total."""
+    ESTIMATE = "estimate"
+    EXACT = "exact"
+
+
+class TotalKind(str, Enum):
+    """Where a reported total came from."""
+    EXACT = "exact"
+    COUNTER = "counter"
+    ESTIMATE = "estimate"
+    AT_LEAST = "at_least"
+
+
+class TotalCount(BaseModel):
+    """Schema for the total of a list, reported next to a page."""
+    value: int
+    kind: TotalKind
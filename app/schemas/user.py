@@ -34,6 +34,12 @@ class UserResponse(UserBase):
     created_at: Optional[datetime] = None
 
 
+class Principal(UserResponse):
+    """Schema for the authenticated user, as cached for authorization (excluding sensitive data)."""
+
+    token_generation: int = 0
+
+
 class UserInDB(UserBase):
     """Schema for user in database (includes password_hash)."""
     model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,8 @@
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class VoteBase(BaseModel):
@@ -17,10 +18,13 @@ class VoteCreate(BaseModel):
     candidate_id: str
 
 
+class VoteChoice(BaseModel):
+    """Schema for casting or replacing the vote of the current user in an election."""
+    candidate_id: str
+
+
 class VoteUpdate(BaseModel):
-    """Schema for updating vote."""
-    election_id: Optional[str] = None
-    voter_id: Optional[str] = None
+    """Schema for moving a vote to another candidate of its election."""
     candidate_id: Optional[str] = None
 
 
@@ -31,3 +35,66 @@ class VoteResponse(VoteBase):
     id: str
     created_at: Optional[datetime] = None
 
+
+class VoteRejectionReason(str, Enum):
+    """Reasons for which the election rules can reject a vote."""
+    ELECTION_NOT_FOUND = "election_not_found"
+    ELECTION_NOT_STARTED = "election_not_started"
+    ELECTION_ENDED = "election_ended"
+    CANDIDATE_NOT_IN_ELECTION = "candidate_not_in_election"
+    ALREADY_VOTED_FOR_CANDIDATE = "already_voted_for_candidate"
+    VOTE_LIMIT_REACHED = "vote_limit_reached"
+    REVOTING_DISABLED = "revoting_disabled"
+    MULTIPLE_CHOICE_ELECTION = "multiple_choice_election"
+    ELECTION_CHANGED = "election_changed"
+
+
+class VoteBatchCreate(BaseModel):
+    """Schema for creating several votes in one request."""
+    votes: List[VoteCreate] = Field(..., min_length=1, description="List of votes to create")
+
+
+class VoteBatchItemResult(BaseModel):
+    """Schema for the outcome of a single vote in a batch."""
+    index: int
+    accepted: bool
+    vote: Optional[VoteResponse] = None
+    reason: Optional[VoteRejectionReason] = None
+
+
+class VoteBatchResponse(BaseModel):
+    """Schema for batch vote creation response."""
+    accepted: int
+    rejected: int
+    results: List[VoteBatchItemResult]
+
+
+class VoteReceiptStatus(str, Enum):
+    """Processing status of a queued vote."""
+    QUEUED = "queued"
+    ACCEPTED = "accepted"
+    REJECTED = "rejected"
+
+
+class VoteReceipt(BaseModel):
+    """Schema for the receipt returned when a vote is queued."""
+    vote_id: str
+    status: VoteReceiptStatus
+    reason: Optional[VoteRejectionReason] = None
+
+
+class VoteChange(BaseModel):
+    """A committed vote mutation. A missing candidate means the vote was created or deleted."""
+    vote_id: str
+    election_id: str
+    voter_id: str
+    previous_candidate_id: Optional[str] = None
+    candidate_id: Optional[str] = None
+
+
+class VoteTallyResponse(BaseModel):
+    """Schema for live per-candidate vote counts of an election."""
+    election_id: str
+    total: int
+    candidates: dict[str, int]
+    seq: int = 0
@@ -13,14 +13,15 @@ from app.models.login_attempt import LoginAttempt
 from app.repository.login_attempt_repository import LoginAttemptRepository
 from app.schemas.auth import LoginRequest, RegisterRequest, TokenResponse
 from app.schemas.user import UserResponse
+from app.services.password_hasher import password_hasher
 from app.services.user import UserService
 from app.utils.jwt import (
     blacklist_token,
     create_pair_tokens,
-    get_token_subject,
+    get_token_claims,
+    is_current_generation,
     is_token_blacklisted,
 )
-from app.utils.password import verify_password
 
 logger = get_logger("auth_service")
 
@@ -50,7 +51,9 @@ class AuthService:
         if not user_model:
             raise UserNotFoundError("Failed to retrieve created user")
 
-        tokens = create_pair_tokens(subject=user_model.id)
+        tokens = create_pair_tokens(
+            subject=user_model.id, generation=user_model.token_generation
+        )
 
         logger.info(f"User registered successfully with id: {user_model.id}")
 
@@ -83,7 +86,7 @@ class AuthService:
             await login_attempt_repo.create(login_attempt)
             raise InvalidCredentialsError("Invalid email or password")
 
-        if not verify_password(login_data.password, user.password_hash):
+        if not await password_hasher.verify(login_data.password, user.password_hash):
             logger.warning(f"Login failed: Invalid password for user {user.id}")
             await login_attempt_repo.create(login_attempt)
             raise InvalidCredentialsError("Invalid email or password")
@@ -92,7 +95,7 @@ class AuthService:
         login_attempt.user_id = user.id
         await login_attempt_repo.create(login_attempt)
 
-        tokens = create_pair_tokens(subject=user.id)
+        tokens = create_pair_tokens(subject=user.id, generation=user.token_generation)
 
         logger.info(f"User {user.id} logged in successfully")
 
@@ -110,19 +113,24 @@ class AuthService:
             raise InvalidCredentialsError("Token is blacklisted")
 
         try:
-            user_id = get_token_subject(refresh_token)
+            claims = get_token_claims(refresh_token)
         except Exception as e:
             logger.warning(f"Invalid refresh token: {str(e)}")
             raise InvalidCredentialsError("Invalid refresh token")
 
-        user = await UserService.get_user_by_id(session, user_id)
+        user_id = str(claims["sub"])
+        user = await UserService.get_principal(session, user_id)
         if not user:
             logger.warning(f"User {user_id} not found for token refresh")
             raise InvalidCredentialsError("User not found")
 
+        if not is_current_generation(claims, user.token_generation):
+            logger.warning(f"Attempt to use refresh token of a revoked generation for user {user_id}")
+            raise InvalidCredentialsError("Token is blacklisted")
+
         await blacklist_token(refresh_token)
 
-        tokens = create_pair_tokens(subject=user_id)
+        tokens = create_pair_tokens(subject=user_id, generation=user.token_generation)
 
         logger.info(f"Token refreshed successfully for user {user_id}")
 
@@ -145,6 +153,29 @@ class AuthService:
         logger.info("User logged out successfully")
         return True
 
+    @staticmethod
+    async def reissue_tokens(session: AsyncSession, user_id: str) -> TokenResponse:
+        """Issue a new token pair at the current token generation of a user."""
+        user = await UserService.get_principal(session, user_id)
+        if not user:
+            raise UserNotFoundError("User not found")
+
+        tokens = create_pair_tokens(subject=user.id, generation=user.token_generation)
+
+        logger.info(f"Tokens reissued for user {user.id}")
+
+        return TokenResponse(**tokens)
+
+    @staticmethod
+    async def logout_all(session: AsyncSession, user_id: str) -> int:
+        """Logout user everywhere by revoking every token issued to them."""
+        logger.info(f"Logging out user {user_id} everywhere")
+
+        generation = await UserService.revoke_all_tokens(session, user_id)
+
+        logger.info(f"User {user_id} logged out everywhere")
+        return generation
+
     @staticmethod
     def set_tokens_in_cookies(
         response: Response, tokens: TokenResponse
@@ -0,0 +1,164 @@
+from typing import Any, Optional, Type
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.database import Base
+from app.db.redis_client import redis_client
+from app.models.election import Election
+from app.models.user import User
+from app.models.user_profile import UserProfile
+from app.models.vote import Vote
+from app.repository.base_repository import BaseRepository
+from app.schemas.pagination import TotalCount, TotalKind, TotalMode
+
+logger = get_logger("count_service")
+
+COUNTED_MODELS: tuple[Type[Base], ...] = (User, UserProfile, Election, Vote)
+
+# Counters only move once they have been seeded by a reconciliation, so a
+# counter that exists always holds a complete count. Every adjustment is also
+# added to a running sum, which lets a reconciliation add the changes committed
+# while it was counting the table.
+_adjust_count_script = redis_client.register_script(
+    """
+    redis.call('INCRBY', KEYS[2], ARGV[1])
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        redis.call('INCRBY', KEYS[1], ARGV[1])
+    end
+    return 1
+    """
+)
+
+_reset_count_script = redis_client.register_script(
+    """
+    local changed = tonumber(redis.call('GET', KEYS[2]) or '0') - tonumber(ARGV[2])
+    local count = tonumber(ARGV[1]) + changed
+    local current = redis.call('GET', KEYS[1]) or ''
+    redis.call('SET', KEYS[1], count)
+    return {tostring(count), current}
+    """
+)
+
+
+def _count_key(model: Type[Base]) -> str:
+    return f"count:{model.__tablename__}"
+
+
+def _changes_key(model: Type[Base]) -> str:
+    return f"count:{model.__tablename__}:changes"
+
+
+def _repository(session: AsyncSession, model: Type[Base]) -> BaseRepository:
+    return BaseRepository(model=model, session=session, log_data_name=model.__name__)
+
+
+class CountService:
+    """
+    Service for list totals. A total is read from the cheapest source that can
+    answer: a Redis row counter, the planner's estimate, or a COUNT bounded by
+    COUNT_EXACT_LIMIT rows when an exact total is asked for.
+    """
+
+    @staticmethod
+    async def adjust(model: Type[Base], delta: int) -> None:
+        """Move the row counter of a table after a committed insert or delete."""
+        if not delta:
+            return
+
+        try:
+            await _adjust_count_script(
+                keys=[_count_key(model), _changes_key(model)], args=[delta]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to adjust {model.__tablename__} row counter: {str(e)}")
+
+    @staticmethod
+    async def get_counter(model: Type[Base]) -> Optional[int]:
+        """Get the row counter of a table, or None if it has not been seeded."""
+        try:
+            counter = await redis_client.get(_count_key(model))
+        except Exception as e:
+            logger.warning(f"Failed to read {model.__tablename__} row counter: {str(e)}")
+            return None
+
+        return int(counter) if counter is not None else None
+
+    @staticmethod
+    async def reconcile(session: AsyncSession, model: Type[Base]) -> bool:
+        """
+        Count the rows of a table and overwrite its counter, adding the
+        adjustments made while counting. The count stops after
+        COUNT_EXACT_LIMIT rows; larger tables are reconciled from the planner's
+        estimate, and only when the counter is missing or further than
+        COUNT_ESTIMATE_TOLERANCE from it. Returns True if the counter drifted.
+        """
+        count_settings = settings.count_settings
+        repository = _repository(session, model)
+
+        changes_before = await redis_client.get(_changes_key(model))
+        counted = await repository.count(limit=count_settings.COUNT_EXACT_LIMIT + 1)
+
+        if counted > count_settings.COUNT_EXACT_LIMIT:
+            counted = await repository.estimate_count()
+            counter = await CountService.get_counter(model)
+            if counted is None or (
+                counter is not None
+                and abs(counter - counted) <= counted * count_settings.COUNT_ESTIMATE_TOLERANCE
+            ):
+                return False
+
+        count, current = await _reset_count_script(
+            keys=[_count_key(model), _changes_key(model)],
+            args=[counted, changes_before or 0],
+        )
+
+        if current and current != count:
+            logger.warning(
+                f"Fixed {model.__tablename__} row counter drift: {current} -> {count}"
+            )
+            return True
+
+        return False
+
+    @staticmethod
+    async def total(
+        session: AsyncSession,
+        model: Type[Base],
+        mode: TotalMode,
+        condition: Any = None,
+    ) -> Optional[TotalCount]:
+        """
+        Get the total of a listing. Without a condition the whole table is
+        counted and the counter or the planner's estimate can answer; with a
+        condition only a bounded exact count can. Returns None if no source
+        can answer in the requested mode.
+        """
+        repository = _repository(session, model)
+        counted = None
+
+        if mode == TotalMode.EXACT:
+            limit = settings.count_settings.COUNT_EXACT_LIMIT
+            counted = await repository.count(
+                condition if condition is not None else True, limit=limit + 1
+            )
+            if counted <= limit:
+                return TotalCount(value=counted, kind=TotalKind.EXACT)
+
+        if condition is None:
+            counter = await CountService.get_counter(model)
+            if counter is not None:
+                return TotalCount(value=counter, kind=TotalKind.COUNTER)
+
+            estimate = await repository.estimate_count()
+            if estimate is not None:
+                return TotalCount(value=estimate, kind=TotalKind.ESTIMATE)
+
+        if counted is not None:
+            return TotalCount(value=counted, kind=TotalKind.AT_LEAST)
+
+        return None
+
+
+count_service = CountService()
@@ -1,26 +1,49 @@
+import time
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Optional
 
+from sqlalchemy import and_, true
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.core.logging_config import get_logger
 from app.exceptions.user import ValidationError, UserNotFoundError
-from app.models.attachment import Attachment
-from app.models.candidates import Candidate
 from app.models.election import Election
-from app.models.election_setting import ElectionSetting
-from app.models.user import User
-from app.repository.attachment_repository import AttachmentRepository
-from app.repository.candidate_repository import CandidateRepository
 from app.repository.election_repository import ElectionRepository
-from app.repository.election_setting_repository import ElectionSettingRepository
-from app.schemas.attachment import AttachmentResponse
-from app.schemas.candidate import CandidateResponse
-from app.schemas.election import ElectionCreate, ElectionUpdate, ElectionResponse
-from app.schemas.election_setting import ElectionSettingResponse
+from app.schemas.attachment import AttachmentCreate, AttachmentResponse
+from app.schemas.candidate import CandidateCreate, CandidateResponse
+from app.schemas.election import (
+    ElectionCreate,
+    ElectionFilter,
+    ElectionResponse,
+    ElectionStatus,
+    ElectionUpdate,
+)
+from app.schemas.election_setting import ElectionSettingBase, ElectionSettingResponse
+from app.schemas.pagination import TotalCount, TotalMode
+from app.schemas.user import Principal
+from app.services.counts import CountService
+from app.services.election_cache import ElectionCacheService
+from app.services.results import ResultsService
+from app.services.tally import TallyService
+from app.services.versions import (
+    ELECTION_LIST_VERSION_KEY,
+    VersionService,
+    results_version_key,
+)
+from app.utils.cursor import encode_cursor, encode_rank_cursor
+from app.utils.search import build_prefix_tsquery
 
 logger = get_logger("election_service")
 
+# Candidates, settings and attachments are loaded with one extra query each,
+# whatever the number of elections read.
+ELECTION_AGGREGATE_OPTIONS = [
+    selectinload(Election.candidates),
+    selectinload(Election.settings),
+    selectinload(Election.attachments),
+]
+
 
 class ElectionService:
     """Service for election CRUD operations."""
@@ -29,7 +52,7 @@ class ElectionService:
     async def create_election(
         session: AsyncSession,
         election_data: ElectionCreate,
-        current_user: User,
+        current_user: Principal,
     ) -> ElectionResponse:
         """Create a new election with candidates."""
         logger.info(f"Creating election: {election_data.title}")
@@ -39,6 +62,7 @@ class ElectionService:
             raise ValidationError("Election must have at least two candidates")
 
         repository = ElectionRepository(session)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
 
         new_election = Election(
             title=election_data.title,
@@ -46,64 +70,32 @@ class ElectionService:
             start_date=election_data.start_date,
             end_date=election_data.end_date,
             is_public=election_data.is_public,
-            created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            created_at=now,
             owner_id=current_user.id,
         )
+        setting = (election_data.settings or ElectionSettingBase()).model_dump()
+        candidates = ElectionService._candidate_rows(election_data.candidates)
+        attachments = ElectionService._attachment_rows(election_data.attachments or [], now)
 
-        created_election = await repository.create(new_election)
-        logger.info(f"Election created successfully with id: {created_election.id}")
-
-        setting_repo = ElectionSettingRepository(session)
-        if election_data.settings:
-            new_setting = ElectionSetting(
-                election_id=created_election.id,
-                allow_revoting=election_data.settings.allow_revoting,
-                max_votes=election_data.settings.max_votes,
-                require_auth=election_data.settings.require_auth,
-            )
-        else:
-            new_setting = ElectionSetting(
-                election_id=created_election.id,
-                allow_revoting=True,
-                max_votes=1,
-                require_auth=True,
-            )
-        await setting_repo.create(new_setting)
-        logger.info(f"Created election settings for election {created_election.id}")
-
-        candidate_repo = CandidateRepository(session)
-
-        for candidate_data in election_data.candidates:
-            new_candidate = Candidate(
-                election_id=created_election.id,
-                name=candidate_data.name,
-                description=candidate_data.description,
-            )
-            await candidate_repo.create(new_candidate)
-
+        created_election = await repository.create_aggregate(
+            new_election, setting, candidates, attachments
+        )
         logger.info(
-            f"Created {len(election_data.candidates)} candidates for election {created_election.id}"
+            f"Election created successfully with id: {created_election.id}, "
+            f"{len(candidates)} candidates and {len(attachments)} attachments"
         )
 
-        if election_data.attachments:
-            attachment_repo = AttachmentRepository(session)
-            for attachment_data in election_data.attachments:
-                new_attachment = Attachment(
-                    election_id=created_election.id,
-                    file_url=attachment_data.file_url,
-                    uploaded_at=datetime.now(timezone.utc).replace(tzinfo=None),
-                )
-                await attachment_repo.create(new_attachment)
-            logger.info(
-                f"Created {len(election_data.attachments)} attachments for election {created_election.id}"
-            )
-
-        await session.refresh(created_election)
+        await ElectionService._bump_versions(ELECTION_LIST_VERSION_KEY)
+        await CountService.adjust(Election, 1)
 
-        return await ElectionService._build_election_response(
-            session, created_election
+        # Drop collections loaded before the writes above so they are read again.
+        session.expire(created_election, ["candidates", "settings", "attachments"])
+        election = await ElectionService._read_election_aggregate(
+            session, created_election.id
         )
 
+        return ElectionService._build_election_response(election)
+
     @staticmethod
     async def get_election_by_id(
         session: AsyncSession, election_id: str
@@ -111,14 +103,48 @@ class ElectionService:
         """Get election by ID."""
         logger.info(f"Getting election by id: {election_id}")
 
-        repository = ElectionRepository(session)
-        election = await repository.read_one(condition=Election.id == election_id)
+        election = await ElectionService._read_election_aggregate(session, election_id)
 
         if not election:
             logger.warning(f"Election with id {election_id} not found")
             return None
 
-        return await ElectionService._build_election_response(session, election)
+        return ElectionService._build_election_response(election)
+
+    @staticmethod
+    async def get_election_json(
+        session: AsyncSession, election_id: str
+    ) -> Optional[str]:
+        """Get serialized election, served from the election cache when possible."""
+        document = await ElectionCacheService.get(election_id)
+        if document is not None:
+            return document
+
+        # The version is read before the database so that an update committed
+        # while the document is built keeps it out of the cache.
+        try:
+            version = await ElectionCacheService.get_version(election_id)
+        except Exception as e:
+            logger.warning(f"Failed to read cached election version: {str(e)}")
+            version = None
+
+        started = time.perf_counter()
+        election = await ElectionService.get_election_by_id(session, election_id)
+
+        if not election:
+            return None
+
+        document = election.model_dump_json()
+
+        if version is not None:
+            try:
+                await ElectionCacheService.store(
+                    election_id, version, document, time.perf_counter() - started
+                )
+            except Exception as e:
+                logger.warning(f"Failed to cache election {election_id}: {str(e)}")
+
+        return document
 
     @staticmethod
     async def update_election(
@@ -139,88 +165,40 @@ class ElectionService:
                 logger.warning("Attempt to update election without candidates")
                 raise ValidationError("Election must have at least two candidates")
 
-        update_dict = election_data.model_dump(
-            exclude_unset=True, exclude={"candidates", "settings", "attachments"}
+        changes = {
+            field: value
+            for field, value in election_data.model_dump(
+                exclude_unset=True, exclude={"candidates", "settings", "attachments"}
+            ).items()
+            if value is not None
+        }
+        settings_data = election_data.settings
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        await repository.update_aggregate(
+            election_id,
+            changes,
+            setting=settings_data.model_dump() if settings_data is not None else None,
+            setting_fields=settings_data.model_fields_set if settings_data is not None else (),
+            candidates=ElectionService._candidate_rows(election_data.candidates),
+            attachments=ElectionService._attachment_rows(election_data.attachments, now),
         )
 
-        if update_dict:
-            updated_election = await repository.update(
-                data=update_dict, condition=Election.id == election_id
-            )
-        else:
-            updated_election = election
-
-        if election_data.settings is not None:
-            setting_repo = ElectionSettingRepository(session)
-            existing_setting = await setting_repo.read_one(
-                condition=ElectionSetting.election_id == election_id
-            )
-
-            if existing_setting:
-                settings_dict = election_data.settings.model_dump(exclude_unset=True)
-                await setting_repo.update(
-                    data=settings_dict, condition=ElectionSetting.id == existing_setting.id
-                )
-                logger.info(f"Updated election settings for election {election_id}")
-            else:
-                new_setting = ElectionSetting(
-                    election_id=election_id,
-                    allow_revoting=election_data.settings.allow_revoting,
-                    max_votes=election_data.settings.max_votes,
-                    require_auth=election_data.settings.require_auth,
-                )
-                await setting_repo.create(new_setting)
-                logger.info(f"Created election settings for election {election_id}")
-
         if election_data.candidates is not None:
-            candidate_repo = CandidateRepository(session)
-
-            existing_candidates = await candidate_repo.read_many(
-                condition=Candidate.election_id == election_id
-            )
-            if existing_candidates:
-                for candidate in existing_candidates:
-                    await candidate_repo.delete(condition=Candidate.id == candidate.id)
-
-            for candidate_data in election_data.candidates:
-                new_candidate = Candidate(
-                    election_id=election_id,
-                    name=candidate_data.name,
-                    description=candidate_data.description,
-                )
-                await candidate_repo.create(new_candidate)
-
-            logger.info(
-                f"Updated candidates for election {election_id}: {len(election_data.candidates)} candidates"
-            )
-
-        if election_data.attachments is not None:
-            attachment_repo = AttachmentRepository(session)
-
-            existing_attachments = await attachment_repo.read_many(
-                condition=Attachment.election_id == election_id
-            )
-            if existing_attachments:
-                for attachment in existing_attachments:
-                    await attachment_repo.delete(condition=Attachment.id == attachment.id)
-
-            for attachment_data in election_data.attachments:
-                new_attachment = Attachment(
-                    election_id=election_id,
-                    file_url=attachment_data.file_url,
-                    uploaded_at=datetime.now(timezone.utc).replace(tzinfo=None),
-                )
-                await attachment_repo.create(new_attachment)
+            try:
+                await ResultsService.mark_dirty([election_id])
+            except Exception as e:
+                logger.warning(f"Failed to flag election results as dirty: {str(e)}")
 
-            logger.info(
-                f"Updated attachments for election {election_id}: {len(election_data.attachments)} attachments"
-            )
+        # Drop collections loaded before the writes above so they are read again.
+        session.expire(election, ["candidates", "settings", "attachments"])
+        election = await ElectionService._read_election_aggregate(session, election_id)
 
-        await session.refresh(updated_election)
+        await ElectionService._invalidate_cached_election(election_id)
 
         logger.info(f"Election with id {election_id} updated successfully")
 
-        return await ElectionService._build_election_response(session, updated_election)
+        return ElectionService._build_election_response(election)
 
     @staticmethod
     async def delete_election(session: AsyncSession, election_id: str) -> bool:
@@ -234,62 +212,195 @@ class ElectionService:
             logger.warning(f"Election with id {election_id} not found for deletion")
             raise UserNotFoundError(f"Election with id {election_id} not found")
 
+        await ElectionService._invalidate_cached_election(election_id)
+        try:
+            await TallyService.discard(election_id)
+        except Exception as e:
+            logger.warning(f"Failed to drop tally of election {election_id}: {str(e)}")
+        # A conditional GET of the results of a deleted election must not get a 304.
+        await ElectionService._bump_versions(results_version_key(election_id))
+        await CountService.adjust(Election, -1)
+
         logger.info(f"Election with id {election_id} deleted successfully")
         return True
 
     @staticmethod
     async def get_all_elections(
-        session: AsyncSession, page: int = 1, page_size: int = 10
-    ) -> list[ElectionResponse]:
-        """Get all elections with pagination."""
-        logger.info(f"Getting all elections - page: {page}, page_size: {page_size}")
+        session: AsyncSession,
+        after: Optional[tuple] = None,
+        page_size: int = 10,
+        filters: Optional[ElectionFilter] = None,
+    ) -> tuple[list[ElectionResponse], Optional[str]]:
+        """Get a page of elections in creation order and the cursor of the next page."""
+        logger.info(
+            f"Getting all elections - after: {after}, page_size: {page_size}, filters: {filters}"
+        )
 
         repository = ElectionRepository(session)
-        elections = await repository.read_paginated(
-            condition=True, page=page, page_size=page_size
+        elections, has_more = await repository.read_keyset(
+            condition=ElectionService._filter_condition(filters),
+            after=after,
+            limit=page_size,
+            options=ELECTION_AGGREGATE_OPTIONS,
+        )
+
+        next_cursor = (
+            encode_cursor(elections[-1].created_at, elections[-1].id) if has_more else None
         )
 
-        if not elections:
-            return []
+        return [
+            ElectionService._build_election_response(election) for election in elections
+        ], next_cursor
 
-        result = []
-        for election in elections:
-            response = await ElectionService._build_election_response(session, election)
-            result.append(response)
+    @staticmethod
+    async def count_elections(
+        session: AsyncSession, mode: TotalMode, filters: Optional[ElectionFilter] = None
+    ) -> Optional[TotalCount]:
+        """Get the total number of elections matching the listing filters."""
+        condition = (
+            ElectionService._filter_condition(filters)
+            if filters is not None and filters.model_dump(exclude_none=True)
+            else None
+        )
 
-        return result
+        return await CountService.total(session, Election, mode, condition)
 
     @staticmethod
-    async def _build_election_response(
-        session: AsyncSession, election: Election
-    ) -> ElectionResponse:
-        """Build election response with candidates, settings, and attachments."""
-        candidate_repo = CandidateRepository(session)
-        setting_repo = ElectionSettingRepository(session)
-        attachment_repo = AttachmentRepository(session)
+    async def search_elections(
+        session: AsyncSession,
+        query: str,
+        after: Optional[tuple] = None,
+        page_size: int = 10,
+    ) -> tuple[list[ElectionResponse], Optional[str]]:
+        """Get a page of elections matching a text query, best match first, and the cursor of the next page."""
+        logger.info(f"Searching elections - query: {query}, after: {after}, page_size: {page_size}")
 
-        candidates = await candidate_repo.read_many(
-            condition=Candidate.election_id == election.id
+        tsquery = build_prefix_tsquery(query)
+        if tsquery is None:
+            raise ValidationError("Search query must contain at least one word")
+
+        repository = ElectionRepository(session)
+        matches, has_more = await repository.search(tsquery, after=after, limit=page_size)
+        if not matches:
+            return [], None
+
+        elections = await repository.read_many(
+            condition=Election.id.in_([election_id for election_id, _ in matches]),
+            options=ELECTION_AGGREGATE_OPTIONS,
         )
+        elections_by_id = {election.id: election for election in elections}
+
+        next_cursor = encode_rank_cursor(matches[-1][1], matches[-1][0]) if has_more else None
+
+        # An election deleted between the two reads is skipped; the cursor
+        # still comes from the ranked page, so the next page is unaffected.
+        return [
+            ElectionService._build_election_response(elections_by_id[election_id])
+            for election_id, _ in matches
+            if election_id in elections_by_id
+        ], next_cursor
+
+    @staticmethod
+    async def get_election_results(
+        session: AsyncSession, election_id: str
+    ) -> Optional[str]:
+        """Get serialized per-candidate results of an election."""
+        logger.info(f"Getting results for election: {election_id}")
+
+        results_json = await ResultsService.get_results_json(session, election_id)
+
+        if results_json is None:
+            logger.warning(f"Election with id {election_id} not found")
+
+        return results_json
+
+    @staticmethod
+    def _filter_condition(filters: Optional[ElectionFilter]) -> Any:
+        """
+        Build the WHERE clause of an election listing. Each filter is a plain
+        comparison on an indexed column, so the composite election indexes can
+        serve the common combinations as range scans.
+        """
+        if filters is None:
+            return true()
+
+        conditions = []
+
+        if filters.status is not None:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            if filters.status == ElectionStatus.UPCOMING:
+                conditions.append(Election.start_date > now)
+            elif filters.status == ElectionStatus.ACTIVE:
+                conditions.extend([Election.end_date >= now, Election.start_date <= now])
+            else:
+                conditions.append(Election.end_date < now)
+
+        if filters.is_public is not None:
+            conditions.append(Election.is_public == filters.is_public)
+        if filters.owner_id is not None:
+            conditions.append(Election.owner_id == filters.owner_id)
+        if filters.date_from is not None:
+            conditions.append(Election.end_date >= filters.date_from)
+        if filters.date_to is not None:
+            conditions.append(Election.start_date <= filters.date_to)
+
+        return and_(true(), *conditions)
+
+    @staticmethod
+    def _candidate_rows(
+        candidates: Optional[list[CandidateCreate]],
+    ) -> Optional[list[dict[str, Any]]]:
+        if candidates is None:
+            return None
 
-        candidate_responses = [
-            CandidateResponse.model_validate(candidate) for candidate in candidates
+        return [
+            {"name": candidate_data.name, "description": candidate_data.description}
+            for candidate_data in candidates
         ]
 
-        settings = await setting_repo.read_one(
-            condition=ElectionSetting.election_id == election.id
-        )
-        settings_response = (
-            ElectionSettingResponse.model_validate(settings) if settings else None
-        )
+    @staticmethod
+    def _attachment_rows(
+        attachments: Optional[list[AttachmentCreate]], uploaded_at: datetime
+    ) -> Optional[list[dict[str, Any]]]:
+        if attachments is None:
+            return None
 
-        attachments = await attachment_repo.read_many(
-            condition=Attachment.election_id == election.id
-        )
-        attachment_responses = [
-            AttachmentResponse.model_validate(attachment) for attachment in attachments
+        return [
+            {"file_url": attachment_data.file_url, "uploaded_at": uploaded_at}
+            for attachment_data in attachments
         ]
 
+    @staticmethod
+    async def _invalidate_cached_election(election_id: str) -> None:
+        try:
+            await ElectionCacheService.invalidate(election_id)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached election {election_id}: {str(e)}")
+
+        await ElectionService._bump_versions(ELECTION_LIST_VERSION_KEY)
+
+    @staticmethod
+    async def _bump_versions(*keys: str) -> None:
+        try:
+            await VersionService.bump(*keys)
+        except Exception as e:
+            logger.warning(f"Failed to bump versions {keys}: {str(e)}")
+
+    @staticmethod
+    async def _read_election_aggregate(
+        session: AsyncSession, election_id: str
+    ) -> Optional[Election]:
+        """Read an election with its candidates, settings and attachments."""
+        repository = ElectionRepository(session)
+        election = await repository.read_one(
+            condition=Election.id == election_id, options=ELECTION_AGGREGATE_OPTIONS
+        )
+
+        return election
+
+    @staticmethod
+    def _build_election_response(election: Election) -> ElectionResponse:
+        """Build election response from an election with loaded relationships."""
         return ElectionResponse(
             id=election.id,
             title=election.title,
@@ -299,9 +410,19 @@ class ElectionService:
             is_public=election.is_public,
             owner_id=election.owner_id,
             created_at=election.created_at,
-            candidates=candidate_responses,
-            settings=settings_response,
-            attachments=attachment_responses,
+            candidates=[
+                CandidateResponse.model_validate(candidate)
+                for candidate in election.candidates
+            ],
+            settings=(
+                ElectionSettingResponse.model_validate(election.settings)
+                if election.settings
+                else None
+            ),
+            attachments=[
+                AttachmentResponse.model_validate(attachment)
+                for attachment in election.attachments
+            ],
         )
 
 
@@ -0,0 +1,92 @@
+import math
+import random
+import time
+from typing import Optional
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.redis_client import redis_client
+from app.services.versions import VersionService, election_version_key
+
+logger = get_logger("election_cache_service")
+
+# The document is only written if the version read before it was built is still
+# current, so a rebuild racing an invalidation cannot put stale data back.
+_store_document_script = redis_client.register_script(
+    """
+    if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+        return 0
+    end
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+    """
+)
+
+
+def _document_key(election_id: str) -> str:
+    return f"election:doc:{election_id}"
+
+
+class ElectionCacheService:
+    """
+    Read-through cache of serialized election documents.
+
+    A cached value is "<expiry>:<delta>:<json>", where delta is the time the
+    document took to build. Readers refresh it early with a probability that
+    grows as the expiry approaches (XFetch), so a hot election is rebuilt by
+    one request instead of all of them at once.
+    """
+
+    @staticmethod
+    async def get(election_id: str) -> Optional[str]:
+        """Get the cached document, or None if it is missing or due for an early refresh."""
+        try:
+            cached = await redis_client.get(_document_key(election_id))
+        except Exception as e:
+            logger.warning(f"Failed to read cached election {election_id}: {str(e)}")
+            return None
+
+        if not cached:
+            return None
+
+        expiry, delta, document = cached.split(":", 2)
+        beta = settings.election_cache_settings.ELECTION_CACHE_XFETCH_BETA
+        # 1 - random() lies in (0, 1], so the logarithm is always defined.
+        early_by = -float(delta) * beta * math.log(1.0 - random.random())
+        if time.time() + early_by >= float(expiry):
+            logger.debug(f"Refreshing cached election {election_id} early")
+            return None
+
+        return document
+
+    @staticmethod
+    async def get_version(election_id: str) -> str:
+        """Get the current version of an election document."""
+        versions = await VersionService.get(election_version_key(election_id))
+        return versions[0]
+
+    @staticmethod
+    async def store(
+        election_id: str, version: str, document: str, build_seconds: float
+    ) -> bool:
+        """Store a document built at the given version. Returns False if it was invalidated meanwhile."""
+        ttl = settings.election_cache_settings.ELECTION_CACHE_TTL_SECONDS
+        value = f"{time.time() + ttl}:{build_seconds}:{document}"
+
+        stored = await _store_document_script(
+            keys=[_document_key(election_id), election_version_key(election_id)],
+            args=[version, value, ttl],
+        )
+        if not stored:
+            logger.debug(f"Skipped caching election {election_id}: version changed")
+
+        return bool(stored)
+
+    @staticmethod
+    async def invalidate(election_id: str) -> None:
+        """Move the version on and drop the cached document."""
+        await VersionService.bump(election_version_key(election_id))
+        await redis_client.delete(_document_key(election_id))
+
+
+election_cache_service = ElectionCacheService()
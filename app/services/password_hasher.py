@@ -0,0 +1,123 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.exceptions.user import ServiceBusyError
+from app.utils.password import hash_password, verify_password
+
+logger = get_logger("password_hasher")
+
+
+def _run_timed(func: Callable[..., Any], *args: Any) -> tuple[float, Any]:
+    # Runs in a pool process; CLOCK_MONOTONIC is shared by every process of
+    # the host, so the start time can be compared with the submission time.
+    return time.monotonic(), func(*args)
+
+
+class PasswordHasher:
+    """
+    Bounded process pool for bcrypt hashing and verification.
+
+    Each bcrypt call takes a few hundred milliseconds of CPU, which would block
+    every other request of the worker if run on the event loop. Calls run in
+    PASSWORD_HASH_WORKERS processes instead; once PASSWORD_HASH_MAX_PENDING
+    calls are waiting for a process, new ones are rejected with 503 rather than
+    queued without bound. Before start() and after stop() calls run in a thread.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+
+        self.submitted_total = 0
+        self.rejected_total = 0
+        self.failed_total = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.run_seconds_total = 0.0
+        self.last_wait_seconds = 0.0
+
+    async def start(self) -> None:
+        """Start the pool processes."""
+        if self._executor is not None:
+            return
+
+        workers = settings.password_hash_settings.PASSWORD_HASH_WORKERS
+        # Forking a process that runs an event loop and open connections is
+        # unsafe, so the workers are started fresh.
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"Password hasher started with {workers} processes")
+
+    async def stop(self) -> None:
+        """Stop the pool after the calls in progress."""
+        if self._executor is None:
+            return
+
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True)
+        logger.info("Password hasher stopped")
+
+    def metrics(self) -> dict[str, Any]:
+        """Return pool counters."""
+        completed = self.submitted_total - self.failed_total - self._in_flight
+        return {
+            "running": self._executor is not None,
+            "workers": settings.password_hash_settings.PASSWORD_HASH_WORKERS,
+            "in_flight": self._in_flight,
+            "submitted_total": self.submitted_total,
+            "rejected_total": self.rejected_total,
+            "failed_total": self.failed_total,
+            "last_wait_seconds": round(self.last_wait_seconds, 4),
+            "avg_wait_seconds": round(self.wait_seconds_total / completed, 4) if completed else 0.0,
+            "max_wait_seconds": round(self.wait_seconds_max, 4),
+            "avg_run_seconds": round(self.run_seconds_total / completed, 4) if completed else 0.0,
+        }
+
+    async def hash(self, password: str) -> str:
+        """Hash a plain text password."""
+        return await self._submit(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a plain text password against a hashed password."""
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        hash_settings = settings.password_hash_settings
+        capacity = hash_settings.PASSWORD_HASH_WORKERS + hash_settings.PASSWORD_HASH_MAX_PENDING
+        if self._in_flight >= capacity:
+            self.rejected_total += 1
+            logger.warning(f"Password hasher saturated: {self._in_flight} calls in flight")
+            raise ServiceBusyError(retry_after=hash_settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+
+        self._in_flight += 1
+        self.submitted_total += 1
+        submitted = time.monotonic()
+
+        try:
+            started, result = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _run_timed, func, *args
+            )
+
+        except Exception:
+            self.failed_total += 1
+            raise
+
+        finally:
+            self._in_flight -= 1
+
+        finished = time.monotonic()
+        self.last_wait_seconds = started - submitted
+        self.wait_seconds_total += self.last_wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, self.last_wait_seconds)
+        self.run_seconds_total += finished - started
+
+        return result
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.redis_client import redis_client
+from app.schemas.user import Principal
+from app.services.versions import VersionService
+
+logger = get_logger("principal_cache")
+
+INVALIDATION_CHANNEL = "principals:invalidate"
+
+# The principal is only written if the version read before the user was loaded
+# is still current, so a load racing an invalidation cannot put stale data back.
+_store_principal_script = redis_client.register_script(
+    """
+    if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+        return 0
+    end
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+    """
+)
+
+
+def _principal_key(user_id: str) -> str:
+    return f"principal:{user_id}"
+
+
+def principal_version_key(user_id: str) -> str:
+    return f"principal:version:{user_id}"
+
+
+class PrincipalCache:
+    """
+    Two-tier cache of authenticated users, keyed by user id.
+
+    Each worker keeps up to PRINCIPAL_CACHE_SIZE principals in an LRU for
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS in front of Redis, which keeps them for
+    PRINCIPAL_CACHE_TTL_SECONDS. Invalidations drop the Redis entry and are
+    published to every worker, which drop their local copy; the local TTL
+    bounds staleness if a message is missed. The local tier is only used
+    while the invalidation listener runs.
+    """
+
+    def __init__(self):
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+        self.local_hits_total = 0
+        self.redis_hits_total = 0
+        self.misses_total = 0
+        self.invalidations_received_total = 0
+
+    async def start(self) -> None:
+        """Subscribe to invalidations and start the listener task."""
+        if self._task is not None:
+            return
+
+        self._stopping.clear()
+        self._pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(INVALIDATION_CHANNEL)
+        self._task = asyncio.create_task(self._listen_loop(), name="principal-invalidations")
+        logger.info("Principal cache started")
+
+    async def stop(self) -> None:
+        """Stop the listener and drop the local tier."""
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        await self._task
+        self._task = None
+        await self._pubsub.aclose()
+        self._pubsub = None
+        self._entries.clear()
+        logger.info("Principal cache stopped")
+
+    def metrics(self) -> dict[str, Any]:
+        """Return hit and invalidation counters."""
+        return {
+            "running": self._task is not None,
+            "local_entries": len(self._entries),
+            "local_hits_total": self.local_hits_total,
+            "redis_hits_total": self.redis_hits_total,
+            "misses_total": self.misses_total,
+            "invalidations_received_total": self.invalidations_received_total,
+        }
+
+    async def get(self, user_id: str) -> Optional[Principal]:
+        """Get a cached principal from the local tier, then from Redis."""
+        principal = self._get_local(user_id)
+        if principal is not None:
+            self.local_hits_total += 1
+            return principal
+
+        try:
+            cached = await redis_client.get(_principal_key(user_id))
+        except Exception as e:
+            logger.warning(f"Failed to read cached principal {user_id}: {str(e)}")
+            return None
+
+        if cached is None:
+            self.misses_total += 1
+            return None
+
+        self.redis_hits_total += 1
+        principal = Principal.model_validate_json(cached)
+        self._put_local(principal)
+        return principal
+
+    async def get_version(self, user_id: str) -> Optional[str]:
+        """Get the current version of a principal, or None if Redis cannot be read."""
+        try:
+            versions = await VersionService.get(principal_version_key(user_id))
+        except Exception as e:
+            logger.warning(f"Failed to read principal version {user_id}: {str(e)}")
+            return None
+
+        return versions[0]
+
+    async def store(self, principal: Principal, version: str) -> bool:
+        """Store a principal loaded at the given version. Returns False if it was invalidated meanwhile."""
+        try:
+            stored = await _store_principal_script(
+                keys=[_principal_key(principal.id), principal_version_key(principal.id)],
+                args=[
+                    version,
+                    principal.model_dump_json(),
+                    settings.principal_cache_settings.PRINCIPAL_CACHE_TTL_SECONDS,
+                ],
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache principal {principal.id}: {str(e)}")
+            return False
+
+        if not stored:
+            logger.debug(f"Skipped caching principal {principal.id}: version changed")
+            return False
+
+        self._put_local(principal)
+        return True
+
+    async def invalidate(self, user_id: str) -> None:
+        """Drop a principal from Redis and from the local tier of every worker."""
+        self._entries.pop(user_id, None)
+        await VersionService.bump(principal_version_key(user_id))
+        await redis_client.delete(_principal_key(user_id))
+        await redis_client.publish(INVALIDATION_CHANNEL, user_id)
+
+    def _get_local(self, user_id: str) -> Optional[Principal]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+
+        expires_at, principal = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+
+        self._entries.move_to_end(user_id)
+        return principal
+
+    def _put_local(self, principal: Principal) -> None:
+        if self._task is None:
+            return
+
+        cache_settings = settings.principal_cache_settings
+        self._entries[principal.id] = (
+            time.monotonic() + cache_settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+            principal,
+        )
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > cache_settings.PRINCIPAL_CACHE_SIZE:
+            self._entries.popitem(last=False)
+
+    async def _listen_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Invalidations may have been missed while the connection was down.
+                logger.error(f"Error reading principal invalidations: {str(e)}")
+                self._entries.clear()
+                await asyncio.sleep(1)
+                continue
+
+            if message and message["type"] == "message":
+                self.invalidations_received_total += 1
+                self._entries.pop(message["data"], None)
+
+
+principal_cache = PrincipalCache()
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.redis_client import redis_client
+from app.models.election import Election
+from app.models.election_results_cache import ElectionResultsCache
+from app.repository.election_repository import ElectionRepository
+from app.repository.election_results_cache_repository import (
+    ElectionResultsCacheRepository,
+)
+from app.schemas.election_results_cache import ElectionResultCandidate, ElectionResults
+from app.services.versions import VersionService, results_version_key
+
+logger = get_logger("results_service")
+
+DIRTY_SET_KEY = "results:dirty"
+
+
+class ResultsService:
+    """Service for aggregated election results stored in ElectionResultsCache."""
+
+    @staticmethod
+    async def mark_dirty(election_ids: Iterable[str]) -> None:
+        """Flag elections whose cached results no longer match the votes table."""
+        election_ids = set(election_ids)
+        if not election_ids:
+            return
+
+        await redis_client.sadd(DIRTY_SET_KEY, *election_ids)
+
+    @staticmethod
+    async def pop_dirty(count: int) -> list[str]:
+        """Take up to count elections off the dirty set."""
+        return list(await redis_client.spop(DIRTY_SET_KEY, count) or [])
+
+    @staticmethod
+    async def get_results_json(
+        session: AsyncSession, election_id: str
+    ) -> Optional[str]:
+        """
+        Get the serialized results of an election. The cached blob is served as
+        is while it is younger than RESULTS_STALENESS_SECONDS or no vote has
+        changed since it was computed; otherwise it is recomputed first.
+        """
+        repository = ElectionResultsCacheRepository(session)
+        cached = await repository.read_one(
+            condition=ElectionResultsCache.election_id == election_id
+        )
+
+        if cached and cached.results_json:
+            age = datetime.now(timezone.utc).replace(tzinfo=None) - cached.updated_at
+            if age <= timedelta(seconds=settings.results_settings.RESULTS_STALENESS_SECONDS):
+                return cached.results_json
+            if not await ResultsService._is_dirty(election_id):
+                return cached.results_json
+        else:
+            election = await ElectionRepository(session).read_one(
+                condition=Election.id == election_id
+            )
+            if not election:
+                return None
+
+        try:
+            await redis_client.srem(DIRTY_SET_KEY, election_id)
+        except Exception as e:
+            logger.warning(f"Failed to clear dirty results flag: {str(e)}")
+
+        return await ResultsService.refresh(session, election_id)
+
+    @staticmethod
+    async def refresh(session: AsyncSession, election_id: str) -> str:
+        """Recompute the results of an election and store them in the cache."""
+        computed_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        repository = ElectionResultsCacheRepository(session)
+
+        rows = await repository.read_vote_counts(election_id)
+        total_votes = sum(row.votes for row in rows)
+
+        results = ElectionResults(
+            election_id=election_id,
+            total_votes=total_votes,
+            candidates=[
+                ElectionResultCandidate(
+                    candidate_id=row.candidate_id,
+                    name=row.name,
+                    votes=row.votes,
+                    percentage=round(row.votes * 100 / total_votes, 2) if total_votes else 0.0,
+                )
+                for row in rows
+            ],
+            computed_at=computed_at,
+        )
+        results_json = results.model_dump_json()
+
+        await repository.upsert(election_id, results_json, computed_at)
+        logger.debug(f"Refreshed results of election {election_id}: {total_votes} votes")
+
+        # The ETag of the results follows the stored blob, not the votes, since
+        # the blob may trail the votes by up to RESULTS_STALENESS_SECONDS.
+        try:
+            await VersionService.bump(results_version_key(election_id))
+        except Exception as e:
+            logger.warning(f"Failed to bump results version: {str(e)}")
+
+        return results_json
+
+    @staticmethod
+    async def _is_dirty(election_id: str) -> bool:
+        try:
+            return bool(await redis_client.sismember(DIRTY_SET_KEY, election_id))
+        except Exception as e:
+            logger.warning(f"Failed to read dirty results flag: {str(e)}")
+            return True
+
+
+results_service = ResultsService()
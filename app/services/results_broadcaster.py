@@ -0,0 +1,346 @@
+import asyncio
+import json
+from collections import defaultdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.redis_client import redis_client
+from app.schemas.vote import VoteChange, VoteTallyResponse
+
+logger = get_logger("results_broadcaster")
+
+TOTAL_FIELD = "_total"
+
+
+def _channel(election_id: str) -> str:
+    return f"results:{election_id}"
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class ResultsSubscription:
+    """
+    Deltas of one election waiting to be sent to one stream. Deltas that arrive
+    while the stream is busy are merged, so a slow client never queues more
+    than one counter per candidate.
+
+    Messages carry the range of tally sequences they cover. Those received
+    before the snapshot is read are held back, then every message is compared
+    with the snapshot sequence: covered ones are dropped, and one the snapshot
+    only partly covers marks the subscription stale so a new snapshot is sent.
+    """
+
+    def __init__(self, election_id: str):
+        self.election_id = election_id
+        self.snapshot_seq: Optional[int] = None
+        self.pending: dict[str, int] = defaultdict(int)
+        self.pending_seq = 0
+        self.stale = False
+        self.ready = asyncio.Event()
+        self._held: list[dict[str, Any]] = []
+
+    def merge(self, message: dict[str, Any]) -> None:
+        if self.snapshot_seq is None:
+            self._held.append(message)
+            return
+
+        if message["seq"] <= self.snapshot_seq:
+            return
+
+        if message["from_seq"] <= self.snapshot_seq:
+            self.stale = True
+        else:
+            for field, delta in message["deltas"].items():
+                self.pending[field] += delta
+            self.pending_seq = max(self.pending_seq, message["seq"])
+        self.ready.set()
+
+    def drain(self) -> tuple[int, dict[str, int]]:
+        deltas = {field: delta for field, delta in self.pending.items() if delta}
+        self.pending.clear()
+        self.ready.clear()
+        return self.pending_seq, deltas
+
+    def start_snapshot(self) -> None:
+        """Hold messages back while a new snapshot is read."""
+        self.snapshot_seq = None
+        self.pending.clear()
+        self.pending_seq = 0
+        self.stale = False
+        self.ready.clear()
+
+    def set_snapshot(self, seq: int) -> None:
+        """Apply the held messages against the sequence of the snapshot sent."""
+        self.snapshot_seq = seq
+        held, self._held = self._held, []
+        for message in held:
+            self.merge(message)
+
+
+class ResultsBroadcaster:
+    """
+    Pushes live tally deltas to Server-Sent Event streams.
+
+    Vote changes made by this worker are coalesced for RESULTS_STREAM_TICK_MS
+    and published once per election to the results:{election_id} channel.
+    Every worker holds a single pub/sub connection subscribed to the elections
+    it has streams for and fans each message out to those streams in-process.
+    Each message carries the range of tally sequences (see TallyService) of
+    the changes it merges, so streams can tell which deltas a snapshot covers.
+    """
+
+    SUBSCRIBE_TIMEOUT_SECONDS = 5
+
+    def __init__(self):
+        self._outgoing: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._outgoing_seqs: dict[str, tuple[int, int]] = {}
+        self._subscriptions: dict[str, set[ResultsSubscription]] = defaultdict(set)
+        self._confirmed: dict[str, asyncio.Event] = {}
+        self._pubsub = None
+        self._subscribed = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+        self.published_total = 0
+        self.received_total = 0
+
+    async def start(self) -> None:
+        """Start the publishing and listening tasks."""
+        if self._tasks:
+            return
+
+        self._stopping.clear()
+        self._pubsub = redis_client.pubsub()
+        self._tasks = [
+            asyncio.create_task(self._publish_loop(), name="results-publisher"),
+            asyncio.create_task(self._listen_loop(), name="results-listener"),
+        ]
+        logger.info("Results broadcaster started")
+
+    async def stop(self) -> None:
+        """Publish the remaining deltas and close the pub/sub connection."""
+        if not self._tasks:
+            return
+
+        self._stopping.set()
+        self._subscribed.set()
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.ready.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        await self._publish_pending()
+        await self._pubsub.aclose()
+        self._pubsub = None
+        logger.info("Results broadcaster stopped")
+
+    def metrics(self) -> dict[str, Any]:
+        """Return publish and fan-out counters."""
+        return {
+            "running": bool(self._tasks),
+            "elections": len(self._subscriptions),
+            "subscribers": sum(len(subs) for subs in self._subscriptions.values()),
+            "published_total": self.published_total,
+            "received_total": self.received_total,
+        }
+
+    def record(self, changes: list[VoteChange], seqs: list[int]) -> None:
+        """
+        Add committed vote changes to the deltas of the current tick, with the
+        tally sequence each one was applied at. Changes without a sequence did
+        not move the tally and are left out.
+        """
+        if not self._tasks:
+            return
+
+        for change, seq in zip(changes, seqs):
+            if not seq:
+                continue
+
+            first_seq, last_seq = self._outgoing_seqs.get(change.election_id, (seq, seq))
+            self._outgoing_seqs[change.election_id] = (min(first_seq, seq), max(last_seq, seq))
+
+            deltas = self._outgoing[change.election_id]
+            if change.previous_candidate_id:
+                deltas[change.previous_candidate_id] -= 1
+                deltas[TOTAL_FIELD] -= 1
+            if change.candidate_id:
+                deltas[change.candidate_id] += 1
+                deltas[TOTAL_FIELD] += 1
+
+    async def subscribe(self, election_id: str) -> ResultsSubscription:
+        """
+        Register a stream for the deltas of an election. Returns once Redis has
+        confirmed the channel subscription, so a snapshot read afterwards
+        cannot miss a message.
+        """
+        subscription = ResultsSubscription(election_id)
+
+        async with self._lock:
+            if not self._subscriptions[election_id] and self._pubsub is not None:
+                self._confirmed[election_id] = asyncio.Event()
+                await self._pubsub.subscribe(_channel(election_id))
+                self._subscribed.set()
+            self._subscriptions[election_id].add(subscription)
+            confirmed = self._confirmed.get(election_id)
+
+        if confirmed is not None:
+            try:
+                await asyncio.wait_for(confirmed.wait(), timeout=self.SUBSCRIBE_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning(f"Subscription to results of election {election_id} not confirmed")
+
+        return subscription
+
+    async def unsubscribe(self, subscription: ResultsSubscription) -> None:
+        """Remove a stream, dropping the channel when it was the last one."""
+        election_id = subscription.election_id
+
+        async with self._lock:
+            self._subscriptions[election_id].discard(subscription)
+            if not self._subscriptions[election_id]:
+                del self._subscriptions[election_id]
+                self._confirmed.pop(election_id, None)
+                if self._pubsub is not None:
+                    await self._pubsub.unsubscribe(_channel(election_id))
+
+    async def events(
+        self,
+        election_id: str,
+        load_snapshot: Callable[[], Awaitable[Optional[VoteTallyResponse]]],
+    ) -> AsyncIterator[str]:
+        """
+        Yield a snapshot of an election, then its deltas as they arrive. The
+        stream is subscribed when iteration starts, before the snapshot is
+        read, and unsubscribed when the client disconnects. Snapshot and deltas
+        carry the tally sequence; a delta only holds changes made after the
+        last snapshot, and a new snapshot is sent when a delta straddles it.
+        """
+        heartbeat = settings.results_settings.RESULTS_STREAM_HEARTBEAT_SECONDS
+        subscription = await self.subscribe(election_id)
+
+        try:
+            while not self._stopping.is_set():
+                if subscription.snapshot_seq is None or subscription.stale:
+                    subscription.start_snapshot()
+                    snapshot = await load_snapshot()
+                    if snapshot is None:
+                        return
+                    subscription.set_snapshot(snapshot.seq)
+                    yield _sse("snapshot", snapshot.model_dump(mode="json"))
+                    continue
+
+                try:
+                    await asyncio.wait_for(subscription.ready.wait(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                if subscription.stale:
+                    continue
+
+                seq, deltas = subscription.drain()
+                if not deltas:
+                    continue
+
+                yield _sse(
+                    "delta",
+                    {
+                        "election_id": subscription.election_id,
+                        "seq": seq,
+                        "total": deltas.pop(TOTAL_FIELD, 0),
+                        "candidates": deltas,
+                    },
+                )
+
+        finally:
+            await self.unsubscribe(subscription)
+
+    async def _publish_loop(self) -> None:
+        tick = settings.results_settings.RESULTS_STREAM_TICK_MS / 1000
+
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=tick)
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self._publish_pending()
+            except Exception as e:
+                logger.error(f"Error publishing results deltas: {str(e)}")
+
+    async def _publish_pending(self) -> None:
+        outgoing, self._outgoing = self._outgoing, defaultdict(lambda: defaultdict(int))
+        outgoing_seqs, self._outgoing_seqs = self._outgoing_seqs, {}
+
+        # Changes that cancel out are still published: their sequences have
+        # moved, and a snapshot taken between them must be detected.
+        messages = {
+            election_id: {
+                "from_seq": first_seq,
+                "seq": last_seq,
+                "deltas": {
+                    field: delta for field, delta in outgoing[election_id].items() if delta
+                },
+            }
+            for election_id, (first_seq, last_seq) in outgoing_seqs.items()
+        }
+        if not messages:
+            return
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for election_id, message in messages.items():
+                pipe.publish(_channel(election_id), json.dumps(message))
+            await pipe.execute()
+
+        self.published_total += len(messages)
+
+    async def _listen_loop(self) -> None:
+        while not self._stopping.is_set():
+            if not self._pubsub.subscribed:
+                self._subscribed.clear()
+                await self._subscribed.wait()
+                continue
+
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=False, timeout=1.0
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error reading results channel: {str(e)}")
+                await asyncio.sleep(1)
+                continue
+
+            if not message:
+                continue
+            if message["type"] == "subscribe":
+                self._confirm(message["channel"])
+            elif message["type"] == "message":
+                self._dispatch(message["channel"], message["data"])
+
+    def _confirm(self, channel: str) -> None:
+        confirmed = self._confirmed.get(channel.split(":", 1)[1])
+        if confirmed is not None:
+            confirmed.set()
+
+    def _dispatch(self, channel: str, data: str) -> None:
+        election_id = channel.split(":", 1)[1]
+        subscriptions = self._subscriptions.get(election_id)
+        if not subscriptions:
+            return
+
+        self.received_total += 1
+        message = json.loads(data)
+        for subscription in subscriptions:
+            subscription.merge(message)
+
+
+results_broadcaster = ResultsBroadcaster()
@@ -0,0 +1,175 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from redis.exceptions import WatchError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.redis_client import redis_client
+from app.models.election import Election
+from app.repository.election_repository import ElectionRepository
+from app.repository.vote_repository import VoteRepository
+from app.schemas.vote import VoteChange, VoteTallyResponse
+
+logger = get_logger("tally_service")
+
+TOTAL_FIELD = "_total"
+SEQ_FIELD = "_seq"
+
+# Counters are only moved once the hash has been seeded from the database, so a
+# hash that exists always holds complete counts. Every move bumps the sequence
+# of the hash and returns it; 0 means nothing was moved.
+_apply_change_script = redis_client.register_script(
+    """
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return 0
+    end
+    local delta = 0
+    if ARGV[1] ~= '' then
+        redis.call('HINCRBY', KEYS[1], ARGV[1], -1)
+        delta = delta - 1
+    end
+    if ARGV[2] ~= '' then
+        redis.call('HINCRBY', KEYS[1], ARGV[2], 1)
+        delta = delta + 1
+    end
+    if delta ~= 0 then
+        redis.call('HINCRBY', KEYS[1], '_total', delta)
+    end
+    return redis.call('HINCRBY', KEYS[1], '_seq', 1)
+    """
+)
+
+
+def _tally_key(election_id: str) -> str:
+    return f"tally:{election_id}"
+
+
+class TallyService:
+    """Service for live per-candidate vote counters kept in Redis hashes."""
+
+    @staticmethod
+    async def apply_changes(changes: list[VoteChange]) -> list[int]:
+        """
+        Move the counters of committed vote mutations atomically. Returns the
+        sequence of the tally after each change, or 0 for changes that moved
+        nothing.
+        """
+        moved = [
+            index
+            for index, change in enumerate(changes)
+            if change.previous_candidate_id != change.candidate_id
+        ]
+        seqs = [0] * len(changes)
+        if not moved:
+            return seqs
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for index in moved:
+                await _apply_change_script(
+                    keys=[_tally_key(changes[index].election_id)],
+                    args=[
+                        changes[index].previous_candidate_id or "",
+                        changes[index].candidate_id or "",
+                    ],
+                    client=pipe,
+                )
+            results = await pipe.execute()
+
+        for index, seq in zip(moved, results):
+            seqs[index] = int(seq)
+
+        return seqs
+
+    @staticmethod
+    async def get_tally(
+        session: AsyncSession, election_id: str
+    ) -> Optional[VoteTallyResponse]:
+        """Get the live counts of an election, seeding them from the database if needed."""
+        counters = await redis_client.hgetall(_tally_key(election_id))
+
+        if not counters:
+            election = await ElectionRepository(session).read_one(
+                condition=Election.id == election_id
+            )
+            if not election:
+                return None
+
+            await TallyService.reconcile(session, election_id, election.end_date)
+            counters = await redis_client.hgetall(_tally_key(election_id))
+
+        return TallyService._to_response(election_id, counters)
+
+    @staticmethod
+    async def reconcile(
+        session: AsyncSession, election_id: str, ends_at: datetime
+    ) -> bool:
+        """
+        Compare the counters of an election with a GROUP BY over votes and
+        overwrite them if they drifted, keeping the sequence moving forward.
+        Written counters expire TALLY_RETENTION_SECONDS after the election
+        ends, or after now for an election that already ended. The write is
+        skipped if the counters move while the database is read. Returns True
+        if the counters were fixed.
+        """
+        key = _tally_key(election_id)
+        expires_at = max(ends_at.replace(tzinfo=timezone.utc), datetime.now(timezone.utc))
+        expires_at = int(expires_at.timestamp()) + settings.vote_settings.TALLY_RETENTION_SECONDS
+
+        async with redis_client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                current = await pipe.hgetall(key)
+
+                counts = await VoteRepository(session).count_by_candidate(election_id)
+                expected = {candidate_id: str(count) for candidate_id, count in counts.items()}
+                expected[TOTAL_FIELD] = str(sum(counts.values()))
+
+                current_counts = {
+                    field: value
+                    for field, value in current.items()
+                    if value != "0" and field != SEQ_FIELD
+                }
+                expected_counts = {field: value for field, value in expected.items() if value != "0"}
+                if current and current_counts == expected_counts:
+                    return False
+
+                expected[SEQ_FIELD] = str(int(current.get(SEQ_FIELD, 0)) + 1)
+
+                pipe.multi()
+                pipe.delete(key)
+                pipe.hset(key, mapping=expected)
+                pipe.expireat(key, expires_at)
+                await pipe.execute()
+
+            except WatchError:
+                logger.debug(f"Tally of election {election_id} changed during reconciliation")
+                return False
+
+        if current:
+            logger.warning(
+                f"Fixed tally drift for election {election_id}: {current} -> {expected}"
+            )
+        return True
+
+    @staticmethod
+    async def discard(election_id: str) -> None:
+        """Drop the counters of a deleted election."""
+        await redis_client.delete(_tally_key(election_id))
+
+    @staticmethod
+    def _to_response(election_id: str, counters: dict[str, str]) -> VoteTallyResponse:
+        return VoteTallyResponse(
+            election_id=election_id,
+            total=int(counters.get(TOTAL_FIELD, 0)),
+            candidates={
+                candidate_id: int(count)
+                for candidate_id, count in counters.items()
+                if candidate_id not in (TOTAL_FIELD, SEQ_FIELD) and int(count) > 0
+            },
+            seq=int(counters.get(SEQ_FIELD, 0)),
+        )
+
+
+tally_service = TallyService()
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from typing import Any, Optional
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.redis_client import redis_client
+from app.utils.bloom import BloomFilter
+
+logger = get_logger("token_revocation")
+
+REVOCATION_CHANNEL = "tokens:revoked"
+REVOKED_INDEX_KEY = "revoked:jtis"
+
+
+def _revoked_key(jti: str) -> str:
+    return f"revoked:{jti}"
+
+
+class TokenRevocationList:
+    """
+    Revoked token ids (jti), each kept in Redis until its token would have expired.
+
+    Every worker holds a Bloom filter of the revoked ids, loaded from the
+    REVOKED_INDEX_KEY sorted set on start and kept in sync through pub/sub, so
+    an id that is not in the filter is known not to be revoked without asking
+    Redis. Only filter hits are checked against Redis. The filter is rebuilt
+    every TOKEN_REVOCATION_BLOOM_REBUILD_SECONDS to drop expired ids. While the
+    listener is not running or has lost its connection, every check goes to Redis.
+    """
+
+    def __init__(self):
+        self._filter: Optional[BloomFilter] = None
+        self._synced = False
+        self._rebuilt_at = 0.0
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+        self.local_checks_total = 0
+        self.redis_checks_total = 0
+        self.false_positives_total = 0
+        self.revocations_received_total = 0
+
+    async def start(self) -> None:
+        """Subscribe to revocations, load the filter and start the listener task."""
+        if self._task is not None:
+            return
+
+        self._stopping.clear()
+        self._pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        # Subscribe before loading, so no revocation falls between the two.
+        await self._pubsub.subscribe(REVOCATION_CHANNEL)
+        await self._rebuild()
+        self._task = asyncio.create_task(self._listen_loop(), name="token-revocations")
+        logger.info("Token revocation list started")
+
+    async def stop(self) -> None:
+        """Stop the listener and drop the filter."""
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        await self._task
+        self._task = None
+        await self._pubsub.aclose()
+        self._pubsub = None
+        self._synced = False
+        self._filter = None
+        logger.info("Token revocation list stopped")
+
+    def metrics(self) -> dict[str, Any]:
+        """Return filter size and check counters."""
+        return {
+            "running": self._task is not None,
+            "synced": self._synced,
+            "bloom_entries": self._filter.count if self._filter else 0,
+            "bloom_bits": self._filter.size if self._filter else 0,
+            "bloom_hashes": self._filter.hash_count if self._filter else 0,
+            "local_checks_total": self.local_checks_total,
+            "redis_checks_total": self.redis_checks_total,
+            "false_positives_total": self.false_positives_total,
+            "revocations_received_total": self.revocations_received_total,
+        }
+
+    async def revoke(self, jti: str, expires_at: int) -> None:
+        """Revoke a token id until expires_at, for every worker."""
+        ttl = int(expires_at - time.time())
+        if ttl <= 0:
+            logger.debug(f"Skipped revoking token {jti}: already expired")
+            return
+
+        if self._filter is not None:
+            self._filter.add(jti)
+
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.set(_revoked_key(jti), "1", ex=ttl)
+            pipe.zadd(REVOKED_INDEX_KEY, {jti: expires_at})
+            pipe.zremrangebyscore(REVOKED_INDEX_KEY, "-inf", time.time())
+            pipe.publish(REVOCATION_CHANNEL, jti)
+            await pipe.execute()
+
+    async def is_revoked(self, jti: str) -> bool:
+        """Check whether a token id is revoked, asking Redis only on a filter hit."""
+        if self._synced and jti not in self._filter:
+            self.local_checks_total += 1
+            return False
+
+        self.redis_checks_total += 1
+        revoked = await redis_client.get(_revoked_key(jti)) == "1"
+        if self._synced and not revoked:
+            self.false_positives_total += 1
+
+        return revoked
+
+    async def _rebuild(self) -> None:
+        revocation_settings = settings.token_revocation_settings
+        now = time.time()
+        await redis_client.zremrangebyscore(REVOKED_INDEX_KEY, "-inf", now)
+        revoked = await redis_client.zrangebyscore(REVOKED_INDEX_KEY, now, "+inf")
+
+        bloom = BloomFilter(
+            max(revocation_settings.TOKEN_REVOCATION_BLOOM_CAPACITY, len(revoked)),
+            revocation_settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+        )
+        for jti in revoked:
+            bloom.add(jti)
+
+        self._filter = bloom
+        self._synced = True
+        self._rebuilt_at = time.monotonic()
+        logger.debug(f"Loaded {len(revoked)} revoked tokens")
+
+    async def _listen_loop(self) -> None:
+        rebuild_seconds = settings.token_revocation_settings.TOKEN_REVOCATION_BLOOM_REBUILD_SECONDS
+
+        while not self._stopping.is_set():
+            try:
+                # Reading first reconnects and resubscribes after an error, so
+                # the rebuild cannot miss a revocation published meanwhile.
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if not self._synced or time.monotonic() - self._rebuilt_at >= rebuild_seconds:
+                    await self._rebuild()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Revocations may have been missed while the connection was down.
+                logger.error(f"Error reading token revocations: {str(e)}")
+                self._synced = False
+                await asyncio.sleep(1)
+                continue
+
+            if message and message["type"] == "message":
+                self.revocations_received_total += 1
+                self._filter.add(message["data"])
+
+
+token_revocation = TokenRevocationList()
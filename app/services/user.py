@@ -5,14 +5,23 @@ from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging_config import get_logger
-from app.exceptions.user import UserNotFoundError, UserAlreadyExistsError
+from app.core.responses import list_adapter
+from app.exceptions.user import (
+    TokenBlacklistedError,
+    UserAlreadyExistsError,
+    UserNotFoundError,
+)
 from app.models.user import User
 from app.models.user_profile import UserProfile
 from app.repository.user_repository import UserRepository
 from app.repository.user_profile_repository import UserProfileRepository
-from app.schemas.user import UserCreate, UserUpdate, UserResponse
-from app.utils.jwt import get_bearer_token, get_token_subject, JwtScenario
-from app.utils.password import hash_password
+from app.schemas.pagination import TotalCount, TotalMode
+from app.schemas.user import Principal, UserCreate, UserUpdate, UserResponse
+from app.services.counts import CountService
+from app.services.password_hasher import password_hasher
+from app.services.principal_cache import principal_cache
+from app.utils.cursor import encode_cursor
+from app.utils.jwt import get_access_claims, is_current_generation
 
 logger = get_logger("user_service")
 
@@ -38,7 +47,7 @@ class UserService:
                 f"User with email {user_data.email} already exists"
             )
 
-        password_hash = hash_password(user_data.password)
+        password_hash = await password_hasher.hash(user_data.password)
 
         new_user = User(
             email=user_data.email,
@@ -63,6 +72,9 @@ class UserService:
         await profile_repo.create(new_profile)
         logger.info(f"User profile created automatically for user: {created_user.id}")
 
+        await CountService.adjust(User, 1)
+        await CountService.adjust(UserProfile, 1)
+
         return UserResponse.model_validate(created_user)
 
     @staticmethod
@@ -93,29 +105,58 @@ class UserService:
 
         return user
 
+    @staticmethod
+    async def get_principal(
+        session: AsyncSession, user_id: str
+    ) -> Optional[Principal]:
+        """Get the user as cached for authorization, from the principal cache when possible."""
+        principal = await principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+
+        # The version is read first, so an invalidation that lands while the
+        # user is read keeps the result out of the cache.
+        version = await principal_cache.get_version(user_id)
+
+        repository = UserRepository(session)
+        user = await repository.read_one(condition=User.id == user_id)
+        if not user:
+            return None
+
+        principal = Principal.model_validate(user)
+        if version is not None:
+            await principal_cache.store(principal, version)
+
+        return principal
+
     @staticmethod
     async def get_user_by_token(
         request: Request, session: AsyncSession
-    ) -> User:
-        """Get user by token from request."""
+    ) -> Principal:
+        """
+        Get the user of the access token of a request, from the principal cache
+        when possible. Tokens issued before the token generation of the user was
+        last bumped are rejected. The user is resolved once per request and kept
+        on request.state with the token claims.
+        """
+        principal = getattr(request.state, "current_user", None)
+        if principal is not None:
+            return principal
+
         logger.debug("Getting user by token")
 
-        token_data = get_bearer_token(request)
+        claims = await get_access_claims(request)
+
+        principal = await UserService.get_principal(session, str(claims["sub"]))
+        if principal is None:
+            raise UserNotFoundError("User not found")
 
-        if token_data["method"] == JwtScenario.AUTH_LOCAL:
-            subject = get_token_subject(token_data["token"])
-            user = await UserService.get_user_by_id(session, subject)
-            if not user:
-                raise UserNotFoundError("User not found")
+        if not is_current_generation(claims, principal.token_generation):
+            logger.warning(f"Access token of user {principal.id} is from a revoked generation")
+            raise TokenBlacklistedError("Token is blacklisted")
 
-            repository = UserRepository(session)
-            user_model = await repository.read_one(condition=User.id == subject)
-            if not user_model:
-                raise UserNotFoundError("User not found")
-            return user_model
-        else:
-            # Alternative variants: external auth providers
-            raise UserNotFoundError("Unsupported authentication method")
+        request.state.current_user = principal
+        return principal
 
     @staticmethod
     async def update_user(
@@ -146,12 +187,18 @@ class UserService:
         update_dict = user_data.model_dump(exclude_unset=True)
 
         if "password" in update_dict:
-            update_dict["password_hash"] = hash_password(update_dict.pop("password"))
+            update_dict["password_hash"] = await password_hasher.hash(
+                update_dict.pop("password")
+            )
+            # A new password revokes every token issued with the old one.
+            update_dict["token_generation"] = User.token_generation + 1
 
         updated_user = await repository.update(
             data=update_dict, condition=User.id == user_id
         )
 
+        await UserService._invalidate_principal(user_id)
+
         logger.info(f"User with id {user_id} updated successfully")
 
         return UserResponse.model_validate(updated_user)
@@ -168,25 +215,63 @@ class UserService:
             logger.warning(f"User with id {user_id} not found for deletion")
             raise UserNotFoundError(f"User with id {user_id} not found")
 
+        await CountService.adjust(User, -1)
+        await UserService._invalidate_principal(user_id)
+
         logger.info(f"User with id {user_id} deleted successfully")
         return True
 
+    @staticmethod
+    async def revoke_all_tokens(session: AsyncSession, user_id: str) -> int:
+        """Revoke every token of a user by moving their token generation on. Returns the new generation."""
+        logger.info(f"Revoking all tokens of user {user_id}")
+
+        repository = UserRepository(session)
+        generation = await repository.bump_token_generation(user_id)
+
+        if generation is None:
+            logger.warning(f"User with id {user_id} not found for token revocation")
+            raise UserNotFoundError(f"User with id {user_id} not found")
+
+        await UserService._invalidate_principal(user_id)
+
+        logger.info(f"Tokens of user {user_id} revoked, generation is now {generation}")
+        return generation
+
+    @staticmethod
+    async def _invalidate_principal(user_id: str) -> None:
+        try:
+            await principal_cache.invalidate(user_id)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached principal {user_id}: {str(e)}")
+
     @staticmethod
     async def get_all_users(
-        session: AsyncSession, page: int = 1, page_size: int = 10
-    ) -> list[UserResponse]:
-        """Get all users with pagination."""
-        logger.info(f"Getting all users - page: {page}, page_size: {page_size}")
+        session: AsyncSession, after: Optional[tuple] = None, page_size: int = 10
+    ) -> tuple[list[UserResponse], Optional[str]]:
+        """Get a page of users in creation order and the cursor of the next page."""
+        logger.info(f"Getting all users - after: {after}, page_size: {page_size}")
 
         repository = UserRepository(session)
-        users = await repository.read_paginated(
-            condition=True, page=page, page_size=page_size
+        users, has_more = await repository.read_keyset(
+            condition=True, after=after, limit=page_size
         )
 
-        if not users:
-            return []
+        next_cursor = (
+            encode_cursor(users[-1].created_at, users[-1].id) if has_more else None
+        )
 
-        return [UserResponse.model_validate(user) for user in users]
+        return (
+            list_adapter(UserResponse).validate_python(users, from_attributes=True),
+            next_cursor,
+        )
+
+    @staticmethod
+    async def count_users(
+        session: AsyncSession, mode: TotalMode
+    ) -> Optional[TotalCount]:
+        """Get the total number of users."""
+        return await CountService.total(session, User, mode)
 
 
 user_service = UserService()
@@ -4,16 +4,20 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging_config import get_logger
+from app.core.responses import list_adapter
 from app.exceptions.user import UserNotFoundError, ValidationError
 from app.models.user import User
 from app.models.user_profile import UserProfile
 from app.repository.user_profile_repository import UserProfileRepository
 from app.repository.user_repository import UserRepository
+from app.schemas.pagination import TotalCount, TotalMode
 from app.schemas.user_profile import (
     UserProfileCreate,
     UserProfileUpdate,
     UserProfileResponse,
 )
+from app.services.counts import CountService
+from app.utils.cursor import encode_cursor
 
 logger = get_logger("user_profile_service")
 
@@ -61,6 +65,8 @@ class UserProfileService:
             f"User profile created successfully with id: {created_profile.id}"
         )
 
+        await CountService.adjust(UserProfile, 1)
+
         return UserProfileResponse.model_validate(created_profile)
 
     @staticmethod
@@ -171,6 +177,8 @@ class UserProfileService:
                 f"User profile with id {profile_id} not found"
             )
 
+        await CountService.adjust(UserProfile, -1)
+
         logger.info(f"User profile with id {profile_id} deleted successfully")
         return True
 
@@ -194,29 +202,40 @@ class UserProfileService:
                 f"User profile for user {user_id} not found"
             )
 
+        await CountService.adjust(UserProfile, -1)
+
         logger.info(f"User profile for user {user_id} deleted successfully")
         return True
 
     @staticmethod
     async def get_all_user_profiles(
-        session: AsyncSession, page: int = 1, page_size: int = 10
-    ) -> list[UserProfileResponse]:
-        """Get all user profiles with pagination."""
+        session: AsyncSession, after: Optional[tuple] = None, page_size: int = 10
+    ) -> tuple[list[UserProfileResponse], Optional[str]]:
+        """Get a page of user profiles in creation order and the cursor of the next page."""
         logger.info(
-            f"Getting all user profiles - page: {page}, page_size: {page_size}"
+            f"Getting all user profiles - after: {after}, page_size: {page_size}"
         )
 
         repository = UserProfileRepository(session)
-        profiles = await repository.read_paginated(
-            condition=True, page=page, page_size=page_size
+        profiles, has_more = await repository.read_keyset(
+            condition=True, after=after, limit=page_size
         )
 
-        if not profiles:
-            return []
+        next_cursor = (
+            encode_cursor(profiles[-1].created_at, profiles[-1].id) if has_more else None
+        )
 
-        return [
-            UserProfileResponse.model_validate(profile) for profile in profiles
-        ]
+        return (
+            list_adapter(UserProfileResponse).validate_python(profiles, from_attributes=True),
+            next_cursor,
+        )
+
+    @staticmethod
+    async def count_user_profiles(
+        session: AsyncSession, mode: TotalMode
+    ) -> Optional[TotalCount]:
+        """Get the total number of user profiles."""
+        return await CountService.total(session, UserProfile, mode)
 
 
 user_profile_service = UserProfileService()
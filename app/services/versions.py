@@ -0,0 +1,93 @@
+import hashlib
+import time
+from typing import Optional
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.redis_client import redis_client
+
+logger = get_logger("version_service")
+
+ELECTION_LIST_VERSION_KEY = "elections:version"
+VOTE_LIST_VERSION_KEY = "votes:version"
+
+# Missing versions are seeded from the clock rather than from zero, so a key
+# that expired or was lost never repeats a value handed out before.
+_read_versions_script = redis_client.register_script(
+    """
+    local versions = {}
+    for i, key in ipairs(KEYS) do
+        redis.call('SET', key, ARGV[1], 'NX', 'EX', ARGV[2])
+        versions[i] = redis.call('GET', key)
+    end
+    return versions
+    """
+)
+
+_bump_versions_script = redis_client.register_script(
+    """
+    for _, key in ipairs(KEYS) do
+        if redis.call('EXISTS', key) == 1 then
+            redis.call('INCR', key)
+            redis.call('EXPIRE', key, ARGV[2])
+        else
+            redis.call('SET', key, ARGV[1], 'EX', ARGV[2])
+        end
+    end
+    return #KEYS
+    """
+)
+
+
+def election_version_key(election_id: str) -> str:
+    return f"election:version:{election_id}"
+
+
+def results_version_key(election_id: str) -> str:
+    return f"results:version:{election_id}"
+
+
+class VersionService:
+    """Service for the per-entity version counters behind ETags and cache guards."""
+
+    @staticmethod
+    async def get(*keys: str) -> list[str]:
+        """Get the current value of version counters, seeding missing ones."""
+        return await _read_versions_script(
+            keys=list(keys),
+            args=[time.time_ns(), settings.version_settings.VERSION_KEY_TTL_SECONDS],
+        )
+
+    @staticmethod
+    async def bump(*keys: str) -> None:
+        """Move version counters on after a committed change."""
+        keys = tuple(dict.fromkeys(keys))
+        if not keys:
+            return
+
+        await _bump_versions_script(
+            keys=list(keys),
+            args=[time.time_ns(), settings.version_settings.VERSION_KEY_TTL_SECONDS],
+        )
+
+    @staticmethod
+    async def etag(*keys: str, variant: str = "") -> Optional[str]:
+        """
+        Build a strong ETag from version counters. variant tells apart responses
+        derived from the same versions, such as the pages of a list. Returns None
+        if the versions cannot be read.
+        """
+        try:
+            versions = await VersionService.get(*keys)
+        except Exception as e:
+            logger.warning(f"Failed to read versions for ETag: {str(e)}")
+            return None
+
+        tag = "-".join(versions)
+        if variant:
+            tag = f"{tag}-{hashlib.sha1(variant.encode()).hexdigest()[:16]}"
+
+        return f'"{tag}"'
+
+
+version_service = VersionService()
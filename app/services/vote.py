@@ -1,14 +1,43 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, AsyncIterator, Optional, Union
+from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging_config import get_logger
-from app.exceptions.user import PermissionDeniedError, VoteNotFoundError
-from app.models.user import User
+from app.core.responses import list_adapter
+from app.core.settings import settings
+from app.exceptions.user import (
+    PermissionDeniedError,
+    ValidationError,
+    VoteNotFoundError,
+    VoteRejectedError,
+)
 from app.models.vote import Vote
 from app.repository.vote_repository import VoteRepository
-from app.schemas.vote import VoteCreate, VoteUpdate, VoteResponse
+from app.schemas.vote import (
+    VoteBatchCreate,
+    VoteBatchItemResult,
+    VoteBatchResponse,
+    VoteChange,
+    VoteChoice,
+    VoteCreate,
+    VoteReceipt,
+    VoteRejectionReason,
+    VoteResponse,
+    VoteTallyResponse,
+    VoteUpdate,
+)
+from app.schemas.pagination import TotalCount, TotalMode
+from app.schemas.user import Principal
+from app.services.counts import CountService
+from app.services.results import ResultsService
+from app.services.results_broadcaster import results_broadcaster
+from app.services.tally import TallyService
+from app.services.versions import VOTE_LIST_VERSION_KEY, VersionService
+from app.services.vote_log import vote_log_buffer
+from app.services.vote_queue import VoteQueueService
+from app.utils.cursor import encode_cursor
 
 logger = get_logger("vote_service")
 
@@ -18,27 +47,285 @@ class VoteService:
 
     @staticmethod
     async def create_vote(
-        session: AsyncSession, vote_data: VoteCreate, current_user: User
-    ) -> VoteResponse:
-        """Create a new vote."""
+        session: AsyncSession, vote_data: VoteCreate, current_user: Principal
+    ) -> Union[VoteResponse, VoteReceipt]:
+        """
+        Create a new vote, enforcing the election rules in the same statement.
+
+        In queue ingestion mode the vote is appended to the ingestion stream
+        instead and a receipt is returned. Only the rules that need no other
+        votes (election, window and candidate) are checked before queueing; the
+        limits are enforced by the flusher when the vote is written.
+        """
         logger.info(
             f"Creating vote for election {vote_data.election_id} by user {current_user.id}"
         )
 
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
         repository = VoteRepository(session)
 
-        new_vote = Vote(
+        if settings.vote_settings.VOTE_INGESTION_MODE == "queue":
+            ballot = Vote(
+                id=str(uuid4()),
+                election_id=vote_data.election_id,
+                voter_id=current_user.id,
+                candidate_id=vote_data.candidate_id,
+                created_at=now,
+            )
+
+            rule_rows = await repository.read_ballot_rules({ballot.election_id})
+            (rejection_reason,) = VoteService._evaluate_ballots(
+                [ballot], rule_rows, [], set()
+            )
+            if rejection_reason is not None:
+                logger.warning(
+                    f"Vote by user {current_user.id} for election {vote_data.election_id} "
+                    f"rejected before queueing: {rejection_reason.value}"
+                )
+                raise VoteRejectedError(rejection_reason)
+
+            receipt = await VoteQueueService.enqueue_vote(ballot)
+            logger.info(f"Vote queued with id: {receipt.vote_id}")
+            return receipt
+
+        created_vote, rejection_reason = await repository.cast_vote(
             election_id=vote_data.election_id,
             voter_id=current_user.id,
             candidate_id=vote_data.candidate_id,
-            created_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            now=now,
         )
 
-        created_vote = await repository.create(new_vote)
+        if rejection_reason is not None:
+            logger.warning(
+                f"Vote by user {current_user.id} for election {vote_data.election_id} "
+                f"rejected: {rejection_reason.value}"
+            )
+            raise VoteRejectedError(rejection_reason)
+
         logger.info(f"Vote created successfully with id: {created_vote.id}")
 
+        await VoteService._publish_changes(
+            [
+                VoteChange(
+                    vote_id=created_vote.id,
+                    election_id=created_vote.election_id,
+                    voter_id=created_vote.voter_id,
+                    candidate_id=created_vote.candidate_id,
+                )
+            ]
+        )
+
         return VoteResponse.model_validate(created_vote)
 
+    @staticmethod
+    async def create_votes_batch(
+        session: AsyncSession, batch_data: VoteBatchCreate, current_user: Principal
+    ) -> VoteBatchResponse:
+        """Create several votes with one multi-row insert and one commit."""
+        logger.info(
+            f"Creating batch of {len(batch_data.votes)} votes by user {current_user.id}"
+        )
+
+        max_batch_size = settings.vote_settings.VOTE_BATCH_MAX_SIZE
+        if len(batch_data.votes) > max_batch_size:
+            logger.warning(
+                f"Vote batch of {len(batch_data.votes)} exceeds limit of {max_batch_size}"
+            )
+            raise ValidationError(
+                f"A batch can contain at most {max_batch_size} votes"
+            )
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        ballots = [
+            Vote(
+                id=str(uuid4()),
+                election_id=vote_data.election_id,
+                voter_id=current_user.id,
+                candidate_id=vote_data.candidate_id,
+                created_at=now,
+            )
+            for vote_data in batch_data.votes
+        ]
+
+        rejection_reasons = await VoteService.apply_ballots(session, ballots)
+
+        results = [
+            VoteBatchItemResult(
+                index=index,
+                accepted=reason is None,
+                vote=VoteResponse.model_validate(ballot) if reason is None else None,
+                reason=reason,
+            )
+            for index, (ballot, reason) in enumerate(zip(ballots, rejection_reasons))
+        ]
+        accepted = sum(1 for result in results if result.accepted)
+
+        logger.info(
+            f"Vote batch by user {current_user.id}: {accepted} accepted, "
+            f"{len(results) - accepted} rejected"
+        )
+
+        return VoteBatchResponse(
+            accepted=accepted,
+            rejected=len(results) - accepted,
+            results=results,
+        )
+
+    @staticmethod
+    async def apply_ballots(
+        session: AsyncSession, ballots: list[Vote]
+    ) -> list[Optional[VoteRejectionReason]]:
+        """
+        Validate ballots against the election rules with two reads and insert the
+        accepted ones with a single multi-row insert and commit.
+
+        Each ballot is checked against the election window at its own created_at.
+        Ballots whose id is already stored are reported as accepted and not
+        inserted again, so replaying a batch is safe. A single-choice ballot
+        skipped by the insert because a concurrent ballot of the same voter got
+        there first is rejected like the limit check.
+        """
+        repository = VoteRepository(session)
+
+        rule_rows = await repository.read_ballot_rules(
+            {ballot.election_id for ballot in ballots}
+        )
+        existing_rows = await repository.read_voter_ballots(
+            {(ballot.election_id, ballot.voter_id) for ballot in ballots}
+        )
+        stored_ids = {row.id for row in existing_rows}
+
+        rejection_reasons = VoteService._evaluate_ballots(
+            ballots, rule_rows, existing_rows, stored_ids
+        )
+        rules = {row.election_id: row for row in rule_rows}
+        new_ballots = [
+            ballot
+            for ballot, reason in zip(ballots, rejection_reasons)
+            if reason is None and ballot.id not in stored_ids
+        ]
+
+        inserted_ids = await repository.insert_ballots(
+            [
+                {
+                    "id": ballot.id,
+                    "election_id": ballot.election_id,
+                    "voter_id": ballot.voter_id,
+                    "candidate_id": ballot.candidate_id,
+                    "created_at": ballot.created_at,
+                    "single_choice": rules[ballot.election_id].max_votes == 1,
+                }
+                for ballot in new_ballots
+            ]
+        )
+
+        skipped_ids = {ballot.id for ballot in new_ballots} - inserted_ids
+        for index, ballot in enumerate(ballots):
+            if ballot.id in skipped_ids:
+                rejection_reasons[index] = (
+                    VoteRejectionReason.VOTE_LIMIT_REACHED
+                    if rules[ballot.election_id].allow_revoting
+                    else VoteRejectionReason.REVOTING_DISABLED
+                )
+
+        await VoteService._publish_changes(
+            [
+                VoteChange(
+                    vote_id=ballot.id,
+                    election_id=ballot.election_id,
+                    voter_id=ballot.voter_id,
+                    candidate_id=ballot.candidate_id,
+                )
+                for ballot in new_ballots
+                if ballot.id in inserted_ids
+            ]
+        )
+
+        return rejection_reasons
+
+    @staticmethod
+    def _evaluate_ballots(
+        ballots: list[Vote],
+        rule_rows: list[Any],
+        existing_rows: list[Any],
+        stored_ids: set[str],
+    ) -> list[Optional[VoteRejectionReason]]:
+        """
+        Apply the same rules as VoteRepository.cast_vote to a list of ballots.
+        Ballots accepted earlier in the list count towards the limits of later ones.
+        """
+        rules: dict[str, Any] = {}
+        candidates: dict[str, set[str]] = {}
+        for row in rule_rows:
+            rules[row.election_id] = row
+            candidate_ids = candidates.setdefault(row.election_id, set())
+            if row.candidate_id is not None:
+                candidate_ids.add(row.candidate_id)
+
+        cast: dict[tuple[str, str], list[str]] = {}
+        for row in existing_rows:
+            cast.setdefault((row.election_id, row.voter_id), []).append(row.candidate_id)
+
+        rejection_reasons: list[Optional[VoteRejectionReason]] = []
+        for ballot in ballots:
+            rule = rules.get(ballot.election_id)
+            voter_ballots = cast.setdefault((ballot.election_id, ballot.voter_id), [])
+
+            if ballot.id in stored_ids:
+                reason = None
+            elif rule is None:
+                reason = VoteRejectionReason.ELECTION_NOT_FOUND
+            elif rule.start_date > ballot.created_at:
+                reason = VoteRejectionReason.ELECTION_NOT_STARTED
+            elif rule.end_date < ballot.created_at:
+                reason = VoteRejectionReason.ELECTION_ENDED
+            elif ballot.candidate_id not in candidates[ballot.election_id]:
+                reason = VoteRejectionReason.CANDIDATE_NOT_IN_ELECTION
+            elif ballot.candidate_id in voter_ballots:
+                reason = VoteRejectionReason.ALREADY_VOTED_FOR_CANDIDATE
+            elif len(voter_ballots) >= rule.max_votes:
+                reason = (
+                    VoteRejectionReason.VOTE_LIMIT_REACHED
+                    if rule.allow_revoting
+                    else VoteRejectionReason.REVOTING_DISABLED
+                )
+            else:
+                reason = None
+                voter_ballots.append(ballot.candidate_id)
+
+            rejection_reasons.append(reason)
+
+        return rejection_reasons
+
+    @staticmethod
+    async def get_election_tally(
+        session: AsyncSession, election_id: str
+    ) -> Optional[VoteTallyResponse]:
+        """Get live per-candidate vote counts of an election."""
+        logger.info(f"Getting tally for election: {election_id}")
+
+        tally = await TallyService.get_tally(session, election_id)
+
+        if not tally:
+            logger.warning(f"Election with id {election_id} not found")
+            return None
+
+        return tally
+
+    @staticmethod
+    async def get_vote_receipt(vote_id: str) -> Optional[VoteReceipt]:
+        """Get the processing receipt of a queued vote."""
+        logger.info(f"Getting receipt for vote: {vote_id}")
+
+        receipt = await VoteQueueService.get_receipt(vote_id)
+
+        if not receipt:
+            logger.warning(f"Receipt for vote {vote_id} not found")
+            return None
+
+        return receipt
+
     @staticmethod
     async def get_vote_by_id(
         session: AsyncSession, vote_id: str
@@ -56,34 +343,51 @@ class VoteService:
         return VoteResponse.model_validate(vote)
 
     @staticmethod
-    async def get_votes_by_election(
+    async def stream_votes_by_election(
         session: AsyncSession, election_id: str
-    ) -> list[VoteResponse]:
-        """Get all votes for a specific election."""
-        logger.info(f"Getting votes for election: {election_id}")
+    ) -> AsyncIterator[bytes]:
+        """Stream all votes for a specific election as a JSON array."""
+        logger.info(f"Streaming votes for election: {election_id}")
 
-        repository = VoteRepository(session)
-        votes = await repository.read_many(condition=Vote.election_id == election_id)
-
-        if not votes:
-            return []
-
-        return [VoteResponse.model_validate(vote) for vote in votes]
+        async for chunk in VoteService._stream_votes_json(
+            session, Vote.election_id == election_id
+        ):
+            yield chunk
 
     @staticmethod
-    async def get_votes_by_user(
+    async def stream_votes_by_user(
         session: AsyncSession, user_id: str
-    ) -> list[VoteResponse]:
-        """Get all votes by a specific user."""
-        logger.info(f"Getting votes for user: {user_id}")
+    ) -> AsyncIterator[bytes]:
+        """Stream all votes by a specific user as a JSON array."""
+        logger.info(f"Streaming votes for user: {user_id}")
 
-        repository = VoteRepository(session)
-        votes = await repository.read_many(condition=Vote.voter_id == user_id)
+        async for chunk in VoteService._stream_votes_json(
+            session, Vote.voter_id == user_id
+        ):
+            yield chunk
 
-        if not votes:
-            return []
-
-        return [VoteResponse.model_validate(vote) for vote in votes]
+    @staticmethod
+    async def _stream_votes_json(
+        session: AsyncSession, condition: Any
+    ) -> AsyncIterator[bytes]:
+        """
+        Encode the votes matching condition one chunk at a time, so memory use
+        does not depend on the number of votes.
+        """
+        adapter = list_adapter(VoteResponse)
+        repository = VoteRepository(session)
+        separator = b""
+
+        yield b"["
+        async for rows in repository.stream_rows(
+            condition, settings.vote_settings.VOTE_STREAM_CHUNK_SIZE
+        ):
+            votes = adapter.validate_python(rows, from_attributes=True)
+            # Each chunk is encoded as a list; its brackets are dropped so the
+            # chunks join into a single array.
+            yield separator + adapter.dump_json(votes)[1:-1]
+            separator = b","
+        yield b"]"
 
     @staticmethod
     async def get_user_vote_for_election(
@@ -107,91 +411,225 @@ class VoteService:
         return VoteResponse.model_validate(vote)
 
     @staticmethod
-    async def update_vote(
+    async def replace_user_vote(
         session: AsyncSession,
-        vote_id: str,
-        vote_data: VoteUpdate,
-        current_user: User,
+        election_id: str,
+        choice: VoteChoice,
+        current_user: Principal,
     ) -> VoteResponse:
-        """Update vote information."""
-        logger.info(f"Updating vote with id: {vote_id}")
+        """
+        Cast the vote of the current user in a single-choice election, or move
+        it to another candidate, in one statement.
+        """
+        logger.info(
+            f"Replacing vote for election {election_id} by user {current_user.id}"
+        )
 
         repository = VoteRepository(session)
-        vote = await repository.read_one(condition=Vote.id == vote_id)
 
-        if not vote:
-            logger.warning(f"Vote with id {vote_id} not found")
-            raise VoteNotFoundError(f"Vote with id {vote_id} not found")
+        vote, previous_candidate_id, rejection_reason = await repository.replace_vote(
+            election_id=election_id,
+            voter_id=current_user.id,
+            candidate_id=choice.candidate_id,
+            now=datetime.now(timezone.utc).replace(tzinfo=None),
+        )
 
-        if vote.voter_id != current_user.id:
+        if rejection_reason is not None:
             logger.warning(
-                f"User {current_user.id} attempted to update vote {vote_id} owned by {vote.voter_id}"
+                f"Vote replacement by user {current_user.id} for election {election_id} "
+                f"rejected: {rejection_reason.value}"
             )
-            raise PermissionDeniedError(
-                "You don't have permission to update this vote"
+            raise VoteRejectedError(rejection_reason)
+
+        if previous_candidate_id == vote.candidate_id:
+            logger.info(f"Vote {vote.id} already points to candidate {vote.candidate_id}")
+            return VoteResponse.model_validate(vote)
+
+        if previous_candidate_id is None:
+            logger.info(f"Vote created successfully with id: {vote.id}")
+        else:
+            logger.info(
+                f"Vote {vote.id} moved from candidate {previous_candidate_id} "
+                f"to {vote.candidate_id}"
             )
 
-        update_dict = vote_data.model_dump(exclude_unset=True)
+        await VoteService._publish_changes(
+            [
+                VoteChange(
+                    vote_id=vote.id,
+                    election_id=vote.election_id,
+                    voter_id=vote.voter_id,
+                    previous_candidate_id=previous_candidate_id,
+                    candidate_id=vote.candidate_id,
+                )
+            ]
+        )
+
+        return VoteResponse.model_validate(vote)
 
-        if "voter_id" in update_dict:
-            logger.warning("Attempt to change voter_id in vote update")
-            update_dict.pop("voter_id")
+    @staticmethod
+    async def update_vote(
+        session: AsyncSession,
+        vote_id: str,
+        vote_data: VoteUpdate,
+        current_user: Principal,
+    ) -> VoteResponse:
+        """
+        Move a vote to another candidate of its election in one
+        ownership-checked statement, enforcing the same election rules as
+        create_vote.
+        """
+        logger.info(f"Updating vote with id: {vote_id}")
 
-        updated_vote = await repository.update(
-            data=update_dict, condition=Vote.id == vote_id
+        repository = VoteRepository(session)
+        updated_vote, rejection_reason = await repository.update_owned(
+            vote_id=vote_id,
+            voter_id=current_user.id,
+            candidate_id=vote_data.candidate_id,
+            now=datetime.now(timezone.utc).replace(tzinfo=None),
         )
 
+        if rejection_reason is not None:
+            logger.warning(
+                f"Update of vote {vote_id} by user {current_user.id} "
+                f"rejected: {rejection_reason.value}"
+            )
+            raise VoteRejectedError(rejection_reason)
+
+        if not updated_vote:
+            await VoteService._raise_missing_or_forbidden(
+                repository, vote_id, current_user, "update"
+            )
+
         logger.info(f"Vote with id {vote_id} updated successfully")
 
+        if updated_vote.previous_candidate_id != updated_vote.candidate_id:
+            await VoteService._publish_changes(
+                [
+                    VoteChange(
+                        vote_id=updated_vote.id,
+                        election_id=updated_vote.election_id,
+                        voter_id=updated_vote.voter_id,
+                        previous_candidate_id=updated_vote.previous_candidate_id,
+                        candidate_id=updated_vote.candidate_id,
+                    )
+                ]
+            )
+
         return VoteResponse.model_validate(updated_vote)
 
     @staticmethod
     async def delete_vote(
-        session: AsyncSession, vote_id: str, current_user: User
+        session: AsyncSession, vote_id: str, current_user: Principal
     ) -> bool:
-        """Delete vote by ID."""
+        """Delete vote by ID in one ownership-checked statement."""
         logger.info(f"Deleting vote with id: {vote_id}")
 
         repository = VoteRepository(session)
-        vote = await repository.read_one(condition=Vote.id == vote_id)
+        vote = await repository.delete_owned(vote_id=vote_id, voter_id=current_user.id)
 
         if not vote:
-            logger.warning(f"Vote with id {vote_id} not found for deletion")
-            raise VoteNotFoundError(f"Vote with id {vote_id} not found")
-
-        if vote.voter_id != current_user.id:
-            logger.warning(
-                f"User {current_user.id} attempted to delete vote {vote_id} owned by {vote.voter_id}"
-            )
-            raise PermissionDeniedError(
-                "You don't have permission to delete this vote"
+            await VoteService._raise_missing_or_forbidden(
+                repository, vote_id, current_user, "delete"
             )
 
-        deleted = await repository.delete(condition=Vote.id == vote_id)
+        logger.info(f"Vote with id {vote_id} deleted successfully")
 
-        if not deleted:
-            logger.warning(f"Failed to delete vote with id {vote_id}")
-            raise VoteNotFoundError(f"Vote with id {vote_id} not found")
+        await VoteService._publish_changes(
+            [
+                VoteChange(
+                    vote_id=vote_id,
+                    election_id=vote.election_id,
+                    voter_id=vote.voter_id,
+                    previous_candidate_id=vote.candidate_id,
+                )
+            ]
+        )
 
-        logger.info(f"Vote with id {vote_id} deleted successfully")
         return True
 
     @staticmethod
     async def get_all_votes(
-        session: AsyncSession, page: int = 1, page_size: int = 10
-    ) -> list[VoteResponse]:
-        """Get all votes with pagination."""
-        logger.info(f"Getting all votes - page: {page}, page_size: {page_size}")
+        session: AsyncSession, after: Optional[tuple] = None, page_size: int = 10
+    ) -> tuple[list[VoteResponse], Optional[str]]:
+        """Get a page of votes in creation order and the cursor of the next page."""
+        logger.info(f"Getting all votes - after: {after}, page_size: {page_size}")
 
         repository = VoteRepository(session)
-        votes = await repository.read_paginated(
-            condition=True, page=page, page_size=page_size
+        votes, has_more = await repository.read_keyset(
+            condition=True, after=after, limit=page_size
         )
 
-        if not votes:
-            return []
+        next_cursor = (
+            encode_cursor(votes[-1].created_at, votes[-1].id) if has_more else None
+        )
+
+        return (
+            list_adapter(VoteResponse).validate_python(votes, from_attributes=True),
+            next_cursor,
+        )
+
+    @staticmethod
+    async def count_votes(
+        session: AsyncSession, mode: TotalMode
+    ) -> Optional[TotalCount]:
+        """Get the total number of votes."""
+        return await CountService.total(session, Vote, mode)
+
+    @staticmethod
+    async def _raise_missing_or_forbidden(
+        repository: VoteRepository, vote_id: str, current_user: Principal, action: str
+    ) -> None:
+        """Tell a missing vote from a vote of another user after a write matched nothing."""
+        owner_id = await repository.read_voter_id(vote_id)
 
-        return [VoteResponse.model_validate(vote) for vote in votes]
+        if owner_id is None:
+            logger.warning(f"Vote with id {vote_id} not found")
+            raise VoteNotFoundError(f"Vote with id {vote_id} not found")
+
+        logger.warning(
+            f"User {current_user.id} attempted to {action} vote {vote_id} owned by {owner_id}"
+        )
+        raise PermissionDeniedError(f"You don't have permission to {action} this vote")
+
+    @staticmethod
+    async def _publish_changes(changes: list[VoteChange]) -> None:
+        """
+        Propagate committed vote mutations to the audit trail, the live tally
+        counters, the results streams, the cached results of the affected
+        elections, the version behind the vote list ETags and the vote row
+        counter. Failures are logged and left to the periodic reconciliation
+        and the results staleness budget.
+        """
+        if not changes:
+            return
+
+        vote_log_buffer.record(changes)
+
+        try:
+            seqs = await TallyService.apply_changes(changes)
+        except Exception as e:
+            logger.warning(f"Failed to update tally counters: {str(e)}")
+        else:
+            results_broadcaster.record(changes, seqs)
+
+        try:
+            await ResultsService.mark_dirty(change.election_id for change in changes)
+        except Exception as e:
+            logger.warning(f"Failed to flag election results as dirty: {str(e)}")
+
+        try:
+            await VersionService.bump(VOTE_LIST_VERSION_KEY)
+        except Exception as e:
+            logger.warning(f"Failed to bump vote list version: {str(e)}")
+
+        await CountService.adjust(
+            Vote,
+            sum(
+                (change.previous_candidate_id is None) - (change.candidate_id is None)
+                for change in changes
+            ),
+        )
 
 
 vote_service = VoteService()
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Optional
+from uuid import uuid4
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.database import async_session_maker
+from app.repository.vote_log_repository import VoteLogRepository
+from app.schemas.vote import VoteChange
+
+logger = get_logger("vote_log_buffer")
+
+ACTION_CREATE = "create"
+ACTION_UPDATE = "update"
+ACTION_DELETE = "delete"
+
+
+class VoteLogBuffer:
+    """
+    Bounded in-process buffer for the vote audit trail.
+
+    Vote mutations append entries without touching the database; a background
+    task writes them to vote_logs with multi-row inserts every
+    VOTE_LOG_FLUSH_INTERVAL_MS, or as soon as VOTE_LOG_BATCH_SIZE entries are
+    waiting. When the buffer is full new entries are dropped and counted, so
+    auditing can never slow down or fail a vote.
+    """
+
+    def __init__(self):
+        self._entries: deque[dict[str, Any]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+        self.recorded_total = 0
+        self.written_total = 0
+        self.dropped_total = 0
+        self.failed_flushes_total = 0
+        self.last_batch_size = 0
+        self.last_flush_seconds = 0.0
+
+    async def start(self) -> None:
+        """Start the flush task."""
+        if self._task is not None:
+            return
+
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(), name="vote-log-flusher")
+        logger.info("Vote log buffer started")
+
+    async def stop(self) -> None:
+        """Stop the flush task and write every buffered entry."""
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+        await self.flush()
+        if self._entries:
+            logger.error(f"Lost {len(self._entries)} vote log entries on shutdown")
+        logger.info("Vote log buffer stopped")
+
+    def metrics(self) -> dict[str, Any]:
+        """Return buffer occupancy and overflow counters."""
+        return {
+            "running": self._task is not None,
+            "buffered": len(self._entries),
+            "capacity": settings.vote_settings.VOTE_LOG_BUFFER_SIZE,
+            "recorded_total": self.recorded_total,
+            "written_total": self.written_total,
+            "dropped_total": self.dropped_total,
+            "failed_flushes_total": self.failed_flushes_total,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_seconds": round(self.last_flush_seconds, 4),
+        }
+
+    def record(self, changes: list[VoteChange]) -> None:
+        """
+        Append one audit entry per vote. A vote that lost one candidate and
+        gained another is logged as an update, including a move between
+        elections.
+        """
+        if self._task is None:
+            return
+
+        actions: dict[str, str] = {}
+        for change in changes:
+            if change.previous_candidate_id == change.candidate_id:
+                continue
+
+            if change.previous_candidate_id is None:
+                action = ACTION_CREATE
+            elif change.candidate_id is None:
+                action = ACTION_DELETE
+            else:
+                action = ACTION_UPDATE
+
+            if actions.get(change.vote_id, action) != action:
+                action = ACTION_UPDATE
+            actions[change.vote_id] = action
+
+        timestamp = datetime.now(timezone.utc).replace(tzinfo=None)
+        capacity = settings.vote_settings.VOTE_LOG_BUFFER_SIZE
+
+        for vote_id, action in actions.items():
+            self.recorded_total += 1
+
+            if len(self._entries) >= capacity:
+                if self.dropped_total == 0 or self.dropped_total % 1000 == 0:
+                    logger.warning(
+                        f"Vote log buffer full, {self.dropped_total + 1} entries dropped so far"
+                    )
+                self.dropped_total += 1
+                continue
+
+            self._entries.append(
+                {
+                    "id": str(uuid4()),
+                    "vote_id": vote_id,
+                    "action": action,
+                    "timestamp": timestamp,
+                }
+            )
+
+        if len(self._entries) >= settings.vote_settings.VOTE_LOG_BATCH_SIZE:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """
+        Write buffered entries in batches. A failed batch is put back in front
+        of the buffer and retried on the next flush.
+        """
+        batch_size = settings.vote_settings.VOTE_LOG_BATCH_SIZE
+
+        while self._entries:
+            batch = [self._entries.popleft() for _ in range(min(batch_size, len(self._entries)))]
+            started = time.perf_counter()
+
+            try:
+                async with async_session_maker() as session:
+                    await VoteLogRepository(session).create_many(batch)
+
+            except Exception as e:
+                self.failed_flushes_total += 1
+                self._entries.extendleft(reversed(batch))
+                logger.error(f"Error writing {len(batch)} vote log entries: {str(e)}")
+                return
+
+            self.written_total += len(batch)
+            self.last_batch_size = len(batch)
+            self.last_flush_seconds = time.perf_counter() - started
+
+    async def _run(self) -> None:
+        interval = settings.vote_settings.VOTE_LOG_FLUSH_INTERVAL_MS / 1000
+
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            await self.flush()
+
+
+vote_log_buffer = VoteLogBuffer()
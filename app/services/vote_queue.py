@@ -0,0 +1,92 @@
+import json
+from datetime import datetime
+from typing import Optional
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.redis_client import redis_client
+from app.models.vote import Vote
+from app.schemas.vote import VoteReceipt, VoteReceiptStatus, VoteRejectionReason
+
+logger = get_logger("vote_queue_service")
+
+
+def _receipt_key(vote_id: str) -> str:
+    return f"vote:receipt:{vote_id}"
+
+
+class VoteQueueService:
+    """Service for the write-behind vote ingestion stream."""
+
+    @staticmethod
+    async def enqueue_vote(vote: Vote) -> VoteReceipt:
+        """Append a vote to the ingestion stream and store its receipt."""
+        vote_settings = settings.vote_settings
+
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                vote_settings.VOTE_QUEUE_STREAM,
+                {
+                    "id": vote.id,
+                    "election_id": vote.election_id,
+                    "voter_id": vote.voter_id,
+                    "candidate_id": vote.candidate_id,
+                    "created_at": vote.created_at.isoformat(),
+                },
+            )
+            pipe.set(
+                _receipt_key(vote.id),
+                json.dumps({"status": VoteReceiptStatus.QUEUED.value}),
+                ex=vote_settings.VOTE_RECEIPT_TTL_SECONDS,
+            )
+            await pipe.execute()
+
+        logger.debug(f"Vote {vote.id} queued for election {vote.election_id}")
+
+        return VoteReceipt(vote_id=vote.id, status=VoteReceiptStatus.QUEUED)
+
+    @staticmethod
+    async def get_receipt(vote_id: str) -> Optional[VoteReceipt]:
+        """Get the receipt of a queued vote."""
+        raw_receipt = await redis_client.get(_receipt_key(vote_id))
+
+        if not raw_receipt:
+            return None
+
+        return VoteReceipt(vote_id=vote_id, **json.loads(raw_receipt))
+
+    @staticmethod
+    async def record_outcomes(
+        outcomes: list[tuple[str, Optional[VoteRejectionReason]]],
+    ) -> None:
+        """Update the receipts of flushed votes."""
+        if not outcomes:
+            return
+
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for vote_id, reason in outcomes:
+                receipt = (
+                    {"status": VoteReceiptStatus.ACCEPTED.value}
+                    if reason is None
+                    else {"status": VoteReceiptStatus.REJECTED.value, "reason": reason.value}
+                )
+                pipe.set(
+                    _receipt_key(vote_id),
+                    json.dumps(receipt),
+                    ex=settings.vote_settings.VOTE_RECEIPT_TTL_SECONDS,
+                )
+            await pipe.execute()
+
+    @staticmethod
+    def ballot_from_entry(fields: dict) -> Vote:
+        """Build a transient Vote from a stream entry."""
+        return Vote(
+            id=fields["id"],
+            election_id=fields["election_id"],
+            voter_id=fields["voter_id"],
+            candidate_id=fields["candidate_id"],
+            created_at=datetime.fromisoformat(fields["created_at"]),
+        )
+
+
+vote_queue_service = VoteQueueService()
@@ -0,0 +1,54 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+
+def _encode(values: list[Any]) -> str:
+    payload = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: str) -> str:
+    """
+    Encode the (created_at, id) key of the last row of a page as an opaque cursor.
+    """
+    return _encode([created_at.isoformat() if created_at else None, row_id])
+
+
+def decode_cursor(cursor: str) -> tuple[Optional[datetime], str]:
+    """
+    Decode a cursor built by encode_cursor. Raises ValueError if it is malformed.
+    """
+    try:
+        created_at, row_id = _decode(cursor)
+        if not isinstance(row_id, str):
+            raise ValueError("invalid id")
+        return (datetime.fromisoformat(created_at) if created_at else None), row_id
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed cursor: {str(e)}")
+
+
+def encode_rank_cursor(rank: float, row_id: str) -> str:
+    """
+    Encode the (rank, id) key of the last row of a ranked page as an opaque cursor.
+    """
+    return _encode([rank, row_id])
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, str]:
+    """
+    Decode a cursor built by encode_rank_cursor. Raises ValueError if it is malformed.
+    """
+    try:
+        rank, row_id = _decode(cursor)
+        if not isinstance(rank, (int, float)) or not isinstance(row_id, str):
+            raise ValueError("invalid key")
+        return float(rank), row_id
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed cursor: {str(e)}")
@@ -9,11 +9,20 @@ from jwt import InvalidTokenError
 
 from app.core.logging_config import get_logger
 from app.core.settings import settings
-from app.db.redis_client import get_cache, set_cache
-from app.exceptions.user import TokenNotFoundError
+from app.db.redis_client import redis_client
+from app.exceptions.user import (
+    InvalidTokenTypeError,
+    TokenBlacklistedError,
+    TokenInvalidError,
+    TokenNotFoundError,
+)
+from app.services.token_revocation import token_revocation
 
 logger = get_logger("jwt_utils")
 
+LEGACY_BLACKLIST_PREFIX = "blacklist:"
+LEGACY_BLACKLIST_MIGRATED_KEY = "revoked:legacy_migrated"
+
 
 class JwtScenario(Enum):
     """JWT authentication scenarios."""
@@ -39,6 +48,7 @@ def _create_token(
         "exp": int(expire_at.timestamp()),
         "iss": f"https://{settings.app_settings.APP_HOST}",
         "aud": f"https://{settings.app_settings.APP_HOST}/api",
+        "jti": str(uuid4()),
     }
     if additional_claims:
         payload.update(additional_claims)
@@ -87,25 +97,23 @@ def create_refresh_token(
         if expires_days is not None
         else settings.auth_settings.REFRESH_TOKEN_EXPIRE_DAYS
     )
-    extra_claims: Dict[str, Any] = dict(claims) if claims else {}
-    if "jti" not in extra_claims:
-        extra_claims["jti"] = str(uuid4())
-
     return _create_token(
         subject=subject,
         expires_delta=timedelta(days=days),
         token_type="refresh",
-        additional_claims=extra_claims,
+        additional_claims=claims,
     )
 
 
 def create_pair_tokens(
-    subject: int, claims: Optional[Dict[str, Any]] = None
+    subject: int, generation: int, claims: Optional[Dict[str, Any]] = None
 ) -> Dict[str, str]:
     """
-    Create a pair of access and refresh tokens.
+    Create a pair of access and refresh tokens, issued at the current token
+    generation of the subject.
     """
 
+    claims = {**(claims or {}), "gen": generation}
     access_token = create_access_token(subject=subject, claims=claims)
     refresh_token = create_refresh_token(subject=subject, claims=claims)
     return {"access_token": access_token, "refresh_token": refresh_token}
@@ -142,18 +150,25 @@ def decode_jwt(
         raise InvalidTokenError("Unknown token method")
 
 
-def get_token_subject(token: str) -> str:
+def get_token_claims(token: str) -> Dict[str, Any]:
     """
-    Return the subject (sub) claim from token. Raises if token is invalid.
+    Return the verified claims of a token with a subject. Raises if token is invalid.
     """
 
     payload = decode_jwt(JwtScenario.AUTH_LOCAL, token)
     if payload is None:
         raise InvalidTokenError("Invalid or expired token")
-    subject = payload.get("sub")
-    if subject is None:
+    if payload.get("sub") is None:
         raise InvalidTokenError("Missing 'sub' in token")
-    return str(subject)
+    return payload
+
+
+def get_token_subject(token: str) -> str:
+    """
+    Return the subject (sub) claim from token. Raises if token is invalid.
+    """
+
+    return str(get_token_claims(token)["sub"])
 
 
 def is_token_type(token: str, expected_type: str) -> bool:
@@ -170,25 +185,133 @@ def is_token_type(token: str, expected_type: str) -> bool:
         return False
 
 
+def is_current_generation(claims: Dict[str, Any], generation: int) -> bool:
+    """
+    Check that a token was issued at the current token generation of its
+    subject. Tokens without a "gen" claim count as generation 0.
+    """
+    return claims.get("gen", 0) == generation
+
+
+async def get_access_claims(request: Request) -> Dict[str, Any]:
+    """
+    Decode and verify the access token of a request once, including whether it
+    was revoked. The claims are kept on request.state, so every dependency and
+    service handling the request shares them instead of verifying again.
+    """
+    claims = getattr(request.state, "access_claims", None)
+    if claims is not None:
+        return claims
+
+    token_data = get_bearer_token(request)
+
+    try:
+        claims = decode_jwt(token_data["method"], token_data["token"])
+    except InvalidTokenError as e:
+        logger.warning(f"get_access_claims: Invalid access token: {str(e)}")
+        raise TokenInvalidError("Invalid or expired token")
+
+    if not claims or claims.get("sub") is None:
+        raise TokenInvalidError("Missing 'sub' in token")
+    if claims.get("type") != "access":
+        logger.warning("get_access_claims: Invalid access token type")
+        raise InvalidTokenTypeError("Invalid token type")
+    if await is_claims_revoked(claims):
+        logger.warning("get_access_claims: Attempted to use revoked access token")
+        raise TokenBlacklistedError("Token is blacklisted")
+
+    request.state.access_claims = claims
+    return claims
+
+
 async def blacklist_token(token: str) -> None:
     """
-    Blacklist a JWT token.
+    Blacklist a JWT token by its jti until it expires. Tokens that cannot be
+    decoded, are already expired or have no jti need no blacklisting.
     """
     logger.info("blacklist_token: Adding token to blacklist")
 
-    await set_cache(
-        f"blacklist:{token}",
-        "1",
-        settings.auth_settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
-    )
+    try:
+        claims = decode_jwt(JwtScenario.AUTH_LOCAL, token, verify_exp=False)
+    except InvalidTokenError as e:
+        logger.warning(f"blacklist_token: Skipped invalid token: {str(e)}")
+        return
+
+    token_id = _token_id(claims) if claims else None
+    if token_id is None:
+        logger.warning("blacklist_token: Skipped token without jti or exp")
+        return
+
+    await token_revocation.revoke(token_id, claims["exp"])
 
 
 async def is_token_blacklisted(token: str) -> bool:
     """
-    Check if a JWT token is blacklisted.
+    Check if a JWT token is blacklisted. Tokens that cannot be decoded are not,
+    and are rejected by the signature check instead.
+    """
+    try:
+        claims = decode_jwt(JwtScenario.AUTH_LOCAL, token, verify_exp=False)
+    except InvalidTokenError:
+        return False
+
+    return bool(claims) and await is_claims_revoked(claims)
+
+
+async def is_claims_revoked(claims: Dict[str, Any]) -> bool:
+    """
+    Check if the token the claims were decoded from is blacklisted.
+    """
+    token_id = _token_id(claims)
+    if token_id is None:
+        return False
+
+    return await token_revocation.is_revoked(token_id)
+
+
+def _token_id(claims: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the id a token is blacklisted under: its jti, or subject and expiry
+    for access tokens issued before tokens carried a jti.
     """
+    if claims.get("jti"):
+        return str(claims["jti"])
+    if claims.get("sub") is None or claims.get("exp") is None:
+        return None
+    return f"legacy:{claims['sub']}:{claims['exp']}"
+
 
-    return await get_cache(f"blacklist:{token}") == "1"
+async def migrate_legacy_blacklist() -> int:
+    """
+    Move tokens blacklisted under blacklist:{token} before revocation was keyed
+    by jti into the revocation list. Runs until one run completes, so every
+    worker has moved them before it serves requests. Returns the number of
+    tokens moved.
+    """
+    if await redis_client.exists(LEGACY_BLACKLIST_MIGRATED_KEY):
+        return 0
+
+    migrated = 0
+    async for key in redis_client.scan_iter(match=f"{LEGACY_BLACKLIST_PREFIX}*", count=1000):
+        token = key[len(LEGACY_BLACKLIST_PREFIX):]
+        try:
+            claims = decode_jwt(JwtScenario.AUTH_LOCAL, token, verify_exp=False)
+        except InvalidTokenError:
+            continue
+
+        token_id = _token_id(claims) if claims else None
+        if token_id is not None:
+            await token_revocation.revoke(token_id, claims["exp"])
+            migrated += 1
+
+    # Legacy entries expire within REFRESH_TOKEN_EXPIRE_DAYS, so the marker can too.
+    await redis_client.set(
+        LEGACY_BLACKLIST_MIGRATED_KEY,
+        "1",
+        ex=settings.auth_settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400,
+    )
+    logger.info(f"migrate_legacy_blacklist: Moved {migrated} blacklisted tokens")
+    return migrated
 
 
 def get_bearer_token(request: Request) -> dict:
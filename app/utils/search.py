@@ -0,0 +1,17 @@
+import re
+from typing import Optional
+
+MAX_SEARCH_TERMS = 8
+
+
+def build_prefix_tsquery(text: str) -> Optional[str]:
+    """
+    Turn free text into a tsquery where every word must match as a prefix, as in
+    "pres:* & elect:*". Only word characters are kept, so user input can never
+    produce tsquery syntax. Returns None if the text has no words.
+    """
+    terms = list(dict.fromkeys(re.findall(r"\w+", text.lower())))[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+
+    return " & ".join(f"{term}:*" for term in terms)
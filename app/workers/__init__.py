@@ -0,0 +1,12 @@
+from app.workers.results_refresher import ResultsRefresher, results_refresher
+from app.workers.tally_reconciler import TallyReconciler, tally_reconciler
+from app.workers.vote_queue import VoteQueueFlusher, vote_queue_flusher
+
+__all__ = [
+    "ResultsRefresher",
+    "results_refresher",
+    "TallyReconciler",
+    "tally_reconciler",
+    "VoteQueueFlusher",
+    "vote_queue_flusher",
+]
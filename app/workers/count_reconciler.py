@@ -0,0 +1,117 @@
+import asyncio
+import time
+from typing import Any, Optional
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.database import async_session_maker
+from app.db.redis_client import redis_client
+from app.services.counts import COUNTED_MODELS, CountService
+
+logger = get_logger("count_reconciler")
+
+RECONCILE_LOCK_KEY = "count:reconcile:lock"
+
+
+class CountReconciler:
+    """
+    Background task that periodically recounts the counted tables and repairs
+    their Redis row counters, which also seeds them on the first run. Rows
+    removed by cascading deletes are only caught up here. A lock held for the
+    whole interval lets one worker run per interval, however many are started.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+        self.runs_total = 0
+        self.failed_runs_total = 0
+        self.skipped_runs_total = 0
+        self.fixed_total = 0
+        self.last_run_seconds = 0.0
+        self.last_run_at: Optional[float] = None
+
+    async def start(self) -> None:
+        """Start the reconciler task."""
+        if self._task is not None:
+            return
+
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(), name="count-reconciler")
+        logger.info("Count reconciler started")
+
+    async def stop(self) -> None:
+        """Stop the reconciler after the run in progress."""
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        await self._task
+        self._task = None
+        logger.info("Count reconciler stopped")
+
+    def metrics(self) -> dict[str, Any]:
+        """Return reconciliation counters."""
+        return {
+            "running": self._task is not None,
+            "runs_total": self.runs_total,
+            "failed_runs_total": self.failed_runs_total,
+            "skipped_runs_total": self.skipped_runs_total,
+            "fixed_total": self.fixed_total,
+            "last_run_seconds": round(self.last_run_seconds, 4),
+            "last_run_at": self.last_run_at,
+        }
+
+    async def _run(self) -> None:
+        interval = settings.count_settings.COUNT_RECONCILE_INTERVAL_SECONDS
+
+        while not self._stopping.is_set():
+            try:
+                await self.reconcile_counters()
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                self.failed_runs_total += 1
+                logger.error(f"Error reconciling row counters: {str(e)}", exc_info=True)
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def reconcile_counters(self) -> None:
+        """Reconcile the row counter of every counted table, unless another worker did this interval."""
+        acquired = await redis_client.set(
+            RECONCILE_LOCK_KEY,
+            "1",
+            nx=True,
+            ex=settings.count_settings.COUNT_RECONCILE_INTERVAL_SECONDS,
+        )
+        if not acquired:
+            self.skipped_runs_total += 1
+            logger.debug("Row counters already reconciled by another worker")
+            return
+
+        started = time.perf_counter()
+
+        async with async_session_maker() as session:
+            fixed = 0
+            for model in COUNTED_MODELS:
+                if await CountService.reconcile(session, model):
+                    fixed += 1
+
+        self.runs_total += 1
+        self.fixed_total += fixed
+        self.last_run_seconds = time.perf_counter() - started
+        self.last_run_at = time.time()
+
+        logger.info(
+            f"Reconciled {len(COUNTED_MODELS)} row counters, {fixed} fixed "
+            f"in {self.last_run_seconds:.4f}s"
+        )
+
+
+count_reconciler = CountReconciler()
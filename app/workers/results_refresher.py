@@ -0,0 +1,117 @@
+import asyncio
+import time
+from typing import Any, Optional
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.database import async_session_maker
+from app.services.results import ResultsService
+
+logger = get_logger("results_refresher")
+
+
+class ResultsRefresher:
+    """
+    Background task that recomputes the cached results of elections that
+    received vote changes, so readers rarely have to recompute them inline.
+    """
+
+    BATCH_SIZE = 100
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+        self.runs_total = 0
+        self.failed_runs_total = 0
+        self.refreshed_total = 0
+        self.last_run_elections = 0
+        self.last_run_seconds = 0.0
+        self.last_run_at: Optional[float] = None
+
+    async def start(self) -> None:
+        """Start the refresher task."""
+        if self._task is not None:
+            return
+
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(), name="results-refresher")
+        logger.info("Results refresher started")
+
+    async def stop(self) -> None:
+        """Stop the refresher after the run in progress."""
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        await self._task
+        self._task = None
+        logger.info("Results refresher stopped")
+
+    def metrics(self) -> dict[str, Any]:
+        """Return refresh counters."""
+        return {
+            "running": self._task is not None,
+            "runs_total": self.runs_total,
+            "failed_runs_total": self.failed_runs_total,
+            "refreshed_total": self.refreshed_total,
+            "last_run_elections": self.last_run_elections,
+            "last_run_seconds": round(self.last_run_seconds, 4),
+            "last_run_at": self.last_run_at,
+        }
+
+    async def _run(self) -> None:
+        interval = settings.results_settings.RESULTS_REFRESH_INTERVAL_SECONDS
+
+        while not self._stopping.is_set():
+            try:
+                await self.refresh_dirty_elections()
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                self.failed_runs_total += 1
+                logger.error(f"Error refreshing results: {str(e)}", exc_info=True)
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def refresh_dirty_elections(self) -> None:
+        """
+        Recompute the results of every election in the dirty set. Elections are
+        popped from the set, so concurrent workers never refresh the same one,
+        and put back if the database fails. Deleted elections are dropped.
+        """
+        started = time.perf_counter()
+        refreshed = 0
+
+        async with async_session_maker() as session:
+            while election_ids := await ResultsService.pop_dirty(self.BATCH_SIZE):
+                for index, election_id in enumerate(election_ids):
+                    try:
+                        await ResultsService.refresh(session, election_id)
+                        refreshed += 1
+                    except ValueError as e:
+                        logger.warning(
+                            f"Dropping results refresh of election {election_id}: {str(e)}"
+                        )
+                    except Exception:
+                        await ResultsService.mark_dirty(election_ids[index:])
+                        raise
+
+        self.runs_total += 1
+        self.refreshed_total += refreshed
+        self.last_run_elections = refreshed
+        self.last_run_seconds = time.perf_counter() - started
+        self.last_run_at = time.time()
+
+        if refreshed:
+            logger.info(
+                f"Refreshed results of {refreshed} elections in {self.last_run_seconds:.4f}s"
+            )
+
+
+results_refresher = ResultsRefresher()
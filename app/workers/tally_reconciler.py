@@ -0,0 +1,130 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.database import async_session_maker
+from app.db.redis_client import redis_client
+from app.repository.election_repository import ElectionRepository
+from app.services.tally import TallyService
+
+logger = get_logger("tally_reconciler")
+
+RECONCILE_LOCK_KEY = "tally:reconcile:lock"
+
+
+class TallyReconciler:
+    """
+    Background task that periodically compares the live tally counters of open
+    elections with the votes table and repairs any drift. A lock held for the
+    whole interval lets one worker run per interval, however many are started.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+        self.runs_total = 0
+        self.failed_runs_total = 0
+        self.skipped_runs_total = 0
+        self.fixed_total = 0
+        self.last_run_elections = 0
+        self.last_run_seconds = 0.0
+        self.last_run_at: Optional[float] = None
+
+    async def start(self) -> None:
+        """Start the reconciler task."""
+        if self._task is not None:
+            return
+
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(), name="tally-reconciler")
+        logger.info("Tally reconciler started")
+
+    async def stop(self) -> None:
+        """Stop the reconciler after the run in progress."""
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        await self._task
+        self._task = None
+        logger.info("Tally reconciler stopped")
+
+    def metrics(self) -> dict[str, Any]:
+        """Return reconciliation counters."""
+        return {
+            "running": self._task is not None,
+            "runs_total": self.runs_total,
+            "failed_runs_total": self.failed_runs_total,
+            "skipped_runs_total": self.skipped_runs_total,
+            "fixed_total": self.fixed_total,
+            "last_run_elections": self.last_run_elections,
+            "last_run_seconds": round(self.last_run_seconds, 4),
+            "last_run_at": self.last_run_at,
+        }
+
+    async def _run(self) -> None:
+        interval = settings.vote_settings.TALLY_RECONCILE_INTERVAL_SECONDS
+
+        while not self._stopping.is_set():
+            try:
+                await self.reconcile_open_elections()
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                self.failed_runs_total += 1
+                logger.error(f"Error reconciling tallies: {str(e)}", exc_info=True)
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def reconcile_open_elections(self) -> None:
+        """
+        Reconcile every election that is running or ended less than
+        TALLY_RECONCILE_GRACE_SECONDS ago, unless another worker did this interval.
+        """
+        acquired = await redis_client.set(
+            RECONCILE_LOCK_KEY,
+            "1",
+            nx=True,
+            ex=settings.vote_settings.TALLY_RECONCILE_INTERVAL_SECONDS,
+        )
+        if not acquired:
+            self.skipped_runs_total += 1
+            logger.debug("Tallies already reconciled by another worker")
+            return
+
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        ended_after = now - timedelta(
+            seconds=settings.vote_settings.TALLY_RECONCILE_GRACE_SECONDS
+        )
+
+        async with async_session_maker() as session:
+            elections = await ElectionRepository(session).read_open_windows(now, ended_after)
+
+            fixed = 0
+            for election_id, ends_at in elections:
+                if await TallyService.reconcile(session, election_id, ends_at):
+                    fixed += 1
+
+        self.runs_total += 1
+        self.fixed_total += fixed
+        self.last_run_elections = len(elections)
+        self.last_run_seconds = time.perf_counter() - started
+        self.last_run_at = time.time()
+
+        logger.info(
+            f"Reconciled tallies of {len(elections)} elections, {fixed} fixed "
+            f"in {self.last_run_seconds:.4f}s"
+        )
+
+
+tally_reconciler = TallyReconciler()
@@ -0,0 +1,281 @@
+import asyncio
+import os
+import socket
+import time
+from typing import Any, Optional
+
+from redis.exceptions import ResponseError
+
+from app.core.logging_config import get_logger
+from app.core.settings import settings
+from app.db.database import async_session_maker
+from app.db.redis_client import redis_client
+from app.models.vote import Vote
+from app.schemas.vote import VoteRejectionReason
+from app.services.vote import VoteService
+from app.services.vote_queue import VoteQueueService
+
+logger = get_logger("vote_queue_flusher")
+
+
+class VoteQueueFlusher:
+    """
+    Background task that drains the vote ingestion stream into the votes table.
+
+    Entries are read through a consumer group, so a vote is only acknowledged
+    after the batch it belongs to has been committed. Entries left pending by a
+    crashed worker are claimed after VOTE_QUEUE_CLAIM_IDLE_MS.
+    """
+
+    CLAIM_INTERVAL_SECONDS = 30
+    RETRY_DELAY_SECONDS = 1
+
+    def __init__(self):
+        self.consumer_name = f"{socket.gethostname()}-{os.getpid()}"
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+        self.batches_total = 0
+        self.failed_batches_total = 0
+        self.accepted_total = 0
+        self.rejected_total = 0
+        self.last_batch_size = 0
+        self.last_flush_seconds = 0.0
+        self.last_flush_at: Optional[float] = None
+
+    async def start(self) -> None:
+        """Start the flusher task."""
+        if self._task is not None:
+            return
+
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(), name="vote-queue-flusher")
+        logger.info(f"Vote queue flusher started as consumer {self.consumer_name}")
+
+    async def stop(self) -> None:
+        """Stop the flusher after the batch in progress is flushed."""
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        await self._task
+        self._task = None
+        logger.info("Vote queue flusher stopped")
+
+    async def metrics(self) -> dict[str, Any]:
+        """Return throughput counters and the lag of the ingestion stream."""
+        vote_settings = settings.vote_settings
+
+        data: dict[str, Any] = {
+            "consumer": self.consumer_name,
+            "running": self._task is not None,
+            "batches_total": self.batches_total,
+            "failed_batches_total": self.failed_batches_total,
+            "accepted_total": self.accepted_total,
+            "rejected_total": self.rejected_total,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_seconds": round(self.last_flush_seconds, 4),
+            "last_flush_at": self.last_flush_at,
+        }
+
+        try:
+            data["stream_length"] = await redis_client.xlen(vote_settings.VOTE_QUEUE_STREAM)
+
+            groups = await redis_client.xinfo_groups(vote_settings.VOTE_QUEUE_STREAM)
+            group = next(
+                (g for g in groups if g["name"] == vote_settings.VOTE_QUEUE_GROUP), None
+            )
+            data["lag"] = group.get("lag") if group else None
+
+            pending = await redis_client.xpending(
+                vote_settings.VOTE_QUEUE_STREAM, vote_settings.VOTE_QUEUE_GROUP
+            )
+            data["pending"] = pending["pending"]
+            data["oldest_pending_seconds"] = (
+                round(time.time() - int(pending["min"].split("-")[0]) / 1000, 3)
+                if pending["min"]
+                else 0
+            )
+        except ResponseError as e:
+            logger.warning(f"Could not read vote queue stream info: {str(e)}")
+
+        return data
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        group_ready = False
+        read_id = "0"
+        next_claim_at = 0.0
+
+        while not self._stopping.is_set():
+            try:
+                if not group_ready:
+                    await self._ensure_group()
+                    group_ready = True
+
+                if loop.time() >= next_claim_at:
+                    await self._claim_idle_entries()
+                    next_claim_at = loop.time() + self.CLAIM_INTERVAL_SECONDS
+                    read_id = "0"
+
+                entries = await self._read_batch(read_id)
+
+                if not entries:
+                    read_id = ">"
+                    continue
+
+                await self._flush(entries)
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                self.failed_batches_total += 1
+                group_ready = False
+                read_id = "0"
+                logger.error(f"Error flushing vote queue: {str(e)}", exc_info=True)
+
+                try:
+                    await asyncio.wait_for(
+                        self._stopping.wait(), timeout=self.RETRY_DELAY_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _ensure_group(self) -> None:
+        try:
+            await redis_client.xgroup_create(
+                settings.vote_settings.VOTE_QUEUE_STREAM,
+                settings.vote_settings.VOTE_QUEUE_GROUP,
+                id="0",
+                mkstream=True,
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _claim_idle_entries(self) -> None:
+        vote_settings = settings.vote_settings
+
+        response = await redis_client.xautoclaim(
+            vote_settings.VOTE_QUEUE_STREAM,
+            vote_settings.VOTE_QUEUE_GROUP,
+            self.consumer_name,
+            min_idle_time=vote_settings.VOTE_QUEUE_CLAIM_IDLE_MS,
+            count=vote_settings.VOTE_QUEUE_BATCH_SIZE,
+            justid=True,
+        )
+        claimed = response[1] if response else []
+
+        if claimed:
+            logger.warning(f"Claimed {len(claimed)} idle vote queue entries")
+
+    async def _read_batch(self, read_id: str) -> list[tuple[str, Optional[dict]]]:
+        """
+        Read pending entries when read_id is "0", otherwise wait for new entries
+        until the batch is full or VOTE_QUEUE_LINGER_MS has passed.
+        """
+        vote_settings = settings.vote_settings
+
+        if read_id == "0":
+            response = await redis_client.xreadgroup(
+                vote_settings.VOTE_QUEUE_GROUP,
+                self.consumer_name,
+                {vote_settings.VOTE_QUEUE_STREAM: "0"},
+                count=vote_settings.VOTE_QUEUE_BATCH_SIZE,
+            )
+            return self._stream_entries(response)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + vote_settings.VOTE_QUEUE_LINGER_MS / 1000
+        entries: list[tuple[str, Optional[dict]]] = []
+
+        while len(entries) < vote_settings.VOTE_QUEUE_BATCH_SIZE:
+            remaining_ms = int((deadline - loop.time()) * 1000)
+            if remaining_ms <= 0:
+                break
+
+            response = await redis_client.xreadgroup(
+                vote_settings.VOTE_QUEUE_GROUP,
+                self.consumer_name,
+                {vote_settings.VOTE_QUEUE_STREAM: ">"},
+                count=vote_settings.VOTE_QUEUE_BATCH_SIZE - len(entries),
+                block=remaining_ms,
+            )
+            entries.extend(self._stream_entries(response))
+
+        return entries
+
+    @staticmethod
+    def _stream_entries(response: Any) -> list[tuple[str, Optional[dict]]]:
+        if not response:
+            return []
+
+        streams = response.items() if isinstance(response, dict) else response
+        entries: list[tuple[str, Optional[dict]]] = []
+        for _, stream_entries in streams:
+            entries.extend((entry_id, fields) for entry_id, fields in stream_entries)
+
+        return entries
+
+    async def _flush(self, entries: list[tuple[str, Optional[dict]]]) -> None:
+        vote_settings = settings.vote_settings
+        started = time.perf_counter()
+
+        ballots: list[Vote] = []
+        for entry_id, fields in entries:
+            if not fields:
+                continue
+            try:
+                ballots.append(VoteQueueService.ballot_from_entry(fields))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Dropping malformed vote queue entry {entry_id}: {str(e)}")
+
+        outcomes = await self._apply(ballots) if ballots else []
+        await VoteQueueService.record_outcomes(outcomes)
+
+        entry_ids = [entry_id for entry_id, _ in entries]
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.xack(vote_settings.VOTE_QUEUE_STREAM, vote_settings.VOTE_QUEUE_GROUP, *entry_ids)
+            pipe.xdel(vote_settings.VOTE_QUEUE_STREAM, *entry_ids)
+            await pipe.execute()
+
+        accepted = sum(1 for _, reason in outcomes if reason is None)
+        self.batches_total += 1
+        self.accepted_total += accepted
+        self.rejected_total += len(outcomes) - accepted
+        self.last_batch_size = len(entries)
+        self.last_flush_seconds = time.perf_counter() - started
+        self.last_flush_at = time.time()
+
+        logger.info(
+            f"Flushed {len(entries)} queued votes: {accepted} accepted, "
+            f"{len(outcomes) - accepted} rejected in {self.last_flush_seconds:.4f}s"
+        )
+
+    async def _apply(self, ballots: list[Vote]) -> list[tuple[str, Any]]:
+        """
+        Write a batch of ballots. If the batch violates a constraint, retry the
+        ballots one by one so a single bad vote cannot block the queue. A ballot
+        that still violates one, because its election or candidate was deleted
+        while it was queued, is rejected with ELECTION_CHANGED.
+        """
+        try:
+            async with async_session_maker() as session:
+                reasons = await VoteService.apply_ballots(session, ballots)
+            return [(ballot.id, reason) for ballot, reason in zip(ballots, reasons)]
+
+        except ValueError as e:
+            if len(ballots) == 1:
+                logger.error(f"Rejecting queued vote {ballots[0].id}: {str(e)}")
+                return [(ballots[0].id, VoteRejectionReason.ELECTION_CHANGED)]
+            logger.warning("Vote batch violated a constraint, retrying votes one by one")
+
+        outcomes: list[tuple[str, Any]] = []
+        for ballot in ballots:
+            outcomes.extend(await self._apply([ballot]))
+
+        return outcomes
+
+
+vote_queue_flusher = VoteQueueFlusher()
@@ -0,0 +1,58 @@
+"""
+Compare the JSON response paths of a 1,000-vote list.
+
+Run from the repository root:
+
+    python -m benchmarks.json_response
+"""
+import timeit
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+
+from app.core.responses import ModelJSONResponse, list_adapter
+from app.schemas.vote import VoteResponse
+
+ITEMS = 1000
+ROUNDS = 200
+
+
+def _rows() -> list[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=f"vote-id-{index}",
+            election_id="election-id-1",
+            voter_id=f"user-id-{index}",
+            candidate_id="candidate-id-1",
+            created_at=datetime(2025, 1, 1, 12, 0),
+        )
+        for index in range(ITEMS)
+    ]
+
+
+def _before(rows: list[SimpleNamespace]) -> bytes:
+    votes = [VoteResponse.model_validate(row) for row in rows]
+    return JSONResponse(content=[vote.model_dump(mode="json") for vote in votes]).body
+
+
+def _after(rows: list[SimpleNamespace]) -> bytes:
+    votes = list_adapter(VoteResponse).validate_python(rows, from_attributes=True)
+    return ModelJSONResponse(content=votes).body
+
+
+def main() -> None:
+    rows = _rows()
+    assert _before(rows) == _after(rows)
+
+    before = min(timeit.repeat(lambda: _before(rows), number=ROUNDS, repeat=5)) / ROUNDS
+    after = min(timeit.repeat(lambda: _after(rows), number=ROUNDS, repeat=5)) / ROUNDS
+
+    print(f"{ITEMS} votes, validate + serialize, best of 5 x {ROUNDS} rounds")
+    print(f"  model_validate + model_dump + JSONResponse: {before * 1000:.3f} ms")
+    print(f"  list TypeAdapter + ModelJSONResponse:       {after * 1000:.3f} ms")
+    print(f"  speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
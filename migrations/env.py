@@ -17,6 +17,18 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Full-text search columns are generated by the database and never written by
+# the application, so they are left out of the models and kept out of
+# autogenerated migrations.
+UNMAPPED_SCHEMA_OBJECTS = {"search_vector", "idx_election_search", "idx_candidate_search"}
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """
+    Skip database objects that exist on purpose without a model counterpart.
+    """
+    return not (reflected and compare_to is None and name in UNMAPPED_SCHEMA_OBJECTS)
+
 
 def run_migrations_offline() -> None:
     """
@@ -30,6 +42,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -50,7 +63,11 @@ def run_migrations_online() -> None:
     connectable = create_engine(db_url, poolclass=pool.NullPool)
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
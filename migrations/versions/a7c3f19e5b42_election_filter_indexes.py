@@ -0,0 +1,38 @@
+"""election filter indexes
+
+Revision ID: a7c3f19e5b42
+Revises: d5b2e7a9c310
+Create Date: 2026-10-17 14:06:51.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3f19e5b42'
+down_revision: Union[str, Sequence[str], None] = 'd5b2e7a9c310'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Visibility and owner listings are read in (created_at, id) order straight
+    # from the index; the visibility index covers every is_public lookup.
+    op.create_index('idx_election_public_created_at_id', 'elections', ['is_public', 'created_at', 'id'], unique=False)
+    op.drop_index('idx_election_is_public', table_name='elections')
+    op.create_index('idx_election_owner_created_at_id', 'elections', ['owner_id', 'created_at', 'id'], unique=False)
+    # Active and finished elections of one visibility are a range on end_date,
+    # with start_date checked from the index.
+    op.create_index('idx_election_public_end_start', 'elections', ['is_public', 'end_date', 'start_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_election_public_end_start', table_name='elections')
+    op.drop_index('idx_election_owner_created_at_id', table_name='elections')
+    op.create_index('idx_election_is_public', 'elections', ['is_public'], unique=False)
+    op.drop_index('idx_election_public_created_at_id', table_name='elections')
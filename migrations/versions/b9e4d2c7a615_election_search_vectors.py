@@ -0,0 +1,51 @@
+"""election search vectors
+
+Revision ID: b9e4d2c7a615
+Revises: a7c3f19e5b42
+Create Date: 2026-10-17 16:21:08.534910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4d2c7a615'
+down_revision: Union[str, Sequence[str], None] = 'a7c3f19e5b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The 'simple' configuration only lowercases, so names and words in any
+    # language match as typed. Weights rank title over description over
+    # candidate name over candidate description.
+    op.execute(
+        """
+        ALTER TABLE elections ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')
+        ) STORED
+        """
+    )
+    op.execute(
+        """
+        ALTER TABLE candidates ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'C') ||
+            setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'D')
+        ) STORED
+        """
+    )
+    op.create_index('idx_election_search', 'elections', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index('idx_candidate_search', 'candidates', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_candidate_search', table_name='candidates')
+    op.drop_index('idx_election_search', table_name='elections')
+    op.drop_column('candidates', 'search_vector')
+    op.drop_column('elections', 'search_vector')
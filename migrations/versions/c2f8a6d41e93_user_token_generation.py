@@ -0,0 +1,32 @@
+"""user token generation
+
+Revision ID: c2f8a6d41e93
+Revises: b9e4d2c7a615
+Create Date: 2026-10-17 19:42:51.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f8a6d41e93'
+down_revision: Union[str, Sequence[str], None] = 'b9e4d2c7a615'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default lets PostgreSQL add the column without rewriting users.
+    op.add_column(
+        'users',
+        sa.Column('token_generation', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_generation')
@@ -0,0 +1,56 @@
+"""single choice vote constraint
+
+Revision ID: c41e9b7d2f08
+Revises: a690068d28a7
+Create Date: 2026-10-17 09:12:44.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e9b7d2f08'
+down_revision: Union[str, Sequence[str], None] = 'a690068d28a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'votes',
+        sa.Column('single_choice', sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+
+    # Only the latest ballot of each voter in a single-choice election is
+    # flagged, so duplicates left by past races do not block the index. They
+    # are kept as regular ballots.
+    op.execute(
+        """
+        UPDATE votes SET single_choice = true
+        WHERE id IN (
+            SELECT DISTINCT ON (v.election_id, v.voter_id) v.id
+            FROM votes v
+            LEFT JOIN election_settings s ON s.election_id = v.election_id
+            WHERE COALESCE(s.max_votes, 1) = 1
+            ORDER BY v.election_id, v.voter_id, v.created_at DESC NULLS LAST, v.id DESC
+        )
+        """
+    )
+
+    op.create_index(
+        'uq_vote_single_choice_election_voter',
+        'votes',
+        ['election_id', 'voter_id'],
+        unique=True,
+        postgresql_where=sa.text('single_choice'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_vote_single_choice_election_voter', table_name='votes')
+    op.drop_column('votes', 'single_choice')
@@ -0,0 +1,42 @@
+"""keyset pagination indexes
+
+Revision ID: d5b2e7a9c310
+Revises: e83f5a1c6d27
+Create Date: 2026-10-17 12:41:08.512733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b2e7a9c310'
+down_revision: Union[str, Sequence[str], None] = 'e83f5a1c6d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # List endpoints page on (created_at, id); the composite index also serves
+    # every query the single column index did.
+    op.create_index('idx_user_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.drop_index('idx_user_created_at', table_name='users')
+    op.create_index('idx_vote_created_at_id', 'votes', ['created_at', 'id'], unique=False)
+    op.drop_index('idx_vote_created_at', table_name='votes')
+    op.create_index('idx_election_created_at_id', 'elections', ['created_at', 'id'], unique=False)
+    op.drop_index('idx_election_created_at', table_name='elections')
+    op.create_index('idx_user_profile_created_at_id', 'user_profiles', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_user_profile_created_at_id', table_name='user_profiles')
+    op.create_index('idx_election_created_at', 'elections', ['created_at'], unique=False)
+    op.drop_index('idx_election_created_at_id', table_name='elections')
+    op.create_index('idx_vote_created_at', 'votes', ['created_at'], unique=False)
+    op.drop_index('idx_vote_created_at_id', table_name='votes')
+    op.create_index('idx_user_created_at', 'users', ['created_at'], unique=False)
+    op.drop_index('idx_user_created_at_id', table_name='users')
@@ -0,0 +1,37 @@
+"""vote log without vote fk
+
+Revision ID: e83f5a1c6d27
+Revises: c41e9b7d2f08
+Create Date: 2026-10-17 11:03:19.274415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e83f5a1c6d27'
+down_revision: Union[str, Sequence[str], None] = 'c41e9b7d2f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Audit entries must outlive the votes they describe, and are written
+    # after the vote itself has been committed.
+    op.drop_constraint('vote_logs_vote_id_fkey', 'vote_logs', type_='foreignkey')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM vote_logs WHERE vote_id NOT IN (SELECT id FROM votes)")
+    op.create_foreign_key(
+        'vote_logs_vote_id_fkey',
+        'vote_logs',
+        'votes',
+        ['vote_id'],
+        ['id'],
+    )
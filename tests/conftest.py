@@ -1,7 +1,12 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401
+from app.db.database import Base
 
 
 @pytest.fixture
@@ -12,3 +17,127 @@ def async_session_mock() -> AsyncSession:
     return AsyncMock(spec=AsyncSession)
 
 
+@pytest_asyncio.fixture
+async def sqlite_session():
+    """
+    Real session on an in-memory SQLite database. The statements sent to the
+    database are collected on session.info["statements"].
+    """
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    statements: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        session.info["statements"] = statements
+        yield session
+
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def tally_changes_mock():
+    """
+    Keep service tests from reaching Redis when vote mutations are published
+    or elections deleted.
+    """
+    with patch("app.services.vote.TallyService") as tally_service_cls, patch(
+        "app.services.election.TallyService"
+    ) as election_tally_cls:
+        tally_service_cls.apply_changes = AsyncMock()
+        election_tally_cls.discard = AsyncMock()
+        yield tally_service_cls.apply_changes
+
+
+@pytest.fixture(autouse=True)
+def results_dirty_mock():
+    """
+    Keep service tests from reaching Redis when election results are flagged.
+    """
+    with patch("app.services.vote.ResultsService") as vote_results_cls, patch(
+        "app.services.election.ResultsService"
+    ) as election_results_cls:
+        vote_results_cls.mark_dirty = AsyncMock()
+        election_results_cls.mark_dirty = AsyncMock()
+        yield vote_results_cls.mark_dirty
+
+
+@pytest.fixture(autouse=True)
+def election_cache_mock():
+    """
+    Keep election service tests from reaching the Redis election cache.
+    """
+    with patch("app.services.election.ElectionCacheService") as election_cache_cls:
+        election_cache_cls.get = AsyncMock(return_value=None)
+        election_cache_cls.get_version = AsyncMock(return_value="0")
+        election_cache_cls.store = AsyncMock(return_value=True)
+        election_cache_cls.invalidate = AsyncMock()
+        yield election_cache_cls
+
+
+@pytest.fixture(autouse=True)
+def version_bump_mock():
+    """
+    Keep service tests from reaching Redis when ETag versions are bumped.
+    """
+    with patch("app.services.vote.VersionService") as vote_versions_cls, patch(
+        "app.services.election.VersionService"
+    ) as election_versions_cls, patch(
+        "app.services.results.VersionService"
+    ) as results_versions_cls:
+        vote_versions_cls.bump = AsyncMock()
+        election_versions_cls.bump = AsyncMock()
+        results_versions_cls.bump = AsyncMock()
+        yield election_versions_cls.bump
+
+
+@pytest.fixture(autouse=True)
+def row_counter_mock():
+    """
+    Keep service tests from reaching Redis when row counters are adjusted.
+    """
+    with patch("app.services.vote.CountService") as vote_counts_cls, patch(
+        "app.services.election.CountService"
+    ) as election_counts_cls, patch(
+        "app.services.user.CountService"
+    ) as user_counts_cls, patch(
+        "app.services.user_profile.CountService"
+    ) as user_profile_counts_cls:
+        for counts_cls in (
+            vote_counts_cls,
+            election_counts_cls,
+            user_counts_cls,
+            user_profile_counts_cls,
+        ):
+            counts_cls.adjust = AsyncMock()
+        yield vote_counts_cls.adjust
+
+
+@pytest.fixture(autouse=True)
+def principal_cache_mock():
+    """
+    Keep user service tests from reaching the Redis principal cache.
+    """
+    with patch("app.services.user.principal_cache") as principal_cache:
+        principal_cache.get = AsyncMock(return_value=None)
+        principal_cache.get_version = AsyncMock(return_value="0")
+        principal_cache.store = AsyncMock(return_value=True)
+        principal_cache.invalidate = AsyncMock()
+        yield principal_cache
+
+
+@pytest.fixture(autouse=True)
+def token_revocation_mock():
+    """
+    Keep token checks from reaching the Redis revocation list.
+    """
+    with patch("app.utils.jwt.token_revocation") as token_revocation:
+        token_revocation.is_revoked = AsyncMock(return_value=False)
+        token_revocation.revoke = AsyncMock()
+        yield token_revocation
@@ -0,0 +1,200 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, Response
+
+from app.core.middleware import IdempotencyMiddleware
+
+
+class FakeRedis:
+    """
+    Minimal in-memory stand-in for the commands used by the middleware.
+    """
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+def _build_app(handler_calls: list, delay: float = 0.0, status_code: int = 201) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware)
+
+    @app.post("/votes", status_code=status_code)
+    async def create_vote(payload: dict):
+        handler_calls.append(payload)
+        await asyncio.sleep(delay)
+        return {"id": f"vote-{len(handler_calls)}", **payload}
+
+    @app.post("/api/v1/auth/login")
+    async def login(payload: dict, response: Response):
+        handler_calls.append(payload)
+        response.set_cookie("access_token", f"token-{len(handler_calls)}")
+        return {"detail": "Login successful"}
+
+    return app
+
+
+@pytest.fixture(autouse=True)
+def authenticated_caller():
+    """Run requests as one authenticated user unless a test patches otherwise."""
+    with patch("app.utils.jwt.get_access_claims", AsyncMock(return_value={"sub": "alice"})):
+        yield
+
+
+def _client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_replays_stored_response():
+    calls: list = []
+    fake_redis = FakeRedis()
+
+    with patch("app.core.middleware.redis_client", fake_redis):
+        async with _client(_build_app(calls)) as client:
+            headers = {"Idempotency-Key": "key-1"}
+            first = await client.post("/votes", json={"candidate_id": "c1"}, headers=headers)
+            second = await client.post("/votes", json={"candidate_id": "c1"}, headers=headers)
+
+    assert len(calls) == 1
+    assert first.status_code == second.status_code == 201
+    assert first.json() == second.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_waits_for_first_request():
+    calls: list = []
+    fake_redis = FakeRedis()
+
+    with patch("app.core.middleware.redis_client", fake_redis), patch(
+        "app.core.middleware.settings.idempotency_settings.IDEMPOTENCY_POLL_INTERVAL_MS", 5
+    ):
+        async with _client(_build_app(calls, delay=0.1)) as client:
+            headers = {"Idempotency-Key": "key-2"}
+            first, second = await asyncio.gather(
+                client.post("/votes", json={"candidate_id": "c1"}, headers=headers),
+                client.post("/votes", json={"candidate_id": "c1"}, headers=headers),
+            )
+
+    assert len(calls) == 1
+    assert first.json() == second.json()
+
+
+@pytest.mark.asyncio
+async def test_key_reused_with_different_body_is_rejected():
+    calls: list = []
+    fake_redis = FakeRedis()
+
+    with patch("app.core.middleware.redis_client", fake_redis):
+        async with _client(_build_app(calls)) as client:
+            headers = {"Idempotency-Key": "key-3"}
+            await client.post("/votes", json={"candidate_id": "c1"}, headers=headers)
+            response = await client.post(
+                "/votes", json={"candidate_id": "c2"}, headers=headers
+            )
+
+    assert len(calls) == 1
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_not_stored():
+    calls: list = []
+    fake_redis = FakeRedis()
+
+    with patch("app.core.middleware.redis_client", fake_redis):
+        async with _client(_build_app(calls, status_code=503)) as client:
+            headers = {"Idempotency-Key": "key-4"}
+            await client.post("/votes", json={"candidate_id": "c1"}, headers=headers)
+            await client.post("/votes", json={"candidate_id": "c1"}, headers=headers)
+
+    assert len(calls) == 2
+    assert fake_redis.data == {}
+
+
+@pytest.mark.asyncio
+async def test_requests_without_key_are_not_tracked():
+    calls: list = []
+    fake_redis = FakeRedis()
+
+    with patch("app.core.middleware.redis_client", fake_redis):
+        async with _client(_build_app(calls)) as client:
+            await client.post("/votes", json={"candidate_id": "c1"})
+            await client.post("/votes", json={"candidate_id": "c1"})
+
+    assert len(calls) == 2
+    assert fake_redis.data == {}
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_to_the_user_across_token_refreshes():
+    calls: list = []
+    fake_redis = FakeRedis()
+
+    async def get_access_claims(request):
+        return {"sub": request.cookies["access_token"].split("-")[0]}
+
+    with patch("app.core.middleware.redis_client", fake_redis), patch(
+        "app.utils.jwt.get_access_claims", AsyncMock(side_effect=get_access_claims)
+    ):
+        async with _client(_build_app(calls)) as client:
+            headers = {"Idempotency-Key": "key-6"}
+            for token in ("alice-token-1", "alice-token-2", "bob-token-1"):
+                client.cookies.set("access_token", token)
+                await client.post("/votes", json={"candidate_id": "c1"}, headers=headers)
+
+    assert len(calls) == 2
+    assert set(fake_redis.data) == {"idempotency:alice:key-6", "idempotency:bob:key-6"}
+
+
+@pytest.mark.asyncio
+async def test_auth_endpoints_are_never_replayed():
+    calls: list = []
+    fake_redis = FakeRedis()
+
+    with patch("app.core.middleware.redis_client", fake_redis):
+        async with _client(_build_app(calls)) as client:
+            headers = {"Idempotency-Key": "key-7"}
+            first = await client.post("/api/v1/auth/login", json={"email": "a"}, headers=headers)
+            second = await client.post("/api/v1/auth/login", json={"email": "a"}, headers=headers)
+
+    assert len(calls) == 2
+    assert first.cookies["access_token"] == "token-1"
+    assert second.cookies["access_token"] == "token-2"
+    assert "Idempotent-Replayed" not in second.headers
+    assert fake_redis.data == {}
+
+
+@pytest.mark.asyncio
+async def test_anonymous_requests_are_not_tracked():
+    calls: list = []
+    fake_redis = FakeRedis()
+
+    with patch("app.core.middleware.redis_client", fake_redis), patch(
+        "app.utils.jwt.get_access_claims",
+        AsyncMock(side_effect=HTTPException(status_code=401)),
+    ):
+        async with _client(_build_app(calls)) as client:
+            headers = {"Idempotency-Key": "key-8"}
+            await client.post("/votes", json={"candidate_id": "c1"}, headers=headers)
+            await client.post("/votes", json={"candidate_id": "c1"}, headers=headers)
+
+    assert len(calls) == 2
+    assert fake_redis.data == {}
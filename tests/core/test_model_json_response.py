@@ -0,0 +1,60 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+
+from app.core.responses import ModelJSONResponse, list_adapter
+from app.schemas.user import UserResponse
+from app.schemas.vote import VoteResponse
+
+
+def _votes(count: int) -> list[VoteResponse]:
+    return [
+        VoteResponse(
+            id=f"vote-id-{index}",
+            election_id="election-id-1",
+            voter_id="user-id-1",
+            candidate_id="candidate-id-ü",
+            created_at=datetime(2025, 1, 1, 12, 0, index),
+        )
+        for index in range(count)
+    ]
+
+
+def test_body_matches_json_response_of_dumped_models():
+    votes = _votes(3)
+
+    assert ModelJSONResponse(content=votes).body == JSONResponse(
+        content=[vote.model_dump(mode="json") for vote in votes]
+    ).body
+    assert ModelJSONResponse(content=votes[0]).body == JSONResponse(
+        content=votes[0].model_dump(mode="json")
+    ).body
+
+
+def test_plain_data_and_nested_models_are_encoded():
+    vote = _votes(1)[0]
+
+    assert ModelJSONResponse(content={"detail": "ok"}).body == b'{"detail":"ok"}'
+    assert ModelJSONResponse(content=[]).body == b"[]"
+    assert ModelJSONResponse(content={"vote": vote}).body == JSONResponse(
+        content={"vote": vote.model_dump(mode="json")}
+    ).body
+
+
+def test_list_adapter_validates_rows_from_attributes():
+    rows = [
+        SimpleNamespace(
+            id="user-id-1",
+            email="user@example.com",
+            phone=None,
+            first_name=None,
+            last_name=None,
+            created_at=None,
+        )
+    ]
+
+    users = list_adapter(UserResponse).validate_python(rows, from_attributes=True)
+
+    assert users == [UserResponse.model_validate(rows[0])]
+    assert list_adapter(UserResponse) is list_adapter(UserResponse)
@@ -0,0 +1,226 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import Depends, FastAPI, Request
+
+from app.core.settings import settings
+from app.dependencies.database import get_db
+from app.dependencies.token import get_current_user, get_optional_user, validate_access_token
+from app.models.user import User
+from app.routers.user import router as user_router
+from app.schemas.user import UserUpdate
+from app.services.user import user_service
+from app.utils.jwt import (
+    create_access_token,
+    create_pair_tokens,
+    create_refresh_token,
+    migrate_legacy_blacklist,
+)
+
+
+@pytest.fixture
+def rsa_keys(monkeypatch):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    monkeypatch.setattr(settings.auth_settings, "AUTH_ALGORITHM", "RS256")
+    monkeypatch.setattr(
+        settings.auth_settings,
+        "AUTH_PRIVATE_KEY",
+        private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode(),
+    )
+    monkeypatch.setattr(
+        settings.auth_settings,
+        "AUTH_PUBLIC_KEY",
+        private_key.public_key()
+        .public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+        .decode(),
+    )
+
+
+def _app(session) -> FastAPI:
+    app = FastAPI()
+
+    async def get_test_db():
+        yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+
+    @app.get("/me")
+    async def me(
+        request: Request,
+        token: str = Depends(validate_access_token),
+        current_user: User = Depends(get_current_user),
+        optional_user: User = Depends(get_optional_user),
+        db=Depends(get_db),
+    ):
+        service_user = await user_service.get_user_by_token(request, db)
+        return {"ids": [current_user.id, optional_user.id, service_user.id]}
+
+    return app
+
+
+async def _get(app: FastAPI, token: str) -> httpx.Response:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        client.cookies.set("access_token", token)
+        return await client.get("/me")
+
+
+@pytest.mark.asyncio
+async def test_token_is_verified_and_user_loaded_once_per_request(sqlite_session, rsa_keys):
+    user = User(email="voter@example.com", password_hash="hash", created_at=datetime(2025, 1, 1))
+    sqlite_session.add(user)
+    await sqlite_session.commit()
+    statements = sqlite_session.info["statements"]
+    statements.clear()
+
+    with patch("app.utils.jwt.jwt.decode", wraps=jwt.decode) as decode_mock:
+        response = await _get(_app(sqlite_session), create_access_token(subject=user.id))
+
+    assert response.status_code == 200
+    assert response.json() == {"ids": [user.id] * 3}
+    assert decode_mock.call_count == 1
+    assert len(statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_is_not_accepted_as_access_token(sqlite_session, rsa_keys):
+    response = await _get(_app(sqlite_session), create_refresh_token(subject="user-id-1"))
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Invalid token type"}
+
+
+@pytest.mark.asyncio
+async def test_revoked_access_token_is_rejected(sqlite_session, rsa_keys, token_revocation_mock):
+    token = create_access_token(subject="user-id-1")
+    jti = jwt.decode(token, options={"verify_signature": False})["jti"]
+    token_revocation_mock.is_revoked.return_value = True
+
+    response = await _get(_app(sqlite_session), token)
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Token is blacklisted"}
+    token_revocation_mock.is_revoked.assert_awaited_once_with(jti)
+
+
+@pytest.mark.asyncio
+async def test_bumping_the_token_generation_revokes_outstanding_tokens(
+    sqlite_session, rsa_keys, principal_cache_mock
+):
+    user = User(email="voter@example.com", password_hash="hash", created_at=datetime(2025, 1, 1))
+    sqlite_session.add(user)
+    await sqlite_session.commit()
+    tokens = create_pair_tokens(subject=user.id, generation=user.token_generation)
+
+    assert (await _get(_app(sqlite_session), tokens["access_token"])).status_code == 200
+
+    assert await user_service.revoke_all_tokens(sqlite_session, user.id) == 1
+    principal_cache_mock.invalidate.assert_awaited_once_with(user.id)
+
+    response = await _get(_app(sqlite_session), tokens["access_token"])
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Token is blacklisted"}
+
+    tokens = create_pair_tokens(subject=user.id, generation=1)
+    assert (await _get(_app(sqlite_session), tokens["access_token"])).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_password_change_bumps_the_token_generation(sqlite_session):
+    user = User(email="voter@example.com", password_hash="hash", created_at=datetime(2025, 1, 1))
+    sqlite_session.add(user)
+    await sqlite_session.commit()
+
+    with patch("app.services.user.password_hasher.hash", new=AsyncMock(return_value="new-hash")):
+        await user_service.update_user(sqlite_session, user.id, UserUpdate(first_name="Renamed"))
+        principal = await user_service.get_principal(sqlite_session, user.id)
+        assert principal.token_generation == 0
+
+        await user_service.update_user(sqlite_session, user.id, UserUpdate(password="new-password"))
+        principal = await user_service.get_principal(sqlite_session, user.id)
+        assert principal.token_generation == 1
+
+
+def _legacy_access_token(subject: str) -> str:
+    claims = jwt.decode(create_access_token(subject=subject), options={"verify_signature": False})
+    del claims["jti"]
+    return jwt.encode(
+        claims, settings.auth_settings.AUTH_PRIVATE_KEY, algorithm=settings.auth_settings.AUTH_ALGORITHM
+    )
+
+
+@pytest.mark.asyncio
+async def test_legacy_blacklist_is_moved_to_the_revocation_list(rsa_keys, token_revocation_mock):
+    refresh_token = create_refresh_token(subject="user-id-1")
+    refresh_claims = jwt.decode(refresh_token, options={"verify_signature": False})
+    access_token = _legacy_access_token("user-id-1")
+    access_claims = jwt.decode(access_token, options={"verify_signature": False})
+
+    async def scan_iter(**kwargs):
+        for key in (f"blacklist:{refresh_token}", f"blacklist:{access_token}", "blacklist:garbage"):
+            yield key
+
+    redis_mock = MagicMock()
+    redis_mock.exists = AsyncMock(return_value=0)
+    redis_mock.scan_iter = scan_iter
+    redis_mock.set = AsyncMock()
+
+    with patch("app.utils.jwt.redis_client", redis_mock):
+        assert await migrate_legacy_blacklist() == 2
+
+    token_revocation_mock.revoke.assert_any_await(refresh_claims["jti"], refresh_claims["exp"])
+    token_revocation_mock.revoke.assert_any_await(
+        f"legacy:user-id-1:{access_claims['exp']}", access_claims["exp"]
+    )
+    assert redis_mock.set.await_args.args[0] == "revoked:legacy_migrated"
+
+    redis_mock.exists.return_value = 1
+    with patch("app.utils.jwt.redis_client", redis_mock):
+        assert await migrate_legacy_blacklist() == 0
+
+
+@pytest.mark.asyncio
+async def test_revoked_access_token_without_jti_is_rejected(
+    sqlite_session, rsa_keys, token_revocation_mock
+):
+    access_token = _legacy_access_token("user-id-1")
+    access_claims = jwt.decode(access_token, options={"verify_signature": False})
+    token_revocation_mock.is_revoked.return_value = True
+
+    response = await _get(_app(sqlite_session), access_token)
+
+    assert response.status_code == 401
+    token_revocation_mock.is_revoked.assert_awaited_once_with(
+        f"legacy:user-id-1:{access_claims['exp']}"
+    )
+
+
+@pytest.mark.asyncio
+async def test_own_password_change_reissues_tokens_at_the_new_generation(sqlite_session, rsa_keys):
+    user = User(email="voter@example.com", password_hash="hash", created_at=datetime(2025, 1, 1))
+    sqlite_session.add(user)
+    await sqlite_session.commit()
+    old_tokens = create_pair_tokens(subject=user.id, generation=0)
+    app = _app(sqlite_session)
+    app.include_router(user_router, prefix="/users")
+
+    transport = httpx.ASGITransport(app=app)
+    with patch("app.services.user.password_hasher.hash", new=AsyncMock(return_value="new-hash")):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            client.cookies.set("access_token", old_tokens["access_token"])
+            response = await client.put(f"/users/{user.id}", json={"password": "new-password"})
+            new_access_token = response.cookies["access_token"]
+
+    assert response.status_code == 200
+    assert jwt.decode(new_access_token, options={"verify_signature": False})["gen"] == 1
+    assert (await _get(app, old_tokens["access_token"])).status_code == 401
+    assert (await _get(app, new_access_token)).status_code == 200
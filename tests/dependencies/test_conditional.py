@@ -0,0 +1,31 @@
+from starlette.requests import Request
+
+from app.dependencies.conditional import etag_headers, not_modified
+
+
+def _request(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_matching_etag_returns_not_modified():
+    response = not_modified(_request('"1-2", W/"3-4"'), '"3-4"')
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == '"3-4"'
+    assert response.body == b""
+
+
+def test_wildcard_matches_any_etag():
+    assert not_modified(_request("*"), '"1"').status_code == 304
+
+
+def test_other_etag_or_missing_header_is_served():
+    assert not_modified(_request('"1"'), '"2"') is None
+    assert not_modified(_request(), '"2"') is None
+    assert not_modified(_request('"1"'), None) is None
+
+
+def test_etag_headers_skip_missing_etag():
+    assert etag_headers('"1"') == {"ETag": '"1"'}
+    assert etag_headers(None) == {}
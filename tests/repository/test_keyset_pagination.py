@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.user import User
+from app.repository.user_repository import UserRepository
+from app.utils.cursor import decode_cursor, encode_cursor
+
+
+async def _seed_users(session, created: list) -> None:
+    session.add_all(
+        [
+            User(
+                id=f"user-{index:02d}",
+                email=f"user-{index}@example.com",
+                password_hash="hash",
+                created_at=created_at,
+            )
+            for index, created_at in enumerate(created)
+        ]
+    )
+    await session.commit()
+
+
+async def _read_all(repository, page_size: int) -> list[list[str]]:
+    pages, after = [], None
+    while True:
+        users, has_more = await repository.read_keyset(after=after, limit=page_size)
+        pages.append([user.id for user in users])
+        if not has_more:
+            return pages
+        after = decode_cursor(encode_cursor(users[-1].created_at, users[-1].id))
+
+
+@pytest.mark.asyncio
+async def test_keyset_walks_rows_in_created_at_id_order(sqlite_session):
+    start = datetime(2025, 1, 1, 12, 0)
+    # Two rows share a timestamp and two have none, so ties and NULLs are paged by id.
+    await _seed_users(
+        sqlite_session,
+        [start + timedelta(minutes=2), start, None, start, None, start + timedelta(minutes=1)],
+    )
+
+    pages = await _read_all(UserRepository(sqlite_session), page_size=2)
+
+    assert pages == [
+        ["user-01", "user-03"],
+        ["user-05", "user-00"],
+        ["user-02", "user-04"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_keyset_is_stable_when_rows_are_inserted_between_pages(sqlite_session):
+    start = datetime(2025, 1, 1, 12, 0)
+    await _seed_users(sqlite_session, [start + timedelta(minutes=n) for n in range(4)])
+    repository = UserRepository(sqlite_session)
+
+    first_page, has_more = await repository.read_keyset(limit=2)
+    assert has_more
+
+    # A row older than the cursor must not shift the next page.
+    sqlite_session.add(User(id="user-early", email="early@example.com", password_hash="hash", created_at=start - timedelta(days=1)))
+    await sqlite_session.commit()
+
+    second_page, has_more = await repository.read_keyset(
+        after=(first_page[-1].created_at, first_page[-1].id), limit=2
+    )
+
+    assert [user.id for user in second_page] == ["user-02", "user-03"]
+    assert has_more is False
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -38,6 +38,7 @@ async def test_register_success(async_session_mock):
         id="user-id-1",
         email=register_data.email,
         password_hash="hashed",
+        token_generation=0,
     )
 
     tokens = {
@@ -106,7 +107,7 @@ async def test_login_success(async_session_mock):
     login_data = LoginRequest(email="test@example.com", password="password123")
 
     user_model = SimpleNamespace(
-        id="user-id-1", email=login_data.email, password_hash="hashed"
+        id="user-id-1", email=login_data.email, password_hash="hashed", token_generation=2
     )
     tokens = {
         "access_token": "access",
@@ -120,7 +121,7 @@ async def test_login_success(async_session_mock):
     ) as get_user_mock, patch(
         "app.services.auth.LoginAttemptRepository"
     ) as login_attempt_repo_cls, patch(
-        "app.services.auth.verify_password", return_value=True
+        "app.services.auth.password_hasher.verify", new=AsyncMock(return_value=True)
     ) as verify_password_mock, patch(
         "app.services.auth.create_pair_tokens", return_value=tokens
     ) as create_tokens_mock:
@@ -134,9 +135,9 @@ async def test_login_success(async_session_mock):
         )
 
         get_user_mock.assert_awaited_once()
-        verify_password_mock.assert_called_once()
+        verify_password_mock.assert_awaited_once()
         login_repo.create.assert_awaited()
-        create_tokens_mock.assert_called_once()
+        create_tokens_mock.assert_called_once_with(subject="user-id-1", generation=2)
 
         assert user_response.id == user_model.id
         assert token_response.access_token == tokens["access_token"]
@@ -177,7 +178,7 @@ async def test_login_invalid_password(async_session_mock):
     ), patch(
         "app.services.auth.LoginAttemptRepository"
     ) as login_attempt_repo_cls, patch(
-        "app.services.auth.verify_password", return_value=False
+        "app.services.auth.password_hasher.verify", new=AsyncMock(return_value=False)
     ) as verify_password_mock:
         login_repo = AsyncMock()
         login_attempt_repo_cls.return_value = login_repo
@@ -187,7 +188,7 @@ async def test_login_invalid_password(async_session_mock):
         with pytest.raises(InvalidCredentialsError):
             await AuthService.login(request, async_session_mock, login_data)
 
-        verify_password_mock.assert_called_once()
+        verify_password_mock.assert_awaited_once()
         login_repo.create.assert_awaited_once()
 
 
@@ -199,15 +200,15 @@ async def test_refresh_token_success(async_session_mock):
         "refresh_token": "new-refresh",
         "token_type": "bearer",
     }
-    user_model = SimpleNamespace(id="user-id-1")
+    user_model = SimpleNamespace(id="user-id-1", token_generation=3)
 
     with patch(
         "app.services.auth.is_token_blacklisted",
         new=AsyncMock(return_value=False),
     ) as blacklist_check_mock, patch(
-        "app.services.auth.get_token_subject", return_value="user-id-1"
-    ) as get_subject_mock, patch(
-        "app.services.auth.UserService.get_user_by_id",
+        "app.services.auth.get_token_claims", return_value={"sub": "user-id-1", "gen": 3}
+    ) as get_claims_mock, patch(
+        "app.services.auth.UserService.get_principal",
         new=AsyncMock(return_value=user_model),
     ) as get_user_mock, patch(
         "app.services.auth.blacklist_token",
@@ -218,10 +219,10 @@ async def test_refresh_token_success(async_session_mock):
         result = await AuthService.refresh_token(async_session_mock, refresh_token)
 
         blacklist_check_mock.assert_awaited_once()
-        get_subject_mock.assert_called_once_with(refresh_token)
+        get_claims_mock.assert_called_once_with(refresh_token)
         get_user_mock.assert_awaited_once()
         blacklist_token_mock.assert_awaited_once_with(refresh_token)
-        create_tokens_mock.assert_called_once()
+        create_tokens_mock.assert_called_once_with(subject="user-id-1", generation=3)
 
         assert result.access_token == tokens["access_token"]
 
@@ -238,6 +239,25 @@ async def test_refresh_token_blacklisted(async_session_mock):
             await AuthService.refresh_token(async_session_mock, refresh_token)
 
 
+@pytest.mark.asyncio
+async def test_refresh_token_of_revoked_generation(async_session_mock):
+    with patch(
+        "app.services.auth.is_token_blacklisted",
+        new=AsyncMock(return_value=False),
+    ), patch(
+        "app.services.auth.get_token_claims", return_value={"sub": "user-id-1", "gen": 1}
+    ), patch(
+        "app.services.auth.UserService.get_principal",
+        new=AsyncMock(return_value=SimpleNamespace(id="user-id-1", token_generation=2)),
+    ), patch(
+        "app.services.auth.create_pair_tokens"
+    ) as create_tokens_mock:
+        with pytest.raises(InvalidCredentialsError):
+            await AuthService.refresh_token(async_session_mock, "stale-refresh")
+
+        create_tokens_mock.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_logout_clears_tokens(async_session_mock):
     access_token = "access-token"
@@ -0,0 +1,107 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.settings import settings
+from app.models.election import Election
+from app.schemas.pagination import TotalKind, TotalMode
+from app.services.counts import CountService
+
+
+async def _seed_elections(session, count: int) -> None:
+    now = datetime(2025, 1, 1)
+    session.add_all(
+        [
+            Election(
+                title=f"Election {index}",
+                start_date=now,
+                end_date=now,
+                is_public=index % 2 == 0,
+                owner_id="user-id-1",
+                created_at=now,
+            )
+            for index in range(count)
+        ]
+    )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_exact_total_is_counted_below_the_limit(sqlite_session, monkeypatch):
+    await _seed_elections(sqlite_session, 5)
+    monkeypatch.setattr(settings.count_settings, "COUNT_EXACT_LIMIT", 10)
+
+    total = await CountService.total(
+        sqlite_session, Election, TotalMode.EXACT, Election.is_public == True  # noqa: E712
+    )
+
+    assert (total.value, total.kind) == (3, TotalKind.EXACT)
+
+
+@pytest.mark.asyncio
+async def test_exact_total_stops_at_the_limit(sqlite_session, monkeypatch):
+    await _seed_elections(sqlite_session, 5)
+    monkeypatch.setattr(settings.count_settings, "COUNT_EXACT_LIMIT", 2)
+
+    filtered = await CountService.total(
+        sqlite_session, Election, TotalMode.EXACT, Election.is_public == True  # noqa: E712
+    )
+    with patch.object(CountService, "get_counter", AsyncMock(return_value=41)):
+        unfiltered = await CountService.total(sqlite_session, Election, TotalMode.EXACT)
+
+    assert (filtered.value, filtered.kind) == (3, TotalKind.AT_LEAST)
+    assert (unfiltered.value, unfiltered.kind) == (41, TotalKind.COUNTER)
+
+
+@pytest.mark.asyncio
+async def test_estimated_total_needs_no_count(async_session_mock):
+    with patch.object(CountService, "get_counter", AsyncMock(return_value=None)), patch(
+        "app.services.counts.BaseRepository.estimate_count", AsyncMock(return_value=1200)
+    ), patch("app.services.counts.BaseRepository.count", AsyncMock()) as count_mock:
+        total = await CountService.total(async_session_mock, Election, TotalMode.ESTIMATE)
+        filtered = await CountService.total(
+            async_session_mock, Election, TotalMode.ESTIMATE, Election.is_public == True  # noqa: E712
+        )
+
+    assert (total.value, total.kind) == (1200, TotalKind.ESTIMATE)
+    assert filtered is None
+    count_mock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_adds_changes_made_while_counting(sqlite_session):
+    await _seed_elections(sqlite_session, 4)
+    script_mock = AsyncMock(return_value=["6", "5"])
+
+    with patch("app.services.counts.redis_client") as redis_mock, patch(
+        "app.services.counts._reset_count_script", script_mock
+    ):
+        redis_mock.get = AsyncMock(return_value="17")
+        fixed = await CountService.reconcile(sqlite_session, Election)
+
+    assert fixed is True
+    assert script_mock.await_args.kwargs["keys"] == ["count:elections", "count:elections:changes"]
+    assert script_mock.await_args.kwargs["args"] == [4, "17"]
+
+
+@pytest.mark.asyncio
+async def test_reconcile_uses_the_estimate_past_the_limit(sqlite_session, monkeypatch):
+    await _seed_elections(sqlite_session, 5)
+    monkeypatch.setattr(settings.count_settings, "COUNT_EXACT_LIMIT", 2)
+    script_mock = AsyncMock(return_value=["1000", "500"])
+
+    with patch("app.services.counts.redis_client") as redis_mock, patch(
+        "app.services.counts._reset_count_script", script_mock
+    ), patch(
+        "app.services.counts.BaseRepository.estimate_count", AsyncMock(return_value=1000)
+    ), patch.object(CountService, "get_counter", AsyncMock(side_effect=[1050, 500])):
+        redis_mock.get = AsyncMock(return_value="0")
+        close = await CountService.reconcile(sqlite_session, Election)
+        drifted = await CountService.reconcile(sqlite_session, Election)
+
+    assert close is False
+    assert drifted is True
+    assert script_mock.await_count == 1
+    assert script_mock.await_args.kwargs["args"] == [1000, "0"]
+    assert "LIMIT" in sqlite_session.info["statements"][-1].upper()
@@ -0,0 +1,72 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.election_cache import ElectionCacheService
+
+
+def _redis_mock(cached=None) -> MagicMock:
+    redis_mock = MagicMock()
+    redis_mock.get = AsyncMock(return_value=cached)
+    return redis_mock
+
+
+@pytest.mark.asyncio
+async def test_get_returns_document_far_from_expiry():
+    cached = f"{time.time() + 300}:0.01:" + '{"id": "election-id-1", "title": "a:b"}'
+
+    with patch("app.services.election_cache.redis_client", _redis_mock(cached)):
+        document = await ElectionCacheService.get("election-id-1")
+
+    assert document == '{"id": "election-id-1", "title": "a:b"}'
+
+
+@pytest.mark.asyncio
+async def test_get_refreshes_early_close_to_expiry():
+    cached = f"{time.time() + 1}:0.5:" + '{"id": "election-id-1"}'
+
+    # random() close to 1 makes the early refresh window as wide as it gets.
+    with patch("app.services.election_cache.redis_client", _redis_mock(cached)), patch(
+        "app.services.election_cache.random.random", return_value=0.999
+    ):
+        document = await ElectionCacheService.get("election-id-1")
+
+    assert document is None
+
+
+@pytest.mark.asyncio
+async def test_get_treats_redis_errors_as_miss():
+    redis_mock = _redis_mock()
+    redis_mock.get.side_effect = ConnectionError("redis down")
+
+    with patch("app.services.election_cache.redis_client", redis_mock):
+        assert await ElectionCacheService.get("election-id-1") is None
+
+
+@pytest.mark.asyncio
+async def test_store_is_guarded_by_version():
+    script_mock = AsyncMock(return_value=0)
+
+    with patch("app.services.election_cache._store_document_script", script_mock):
+        stored = await ElectionCacheService.store("election-id-1", "2", "{}", 0.02)
+
+    assert stored is False
+    kwargs = script_mock.await_args.kwargs
+    assert kwargs["keys"] == ["election:doc:election-id-1", "election:version:election-id-1"]
+    assert kwargs["args"][0] == "2"
+    assert kwargs["args"][1].endswith(":0.02:{}")
+
+
+@pytest.mark.asyncio
+async def test_invalidate_bumps_version_and_drops_document():
+    redis_mock = _redis_mock()
+    redis_mock.delete = AsyncMock()
+
+    with patch("app.services.election_cache.redis_client", redis_mock), patch(
+        "app.services.election_cache.VersionService.bump", new=AsyncMock()
+    ) as bump_mock:
+        await ElectionCacheService.invalidate("election-id-1")
+
+    bump_mock.assert_awaited_once_with("election:version:election-id-1")
+    redis_mock.delete.assert_awaited_once_with("election:doc:election-id-1")
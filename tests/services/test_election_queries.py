@@ -0,0 +1,193 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.attachment import Attachment
+from app.models.candidates import Candidate
+from app.models.election import Election
+from app.models.election_setting import ElectionSetting
+from app.repository.election_repository import ElectionRepository
+from app.schemas.attachment import AttachmentCreate
+from app.schemas.candidate import CandidateCreate
+from app.schemas.election import ElectionCreate, ElectionFilter, ElectionStatus, ElectionUpdate
+from app.services.election import ElectionService
+
+
+async def _seed_elections(session, count: int) -> list[str]:
+    now = datetime(2025, 1, 1, 12, 0)
+    election_ids = []
+
+    for index in range(count):
+        election = Election(
+            title=f"Election {index}",
+            description=None,
+            start_date=now,
+            end_date=now,
+            is_public=True,
+            created_at=now,
+            owner_id="user-id-1",
+        )
+        session.add(election)
+        await session.flush()
+
+        session.add(ElectionSetting(election_id=election.id, allow_revoting=True, max_votes=1, require_auth=True))
+        session.add_all(
+            [
+                Candidate(election_id=election.id, name=f"Candidate {index}-{n}")
+                for n in range(3)
+            ]
+        )
+        session.add(Attachment(election_id=election.id, file_url=f"http://file-{index}.pdf", uploaded_at=now))
+        election_ids.append(election.id)
+
+    await session.commit()
+    session.expunge_all()
+    return election_ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_size", [1, 10, 50])
+async def test_election_list_query_count_does_not_grow_with_page_size(sqlite_session, page_size):
+    await _seed_elections(sqlite_session, page_size + 1)
+    statements = sqlite_session.info["statements"]
+    statements.clear()
+
+    elections, next_cursor = await ElectionService.get_all_elections(sqlite_session, page_size=page_size)
+
+    assert len(elections) == page_size
+    assert next_cursor is not None
+    assert all(len(election.candidates) == 3 for election in elections)
+    assert all(election.settings is not None for election in elections)
+    assert all(len(election.attachments) == 1 for election in elections)
+    # One query for the page, one per eager-loaded relationship.
+    assert len(statements) == 4
+
+
+@pytest.mark.asyncio
+async def test_election_detail_loads_aggregate_in_constant_queries(sqlite_session):
+    election_ids = await _seed_elections(sqlite_session, 2)
+    statements = sqlite_session.info["statements"]
+    statements.clear()
+
+    election = await ElectionService.get_election_by_id(sqlite_session, election_ids[0])
+
+    assert election.id == election_ids[0]
+    assert len(election.candidates) == 3
+    assert election.settings is not None
+    assert len(election.attachments) == 1
+    assert len(statements) == 4
+
+
+async def _seed_windows(session) -> None:
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    windows = {
+        "upcoming-public": (now + timedelta(days=1), now + timedelta(days=2), True, "owner-1"),
+        "active-public": (now - timedelta(days=1), now + timedelta(days=1), True, "owner-1"),
+        "active-private": (now - timedelta(days=1), now + timedelta(days=1), False, "owner-2"),
+        "finished-public": (now - timedelta(days=3), now - timedelta(days=2), True, "owner-2"),
+    }
+    for index, (title, (start, end, is_public, owner_id)) in enumerate(windows.items()):
+        session.add(
+            Election(
+                title=title,
+                start_date=start,
+                end_date=end,
+                is_public=is_public,
+                owner_id=owner_id,
+                created_at=now + timedelta(seconds=index),
+            )
+        )
+    await session.commit()
+    session.expunge_all()
+
+
+async def _titles(session, **filters) -> list[str]:
+    elections, _ = await ElectionService.get_all_elections(
+        session, page_size=10, filters=ElectionFilter(**filters)
+    )
+    return [election.title for election in elections]
+
+
+@pytest.mark.asyncio
+async def test_election_list_filters(sqlite_session):
+    await _seed_windows(sqlite_session)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    assert await _titles(sqlite_session, status=ElectionStatus.ACTIVE, is_public=True) == ["active-public"]
+    assert await _titles(sqlite_session, status=ElectionStatus.UPCOMING) == ["upcoming-public"]
+    assert await _titles(sqlite_session, status=ElectionStatus.FINISHED) == ["finished-public"]
+    assert await _titles(sqlite_session, is_public=False) == ["active-private"]
+    assert await _titles(sqlite_session, owner_id="owner-2") == ["active-private", "finished-public"]
+    assert await _titles(
+        sqlite_session, date_from=now - timedelta(days=4), date_to=now - timedelta(days=2, hours=12)
+    ) == ["finished-public"]
+    assert len(await _titles(sqlite_session)) == 4
+
+
+def _writes(statements: list[str]) -> list[str]:
+    return [
+        statement.split()[0]
+        for statement in statements
+        if statement.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_election_writes_each_table_once(sqlite_session):
+    now = datetime(2025, 1, 1, 12, 0)
+    statements = sqlite_session.info["statements"]
+    election_data = ElectionCreate(
+        title="Big election",
+        start_date=now,
+        end_date=now,
+        candidates=[CandidateCreate(name=f"Candidate {n}") for n in range(50)],
+        attachments=[AttachmentCreate(file_url=f"http://file-{n}.pdf") for n in range(5)],
+    )
+
+    election = await ElectionService.create_election(
+        sqlite_session, election_data, SimpleNamespace(id="user-id-1")
+    )
+
+    assert len(election.candidates) == 50
+    assert len(election.attachments) == 5
+    assert election.settings is not None
+    assert _writes(statements) == ["INSERT"] * 4
+
+
+@pytest.mark.asyncio
+async def test_update_election_replaces_children_in_bulk(sqlite_session):
+    (election_id,) = await _seed_elections(sqlite_session, 1)
+    statements = sqlite_session.info["statements"]
+    statements.clear()
+
+    election = await ElectionService.update_election(
+        sqlite_session,
+        election_id,
+        ElectionUpdate(
+            title="Renamed",
+            candidates=[CandidateCreate(name=f"New {n}") for n in range(50)],
+            attachments=[],
+        ),
+    )
+
+    assert election.title == "Renamed"
+    assert [candidate.name for candidate in election.candidates] == [f"New {n}" for n in range(50)]
+    assert election.attachments == []
+    assert _writes(statements) == ["UPDATE", "DELETE", "INSERT", "DELETE"]
+
+
+@pytest.mark.asyncio
+async def test_failed_election_update_leaves_nothing_behind(sqlite_session):
+    (election_id,) = await _seed_elections(sqlite_session, 1)
+
+    with pytest.raises(ValueError):
+        await ElectionRepository(sqlite_session).update_aggregate(
+            election_id,
+            {"title": "Renamed"},
+            candidates=[{"name": None, "description": None}],
+        )
+
+    election = await ElectionService.get_election_by_id(sqlite_session, election_id)
+    assert election.title == "Election 0"
+    assert len(election.candidates) == 3
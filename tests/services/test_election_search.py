@@ -0,0 +1,58 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.exceptions.user import ValidationError
+from app.services.election import ElectionService
+from app.utils.cursor import decode_rank_cursor
+from app.utils.search import build_prefix_tsquery
+
+
+def test_build_prefix_tsquery():
+    assert build_prefix_tsquery("Pres  Elec") == "pres:* & elec:*"
+    assert build_prefix_tsquery("a & b | !c:*") == "a:* & b:* & c:*"
+    assert build_prefix_tsquery("vote vote") == "vote:*"
+    assert build_prefix_tsquery(" '&|! ") is None
+
+
+def _election(election_id: str) -> SimpleNamespace:
+    now = datetime(2025, 1, 1)
+    return SimpleNamespace(
+        id=election_id,
+        title=election_id,
+        description=None,
+        start_date=now,
+        end_date=now,
+        is_public=True,
+        owner_id="user-id-1",
+        created_at=now,
+        candidates=[],
+        settings=None,
+        attachments=[],
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_elections_keeps_rank_order(async_session_mock):
+    with patch("app.services.election.ElectionRepository") as election_repo_cls:
+        election_repo = AsyncMock()
+        election_repo.search.return_value = ([("e2", 0.6), ("e1", 0.3), ("e3", 0.3)], True)
+        # e3 was deleted between the ranked read and the aggregate read.
+        election_repo.read_many.return_value = [_election("e1"), _election("e2")]
+        election_repo_cls.return_value = election_repo
+
+        elections, next_cursor = await ElectionService.search_elections(
+            async_session_mock, query="Pres", page_size=3
+        )
+
+    election_repo.search.assert_awaited_once_with("pres:*", after=None, limit=3)
+    assert [election.id for election in elections] == ["e2", "e1"]
+    assert decode_rank_cursor(next_cursor) == (0.3, "e3")
+
+
+@pytest.mark.asyncio
+async def test_search_elections_rejects_query_without_words(async_session_mock):
+    with pytest.raises(ValidationError):
+        await ElectionService.search_elections(async_session_mock, query="!!")
@@ -46,61 +46,42 @@ async def test_create_election_success(async_session_mock):
         owner_id="user-id-1",
     )
 
-    with patch(
-        "app.services.election.ElectionRepository"
-    ) as election_repo_cls, patch(
-        "app.services.election.ElectionSettingRepository"
-    ) as setting_repo_cls, patch(
-        "app.services.election.CandidateRepository"
-    ) as candidate_repo_cls, patch(
-        "app.services.election.AttachmentRepository"
-    ) as attachment_repo_cls:
+    with patch("app.services.election.ElectionRepository") as election_repo_cls:
         election_repo = AsyncMock()
-        election_repo.create.return_value = created_election
-        election_repo_cls.return_value = election_repo
-
-        setting_repo = AsyncMock()
-        setting_repo.create.return_value = None
-        setting_repo.read_one.return_value = SimpleNamespace(
-            id="setting-id-1",
-            election_id=created_election.id,
-            allow_revoting=True,
-            max_votes=1,
-            require_auth=True,
-        )
-        setting_repo_cls.return_value = setting_repo
-
-        candidate_repo = AsyncMock()
-        candidate_repo.create.return_value = None
-        candidate_repo.read_many.return_value = [
-            SimpleNamespace(
-                id="cand-1",
+        election_repo.create_aggregate.return_value = created_election
+        election_repo.read_one.return_value = SimpleNamespace(
+            **vars(created_election),
+            settings=SimpleNamespace(
+                id="setting-id-1",
                 election_id=created_election.id,
-                name="A",
-                description=None,
+                allow_revoting=True,
+                max_votes=1,
+                require_auth=True,
             ),
-            SimpleNamespace(
-                id="cand-2",
-                election_id=created_election.id,
-                name="B",
-                description=None,
-            ),
-        ]
-        candidate_repo_cls.return_value = candidate_repo
-
-        attachment_repo = AsyncMock()
-        attachment_repo.create.return_value = None
-        attachment_repo.read_many.return_value = [
-            SimpleNamespace(
-                id="att-1",
-                election_id=created_election.id,
-                file_url="http://file.pdf",
-                uploaded_at=now,
-            )
-        ]
-        attachment_repo_cls.return_value = attachment_repo
-
-        async_session_mock.refresh = AsyncMock()
+            candidates=[
+                SimpleNamespace(
+                    id="cand-1",
+                    election_id=created_election.id,
+                    name="A",
+                    description=None,
+                ),
+                SimpleNamespace(
+                    id="cand-2",
+                    election_id=created_election.id,
+                    name="B",
+                    description=None,
+                ),
+            ],
+            attachments=[
+                SimpleNamespace(
+                    id="att-1",
+                    election_id=created_election.id,
+                    file_url="http://file.pdf",
+                    uploaded_at=now,
+                )
+            ],
+        )
+        election_repo_cls.return_value = election_repo
 
         current_user = SimpleNamespace(id="user-id-1")
 
@@ -114,6 +95,12 @@ async def test_create_election_success(async_session_mock):
         assert len(result.candidates) == 2
         assert result.settings is not None
         assert len(result.attachments) == 1
+        election_repo.create_aggregate.assert_awaited_once()
+        _, setting, candidates, attachments = election_repo.create_aggregate.await_args.args
+        assert setting == {"allow_revoting": True, "max_votes": 1, "require_auth": True}
+        assert [candidate["name"] for candidate in candidates] == ["A", "B"]
+        assert [attachment["file_url"] for attachment in attachments] == ["http://file.pdf"]
+        assert "options" in election_repo.read_one.await_args.kwargs
 
 
 @pytest.mark.asyncio
@@ -188,8 +175,11 @@ async def test_update_election_not_enough_candidates(async_session_mock):
 
 
 @pytest.mark.asyncio
-async def test_delete_election_success(async_session_mock):
-    with patch("app.services.election.ElectionRepository") as election_repo_cls:
+async def test_delete_election_success(async_session_mock, election_cache_mock, version_bump_mock):
+    with patch("app.services.election.ElectionRepository") as election_repo_cls, patch(
+        "app.services.election.TallyService"
+    ) as tally_service_cls:
+        tally_service_cls.discard = AsyncMock()
         election_repo = AsyncMock()
         election_repo.delete.return_value = True
         election_repo_cls.return_value = election_repo
@@ -200,6 +190,10 @@ async def test_delete_election_success(async_session_mock):
 
         assert result is True
         election_repo.delete.assert_awaited_once()
+        election_cache_mock.invalidate.assert_awaited_once_with("election-id-1")
+        version_bump_mock.assert_any_await("elections:version")
+        version_bump_mock.assert_any_await("results:version:election-id-1")
+        tally_service_cls.discard.assert_awaited_once_with("election-id-1")
 
 
 @pytest.mark.asyncio
@@ -215,3 +209,56 @@ async def test_delete_election_not_found(async_session_mock):
             )
 
 
+@pytest.mark.asyncio
+async def test_get_election_json_serves_cached_document(async_session_mock, election_cache_mock):
+    election_cache_mock.get.return_value = '{"id": "election-id-1"}'
+
+    with patch("app.services.election.ElectionRepository") as election_repo_cls:
+        result = await ElectionService.get_election_json(async_session_mock, "election-id-1")
+
+        assert result == '{"id": "election-id-1"}'
+        election_repo_cls.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_election_json_builds_and_stores_on_miss(async_session_mock, election_cache_mock):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    election_cache_mock.get_version.return_value = "3"
+
+    with patch("app.services.election.ElectionRepository") as election_repo_cls:
+        election_repo = AsyncMock()
+        election_repo.read_one.return_value = SimpleNamespace(
+            id="election-id-1",
+            title="Test election",
+            description=None,
+            start_date=now,
+            end_date=now,
+            is_public=True,
+            owner_id="user-id-1",
+            created_at=now,
+            candidates=[],
+            settings=None,
+            attachments=[],
+        )
+        election_repo_cls.return_value = election_repo
+
+        result = await ElectionService.get_election_json(async_session_mock, "election-id-1")
+
+        assert '"id":"election-id-1"' in result
+        election_id, version, document, _ = election_cache_mock.store.await_args.args
+        assert (election_id, version, document) == ("election-id-1", "3", result)
+
+
+@pytest.mark.asyncio
+async def test_get_election_json_missing_election_is_not_cached(async_session_mock, election_cache_mock):
+    with patch("app.services.election.ElectionRepository") as election_repo_cls:
+        election_repo = AsyncMock()
+        election_repo.read_one.return_value = None
+        election_repo_cls.return_value = election_repo
+
+        result = await ElectionService.get_election_json(async_session_mock, "missing-id")
+
+        assert result is None
+        election_cache_mock.store.assert_not_awaited()
+
+
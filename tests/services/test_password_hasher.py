@@ -0,0 +1,41 @@
+import pytest
+
+from app.core.settings import settings
+from app.exceptions.user import ServiceBusyError
+from app.services.password_hasher import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_in_pool(monkeypatch):
+    monkeypatch.setattr(settings.password_hash_settings, "PASSWORD_HASH_WORKERS", 1)
+    hasher = PasswordHasher()
+    await hasher.start()
+
+    try:
+        password_hash = await hasher.hash("secret-password")
+        assert await hasher.verify("secret-password", password_hash) is True
+        assert await hasher.verify("wrong-password", password_hash) is False
+    finally:
+        await hasher.stop()
+
+    metrics = hasher.metrics()
+    assert metrics["running"] is False
+    assert metrics["submitted_total"] == 3
+    assert metrics["in_flight"] == 0
+    assert metrics["avg_run_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_calls_beyond_the_queue_limit_are_rejected(monkeypatch):
+    monkeypatch.setattr(settings.password_hash_settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(settings.password_hash_settings, "PASSWORD_HASH_MAX_PENDING", 2)
+    hasher = PasswordHasher()
+    hasher._in_flight = 3
+
+    with pytest.raises(ServiceBusyError) as exc_info:
+        await hasher.hash("secret-password")
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "1"
+    assert hasher.metrics()["rejected_total"] == 1
+    assert hasher.metrics()["submitted_total"] == 0
@@ -0,0 +1,142 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.settings import settings
+from app.schemas.user import Principal
+from app.services.principal_cache import INVALIDATION_CHANNEL, PrincipalCache
+
+
+def _principal(user_id: str) -> Principal:
+    return Principal(id=user_id, email=f"{user_id}@example.com", first_name="User")
+
+
+def _pubsub_mock(messages: list) -> MagicMock:
+    async def get_message(**kwargs):
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(0.01)
+        return None
+
+    pubsub_mock = MagicMock()
+    pubsub_mock.subscribe = AsyncMock()
+    pubsub_mock.aclose = AsyncMock()
+    pubsub_mock.get_message = get_message
+    return pubsub_mock
+
+
+def _redis_mock(cached=None, pubsub=None) -> MagicMock:
+    redis_mock = MagicMock()
+    redis_mock.get = AsyncMock(return_value=cached)
+    redis_mock.delete = AsyncMock()
+    redis_mock.publish = AsyncMock()
+    redis_mock.pubsub.return_value = pubsub or _pubsub_mock([])
+    return redis_mock
+
+
+@pytest.mark.asyncio
+async def test_local_tier_evicts_least_recently_used_and_expires(monkeypatch):
+    monkeypatch.setattr(settings.principal_cache_settings, "PRINCIPAL_CACHE_SIZE", 2)
+    redis_mock = _redis_mock()
+    cache = PrincipalCache()
+
+    with patch("app.services.principal_cache.redis_client", redis_mock), patch(
+        "app.services.principal_cache._store_principal_script", AsyncMock(return_value=1)
+    ):
+        await cache.start()
+        try:
+            for user_id in ("user-1", "user-2"):
+                await cache.store(_principal(user_id), "0")
+            assert (await cache.get("user-1")).id == "user-1"
+
+            await cache.store(_principal("user-3"), "0")
+            assert await cache.get("user-2") is None
+            assert (await cache.get("user-3")).id == "user-3"
+
+            with patch("app.services.principal_cache.time.monotonic", return_value=float("inf")):
+                assert await cache.get("user-1") is None
+        finally:
+            await cache.stop()
+
+    assert cache.local_hits_total == 2
+    assert cache.misses_total == 2
+
+
+@pytest.mark.asyncio
+async def test_get_falls_back_to_redis():
+    redis_mock = _redis_mock(_principal("user-1").model_dump_json())
+
+    with patch("app.services.principal_cache.redis_client", redis_mock):
+        principal = await PrincipalCache().get("user-1")
+
+    assert principal == _principal("user-1")
+    redis_mock.get.assert_awaited_once_with("principal:user-1")
+
+
+@pytest.mark.asyncio
+async def test_get_treats_redis_errors_as_miss():
+    redis_mock = _redis_mock()
+    redis_mock.get.side_effect = ConnectionError("redis down")
+
+    with patch("app.services.principal_cache.redis_client", redis_mock):
+        assert await PrincipalCache().get("user-1") is None
+
+
+@pytest.mark.asyncio
+async def test_store_is_guarded_by_version():
+    script_mock = AsyncMock(return_value=0)
+
+    with patch("app.services.principal_cache._store_principal_script", script_mock):
+        stored = await PrincipalCache().store(_principal("user-1"), "41")
+
+    assert stored is False
+    assert script_mock.await_args.kwargs["keys"] == [
+        "principal:user-1",
+        "principal:version:user-1",
+    ]
+    assert script_mock.await_args.kwargs["args"][0] == "41"
+
+
+@pytest.mark.asyncio
+async def test_invalidate_reaches_redis_and_other_workers():
+    redis_mock = _redis_mock()
+    version_bump = AsyncMock()
+
+    with patch("app.services.principal_cache.redis_client", redis_mock), patch(
+        "app.services.principal_cache.VersionService.bump", version_bump
+    ):
+        await PrincipalCache().invalidate("user-1")
+
+    version_bump.assert_awaited_once_with("principal:version:user-1")
+    redis_mock.delete.assert_awaited_once_with("principal:user-1")
+    redis_mock.publish.assert_awaited_once_with(INVALIDATION_CHANNEL, "user-1")
+
+
+@pytest.mark.asyncio
+async def test_published_invalidations_drop_local_entries():
+    messages = []
+    pubsub_mock = _pubsub_mock(messages)
+    redis_mock = _redis_mock(pubsub=pubsub_mock)
+    cache = PrincipalCache()
+
+    with patch("app.services.principal_cache.redis_client", redis_mock), patch(
+        "app.services.principal_cache._store_principal_script", AsyncMock(return_value=1)
+    ):
+        await cache.start()
+        try:
+            await cache.store(_principal("user-1"), "0")
+            assert cache.metrics()["local_entries"] == 1
+
+            messages.append({"type": "message", "data": "user-1"})
+            for _ in range(50):
+                if cache.invalidations_received_total:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert cache.metrics()["local_entries"] == 0
+        finally:
+            await cache.stop()
+
+    assert cache.invalidations_received_total == 1
+    pubsub_mock.subscribe.assert_awaited_once_with(INVALIDATION_CHANNEL)
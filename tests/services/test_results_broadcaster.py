@@ -0,0 +1,163 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.schemas.vote import VoteChange, VoteTallyResponse
+from app.services.results_broadcaster import ResultsBroadcaster
+
+
+def _change(vote_id: str, previous: str = None, candidate: str = None) -> VoteChange:
+    return VoteChange(
+        vote_id=vote_id,
+        election_id="election-id-1",
+        voter_id="user-id-1",
+        previous_candidate_id=previous,
+        candidate_id=candidate,
+    )
+
+
+def _redis_mock() -> MagicMock:
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    pipeline_cm = MagicMock()
+    pipeline_cm.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline_cm.__aexit__ = AsyncMock(return_value=False)
+
+    redis_mock = MagicMock()
+    redis_mock.pipeline.return_value = pipeline_cm
+    redis_mock.pipe = pipe
+    return redis_mock
+
+
+def _message(from_seq: int, seq: int, deltas: dict) -> str:
+    return json.dumps({"from_seq": from_seq, "seq": seq, "deltas": deltas})
+
+
+def _snapshot(seq: int, candidates: dict) -> VoteTallyResponse:
+    return VoteTallyResponse(
+        election_id="election-id-1",
+        total=sum(candidates.values()),
+        candidates=candidates,
+        seq=seq,
+    )
+
+
+def _payload(event: str) -> dict:
+    return json.loads(event.split("data: ", 1)[1])
+
+
+@pytest.mark.asyncio
+async def test_changes_in_one_tick_are_published_once_per_election():
+    broadcaster = ResultsBroadcaster()
+    broadcaster._tasks = [MagicMock()]
+    redis_mock = _redis_mock()
+
+    broadcaster.record([_change("vote-id-1", candidate="candidate-id-1")], [4])
+    broadcaster.record([_change("vote-id-2", candidate="candidate-id-1")], [6])
+    broadcaster.record(
+        [
+            _change("vote-id-1", previous="candidate-id-1", candidate="candidate-id-2"),
+            _change("vote-id-3", candidate="candidate-id-3"),
+        ],
+        [7, 0],
+    )
+
+    with patch("app.services.results_broadcaster.redis_client", redis_mock):
+        await broadcaster._publish_pending()
+        await broadcaster._publish_pending()
+
+    redis_mock.pipe.publish.assert_called_once()
+    channel, data = redis_mock.pipe.publish.call_args.args
+    assert channel == "results:election-id-1"
+    assert json.loads(data) == {
+        "from_seq": 4,
+        "seq": 7,
+        "deltas": {"candidate-id-1": 1, "candidate-id-2": 1, "_total": 2},
+    }
+
+
+@pytest.mark.asyncio
+async def test_messages_fan_out_and_coalesce_per_subscriber():
+    broadcaster = ResultsBroadcaster()
+    first = await broadcaster.subscribe("election-id-1")
+    second = await broadcaster.subscribe("election-id-1")
+    first.set_snapshot(0)
+    second.set_snapshot(0)
+
+    broadcaster._dispatch("results:election-id-1", _message(1, 1, {"candidate-id-1": 1, "_total": 1}))
+    assert first.drain() == (1, {"candidate-id-1": 1, "_total": 1})
+
+    broadcaster._dispatch("results:election-id-1", _message(2, 3, {"candidate-id-1": -1, "candidate-id-2": 1}))
+    assert second.drain() == (3, {"candidate-id-2": 1, "_total": 1})
+    assert first.drain() == (3, {"candidate-id-1": -1, "candidate-id-2": 1})
+    assert not first.ready.is_set()
+
+
+@pytest.mark.asyncio
+async def test_messages_are_held_until_the_snapshot_and_filtered_by_its_seq():
+    broadcaster = ResultsBroadcaster()
+    subscription = await broadcaster.subscribe("election-id-1")
+
+    broadcaster._dispatch("results:election-id-1", _message(1, 4, {"candidate-id-1": 2}))
+    broadcaster._dispatch("results:election-id-1", _message(6, 6, {"candidate-id-2": 1}))
+    assert not subscription.ready.is_set()
+
+    subscription.set_snapshot(5)
+    assert subscription.drain() == (6, {"candidate-id-2": 1})
+
+    broadcaster._dispatch("results:election-id-1", _message(5, 8, {"candidate-id-1": 1}))
+    assert subscription.stale is True
+
+
+@pytest.mark.asyncio
+async def test_events_subscribe_before_the_snapshot_then_send_deltas():
+    broadcaster = ResultsBroadcaster()
+    snapshots = [_snapshot(2, {"candidate-id-1": 2}), _snapshot(5, {"candidate-id-1": 4})]
+
+    async def load_snapshot():
+        assert broadcaster.metrics()["subscribers"] == 1
+        return snapshots.pop(0)
+
+    events = broadcaster.events("election-id-1", load_snapshot)
+    first_event = await anext(events)
+    assert first_event.startswith("event: snapshot\n")
+    assert _payload(first_event)["seq"] == 2
+
+    broadcaster._dispatch("results:election-id-1", _message(2, 2, {"candidate-id-1": 1}))
+    broadcaster._dispatch("results:election-id-1", _message(3, 3, {"candidate-id-2": 1, "_total": 1}))
+    delta_event = await asyncio.wait_for(anext(events), timeout=1)
+
+    assert delta_event.startswith("event: delta\n")
+    assert _payload(delta_event) == {
+        "election_id": "election-id-1",
+        "seq": 3,
+        "total": 1,
+        "candidates": {"candidate-id-2": 1},
+    }
+
+    broadcaster._dispatch("results:election-id-1", _message(1, 4, {"candidate-id-1": 2}))
+    resync_event = await asyncio.wait_for(anext(events), timeout=1)
+    assert resync_event.startswith("event: snapshot\n")
+    assert _payload(resync_event)["seq"] == 5
+
+    await events.aclose()
+    assert broadcaster.metrics()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_subscribe_waits_for_the_channel_confirmation():
+    broadcaster = ResultsBroadcaster()
+    broadcaster._pubsub = MagicMock()
+    broadcaster._pubsub.subscribe = AsyncMock()
+
+    subscribing = asyncio.create_task(broadcaster.subscribe("election-id-1"))
+    await asyncio.sleep(0.01)
+    assert not subscribing.done()
+
+    broadcaster._confirm("results:election-id-1")
+    subscription = await asyncio.wait_for(subscribing, timeout=1)
+
+    assert subscription.election_id == "election-id-1"
+    broadcaster._pubsub.subscribe.assert_awaited_once_with("results:election-id-1")
@@ -0,0 +1,107 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.results import ResultsService
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _redis_mock(dirty: bool = False) -> MagicMock:
+    redis_mock = MagicMock()
+    redis_mock.sismember = AsyncMock(return_value=dirty)
+    redis_mock.srem = AsyncMock()
+    return redis_mock
+
+
+@pytest.mark.asyncio
+async def test_get_results_serves_fresh_cache(async_session_mock):
+    cached = SimpleNamespace(results_json='{"cached": true}', updated_at=_now())
+    redis_mock = _redis_mock(dirty=True)
+
+    with patch("app.services.results.redis_client", redis_mock), patch(
+        "app.services.results.ElectionResultsCacheRepository"
+    ) as cache_repo_cls:
+        cache_repo = AsyncMock()
+        cache_repo.read_one.return_value = cached
+        cache_repo_cls.return_value = cache_repo
+
+        result = await ResultsService.get_results_json(async_session_mock, "election-id-1")
+
+        assert result == cached.results_json
+        cache_repo.read_vote_counts.assert_not_awaited()
+        redis_mock.sismember.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_results_serves_stale_cache_without_vote_changes(async_session_mock):
+    cached = SimpleNamespace(
+        results_json='{"cached": true}', updated_at=_now() - timedelta(hours=1)
+    )
+
+    with patch("app.services.results.redis_client", _redis_mock(dirty=False)), patch(
+        "app.services.results.ElectionResultsCacheRepository"
+    ) as cache_repo_cls:
+        cache_repo = AsyncMock()
+        cache_repo.read_one.return_value = cached
+        cache_repo_cls.return_value = cache_repo
+
+        result = await ResultsService.get_results_json(async_session_mock, "election-id-1")
+
+        assert result == cached.results_json
+        cache_repo.upsert.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_results_recomputes_stale_dirty_cache(async_session_mock):
+    cached = SimpleNamespace(
+        results_json='{"cached": true}', updated_at=_now() - timedelta(hours=1)
+    )
+    redis_mock = _redis_mock(dirty=True)
+
+    with patch("app.services.results.redis_client", redis_mock), patch(
+        "app.services.results.ElectionResultsCacheRepository"
+    ) as cache_repo_cls:
+        cache_repo = AsyncMock()
+        cache_repo.read_one.return_value = cached
+        cache_repo.read_vote_counts.return_value = [
+            SimpleNamespace(candidate_id="candidate-id-1", name="Alice", votes=3),
+            SimpleNamespace(candidate_id="candidate-id-2", name="Bob", votes=1),
+            SimpleNamespace(candidate_id="candidate-id-3", name="Carol", votes=0),
+        ]
+        cache_repo_cls.return_value = cache_repo
+
+        result = json.loads(
+            await ResultsService.get_results_json(async_session_mock, "election-id-1")
+        )
+
+        assert result["total_votes"] == 4
+        assert [c["percentage"] for c in result["candidates"]] == [75.0, 25.0, 0.0]
+        redis_mock.srem.assert_awaited_once_with("results:dirty", "election-id-1")
+        cache_repo.upsert.assert_awaited_once()
+        assert cache_repo.upsert.await_args.args[0] == "election-id-1"
+
+
+@pytest.mark.asyncio
+async def test_get_results_unknown_election(async_session_mock):
+    with patch("app.services.results.redis_client", _redis_mock()), patch(
+        "app.services.results.ElectionResultsCacheRepository"
+    ) as cache_repo_cls, patch(
+        "app.services.results.ElectionRepository"
+    ) as election_repo_cls:
+        cache_repo = AsyncMock()
+        cache_repo.read_one.return_value = None
+        cache_repo_cls.return_value = cache_repo
+        election_repo = AsyncMock()
+        election_repo.read_one.return_value = None
+        election_repo_cls.return_value = election_repo
+
+        result = await ResultsService.get_results_json(async_session_mock, "missing-id")
+
+        assert result is None
+        cache_repo.read_vote_counts.assert_not_awaited()
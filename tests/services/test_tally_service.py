@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import WatchError
+
+from app.schemas.vote import VoteChange
+from app.core.settings import settings
+from app.services.tally import TallyService
+
+ENDS_AT = datetime(2030, 1, 1, 12, 0)
+
+
+def _pipeline_mock(current: dict) -> MagicMock:
+    pipe = MagicMock()
+    pipe.watch = AsyncMock()
+    pipe.hgetall = AsyncMock(return_value=current)
+    pipe.execute = AsyncMock()
+    pipeline_cm = MagicMock()
+    pipeline_cm.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline_cm.__aexit__ = AsyncMock(return_value=False)
+
+    redis_mock = MagicMock()
+    redis_mock.pipeline.return_value = pipeline_cm
+    redis_mock.pipe = pipe
+    return redis_mock
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_moves_revote_between_candidates():
+    redis_mock = _pipeline_mock({})
+    redis_mock.pipe.execute.return_value = [8]
+    script_mock = AsyncMock()
+
+    with patch("app.services.tally.redis_client", redis_mock), patch(
+        "app.services.tally._apply_change_script", script_mock
+    ):
+        seqs = await TallyService.apply_changes(
+            [
+                VoteChange(
+                    vote_id="vote-id-1",
+                    election_id="election-id-1",
+                    voter_id="user-id-1",
+                    previous_candidate_id="candidate-id-1",
+                    candidate_id="candidate-id-2",
+                ),
+                VoteChange(
+                    vote_id="vote-id-2",
+                    election_id="election-id-1",
+                    voter_id="user-id-2",
+                    previous_candidate_id="candidate-id-1",
+                    candidate_id="candidate-id-1",
+                ),
+            ]
+        )
+
+    script_mock.assert_awaited_once_with(
+        keys=["tally:election-id-1"],
+        args=["candidate-id-1", "candidate-id-2"],
+        client=redis_mock.pipe,
+    )
+    redis_mock.pipe.execute.assert_awaited_once()
+    assert seqs == [8, 0]
+
+
+@pytest.mark.asyncio
+async def test_reconcile_overwrites_drifted_counters(async_session_mock):
+    redis_mock = _pipeline_mock({"candidate-id-1": "3", "_total": "3", "_seq": "7"})
+
+    with patch("app.services.tally.redis_client", redis_mock), patch(
+        "app.services.tally.VoteRepository"
+    ) as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.count_by_candidate.return_value = {"candidate-id-1": 2, "candidate-id-2": 1}
+        vote_repo_cls.return_value = vote_repo
+
+        fixed = await TallyService.reconcile(async_session_mock, "election-id-1", ENDS_AT)
+
+    assert fixed is True
+    redis_mock.pipe.hset.assert_called_once_with(
+        "tally:election-id-1",
+        mapping={"candidate-id-1": "2", "candidate-id-2": "1", "_total": "3", "_seq": "8"},
+    )
+    redis_mock.pipe.expireat.assert_called_once_with(
+        "tally:election-id-1",
+        int(ENDS_AT.replace(tzinfo=timezone.utc).timestamp())
+        + settings.vote_settings.TALLY_RETENTION_SECONDS,
+    )
+
+
+@pytest.mark.asyncio
+async def test_reconcile_keeps_tallies_of_ended_elections_for_the_retention(async_session_mock):
+    redis_mock = _pipeline_mock({})
+    ended_at = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=30)
+
+    with patch("app.services.tally.redis_client", redis_mock), patch(
+        "app.services.tally.VoteRepository"
+    ) as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.count_by_candidate.return_value = {"candidate-id-1": 1}
+        vote_repo_cls.return_value = vote_repo
+
+        await TallyService.reconcile(async_session_mock, "election-id-1", ended_at)
+
+    _, expires_at = redis_mock.pipe.expireat.call_args.args
+    remaining = expires_at - datetime.now(timezone.utc).timestamp()
+    assert remaining == pytest.approx(settings.vote_settings.TALLY_RETENTION_SECONDS, abs=5)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_ignores_zeroed_counters(async_session_mock):
+    redis_mock = _pipeline_mock(
+        {"candidate-id-1": "2", "candidate-id-2": "0", "_total": "2", "_seq": "3"}
+    )
+
+    with patch("app.services.tally.redis_client", redis_mock), patch(
+        "app.services.tally.VoteRepository"
+    ) as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.count_by_candidate.return_value = {"candidate-id-1": 2}
+        vote_repo_cls.return_value = vote_repo
+
+        fixed = await TallyService.reconcile(async_session_mock, "election-id-1", ENDS_AT)
+
+    assert fixed is False
+    redis_mock.pipe.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_skips_when_counters_move(async_session_mock):
+    redis_mock = _pipeline_mock({"candidate-id-1": "1", "_total": "1"})
+    redis_mock.pipe.execute.side_effect = WatchError()
+
+    with patch("app.services.tally.redis_client", redis_mock), patch(
+        "app.services.tally.VoteRepository"
+    ) as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.count_by_candidate.return_value = {"candidate-id-1": 2}
+        vote_repo_cls.return_value = vote_repo
+
+        fixed = await TallyService.reconcile(async_session_mock, "election-id-1", ENDS_AT)
+
+    assert fixed is False
+
+
+@pytest.mark.asyncio
+async def test_get_tally_unknown_election(async_session_mock):
+    redis_mock = MagicMock()
+    redis_mock.hgetall = AsyncMock(return_value={})
+
+    with patch("app.services.tally.redis_client", redis_mock), patch(
+        "app.services.tally.ElectionRepository"
+    ) as election_repo_cls:
+        election_repo = AsyncMock()
+        election_repo.read_one.return_value = None
+        election_repo_cls.return_value = election_repo
+
+        result = await TallyService.get_tally(async_session_mock, "missing-id")
+
+    assert result is None
@@ -0,0 +1,130 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.token_revocation import (
+    REVOCATION_CHANNEL,
+    REVOKED_INDEX_KEY,
+    TokenRevocationList,
+)
+from app.utils.bloom import BloomFilter
+
+
+def _redis_mock(revoked=(), messages=None) -> MagicMock:
+    pending = messages if messages is not None else []
+
+    async def get_message(**kwargs):
+        if pending:
+            return pending.pop(0)
+        await asyncio.sleep(0.01)
+        return None
+
+    pubsub_mock = MagicMock()
+    pubsub_mock.subscribe = AsyncMock()
+    pubsub_mock.aclose = AsyncMock()
+    pubsub_mock.get_message = get_message
+
+    pipe_mock = MagicMock()
+    pipe_mock.execute = AsyncMock()
+    pipe_mock.__aenter__ = AsyncMock(return_value=pipe_mock)
+    pipe_mock.__aexit__ = AsyncMock(return_value=False)
+
+    redis_mock = MagicMock()
+    redis_mock.get = AsyncMock(return_value=None)
+    redis_mock.zremrangebyscore = AsyncMock()
+    redis_mock.zrangebyscore = AsyncMock(return_value=list(revoked))
+    redis_mock.pubsub.return_value = pubsub_mock
+    redis_mock.pipeline.return_value = pipe_mock
+    return redis_mock
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    for n in range(1000):
+        bloom.add(f"jti-{n}")
+
+    assert all(f"jti-{n}" in bloom for n in range(1000))
+    false_positives = sum(f"other-{n}" in bloom for n in range(10000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_revoke_sets_ttl_to_remaining_lifetime_and_publishes():
+    redis_mock = _redis_mock()
+    expires_at = int(time.time()) + 600
+
+    with patch("app.services.token_revocation.redis_client", redis_mock):
+        await TokenRevocationList().revoke("jti-1", expires_at)
+
+    pipe_mock = redis_mock.pipeline.return_value
+    key, value = pipe_mock.set.call_args.args
+    assert (key, value) == ("revoked:jti-1", "1")
+    assert 590 <= pipe_mock.set.call_args.kwargs["ex"] <= 600
+    pipe_mock.zadd.assert_called_once_with(REVOKED_INDEX_KEY, {"jti-1": expires_at})
+    pipe_mock.publish.assert_called_once_with(REVOCATION_CHANNEL, "jti-1")
+    pipe_mock.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_revoke_skips_expired_tokens():
+    redis_mock = _redis_mock()
+
+    with patch("app.services.token_revocation.redis_client", redis_mock):
+        await TokenRevocationList().revoke("jti-1", int(time.time()) - 1)
+
+    redis_mock.pipeline.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_filter_answers_unrevoked_tokens_without_redis():
+    redis_mock = _redis_mock(revoked=["jti-1"])
+    redis_mock.get.return_value = "1"
+    revocations = TokenRevocationList()
+
+    with patch("app.services.token_revocation.redis_client", redis_mock):
+        await revocations.start()
+        try:
+            assert await revocations.is_revoked("jti-2") is False
+            assert await revocations.is_revoked("jti-1") is True
+        finally:
+            await revocations.stop()
+
+    redis_mock.get.assert_awaited_once_with("revoked:jti-1")
+    assert revocations.local_checks_total == 1
+    assert revocations.redis_checks_total == 1
+
+
+@pytest.mark.asyncio
+async def test_unsynced_checks_go_to_redis():
+    redis_mock = _redis_mock()
+
+    with patch("app.services.token_revocation.redis_client", redis_mock):
+        assert await TokenRevocationList().is_revoked("jti-1") is False
+
+    redis_mock.get.assert_awaited_once_with("revoked:jti-1")
+
+
+@pytest.mark.asyncio
+async def test_published_revocations_reach_the_filter():
+    messages = []
+    redis_mock = _redis_mock(messages=messages)
+    revocations = TokenRevocationList()
+
+    with patch("app.services.token_revocation.redis_client", redis_mock):
+        await revocations.start()
+        try:
+            messages.append({"type": "message", "data": "jti-1"})
+            for _ in range(50):
+                if revocations.revocations_received_total:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert revocations.metrics()["bloom_entries"] == 1
+            await revocations.is_revoked("jti-1")
+        finally:
+            await revocations.stop()
+
+    redis_mock.pubsub.return_value.subscribe.assert_awaited_once_with(REVOCATION_CHANNEL)
+    redis_mock.get.assert_awaited_once_with("revoked:jti-1")
@@ -31,7 +31,7 @@ async def test_create_user_success(async_session_mock):
     with patch("app.services.user.UserRepository") as user_repo_cls, patch(
         "app.services.user.UserProfileRepository"
     ) as profile_repo_cls, patch(
-        "app.services.user.hash_password", return_value="hashed"
+        "app.services.user.password_hasher.hash", new=AsyncMock(return_value="hashed")
     ) as hash_password_mock:
         user_repo = AsyncMock()
         user_repo.read_one.return_value = None
@@ -44,7 +44,7 @@ async def test_create_user_success(async_session_mock):
 
         result = await UserService.create_user(async_session_mock, user_data)
 
-        hash_password_mock.assert_called_once_with(user_data.password)
+        hash_password_mock.assert_awaited_once_with(user_data.password)
         user_repo.read_one.assert_awaited_once()
         user_repo.create.assert_awaited_once()
         profile_repo.create.assert_awaited_once()
@@ -88,7 +88,7 @@ async def test_get_user_by_id_not_found(async_session_mock):
 
 
 @pytest.mark.asyncio
-async def test_update_user_success(async_session_mock):
+async def test_update_user_success(async_session_mock, principal_cache_mock):
     user_id = "user-id-1"
     existing_user = SimpleNamespace(
         id=user_id,
@@ -113,7 +113,7 @@ async def test_update_user_success(async_session_mock):
     )
 
     with patch("app.services.user.UserRepository") as user_repo_cls, patch(
-        "app.services.user.hash_password", return_value="hashed"
+        "app.services.user.password_hasher.hash", new=AsyncMock(return_value="hashed")
     ):
         user_repo = AsyncMock()
         user_repo.read_one.side_effect = [existing_user, None]
@@ -125,6 +125,7 @@ async def test_update_user_success(async_session_mock):
         assert result.email == update_data.email
         assert result.phone == update_data.phone
         user_repo.update.assert_awaited_once()
+        principal_cache_mock.invalidate.assert_awaited_once_with(user_id)
 
 
 @pytest.mark.asyncio
@@ -142,7 +143,7 @@ async def test_update_user_not_found(async_session_mock):
 
 
 @pytest.mark.asyncio
-async def test_delete_user_success(async_session_mock):
+async def test_delete_user_success(async_session_mock, principal_cache_mock):
     user_id = "user-id-1"
 
     with patch("app.services.user.UserRepository") as user_repo_cls:
@@ -154,6 +155,7 @@ async def test_delete_user_success(async_session_mock):
 
         assert result is True
         user_repo.delete.assert_awaited_once()
+        principal_cache_mock.invalidate.assert_awaited_once_with(user_id)
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,40 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.versions import VersionService
+
+
+@pytest.mark.asyncio
+async def test_etag_joins_versions_and_hashes_variant():
+    script_mock = AsyncMock(return_value=["17", "4"])
+
+    with patch("app.services.versions._read_versions_script", script_mock):
+        plain = await VersionService.etag("a", "b")
+        first_page = await VersionService.etag("a", "b", variant="page_size=10")
+        second_page = await VersionService.etag("a", "b", variant="cursor=abc&page_size=10")
+
+    assert plain == '"17-4"'
+    assert first_page.startswith('"17-4-')
+    assert first_page != second_page
+    assert script_mock.await_args.kwargs["keys"] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_etag_is_skipped_when_versions_cannot_be_read():
+    script_mock = AsyncMock(side_effect=ConnectionError("redis down"))
+
+    with patch("app.services.versions._read_versions_script", script_mock):
+        assert await VersionService.etag("a") is None
+
+
+@pytest.mark.asyncio
+async def test_bump_deduplicates_keys():
+    script_mock = AsyncMock()
+
+    with patch("app.services.versions._bump_versions_script", script_mock):
+        await VersionService.bump("a", "b", "a")
+        await VersionService.bump()
+
+    script_mock.assert_awaited_once()
+    assert script_mock.await_args.kwargs["keys"] == ["a", "b"]
@@ -0,0 +1,89 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.schemas.vote import VoteChange
+from app.services.vote_log import VoteLogBuffer
+
+
+def _change(
+    vote_id: str,
+    previous: str = None,
+    candidate: str = None,
+    election_id: str = "election-id-1",
+) -> VoteChange:
+    return VoteChange(
+        vote_id=vote_id,
+        election_id=election_id,
+        voter_id="user-id-1",
+        previous_candidate_id=previous,
+        candidate_id=candidate,
+    )
+
+
+def _running_buffer() -> VoteLogBuffer:
+    buffer = VoteLogBuffer()
+    buffer._task = MagicMock()
+    return buffer
+
+
+def test_record_derives_actions():
+    buffer = _running_buffer()
+
+    buffer.record([_change("vote-id-1", candidate="candidate-id-1")])
+    buffer.record([_change("vote-id-2", previous="candidate-id-1", candidate="candidate-id-2")])
+    buffer.record([_change("vote-id-3", previous="candidate-id-1")])
+    buffer.record(
+        [
+            _change("vote-id-4", previous="candidate-id-1"),
+            _change("vote-id-4", candidate="candidate-id-9", election_id="election-id-2"),
+        ]
+    )
+    buffer.record([_change("vote-id-5", previous="candidate-id-1", candidate="candidate-id-1")])
+
+    assert [(entry["vote_id"], entry["action"]) for entry in buffer._entries] == [
+        ("vote-id-1", "create"),
+        ("vote-id-2", "update"),
+        ("vote-id-3", "delete"),
+        ("vote-id-4", "update"),
+    ]
+
+
+def test_record_drops_entries_when_full():
+    buffer = _running_buffer()
+
+    with patch("app.services.vote_log.settings.vote_settings.VOTE_LOG_BUFFER_SIZE", 2):
+        buffer.record([_change(f"vote-id-{i}", candidate="candidate-id-1") for i in range(5)])
+
+    assert len(buffer._entries) == 2
+    assert buffer.dropped_total == 3
+    assert buffer.metrics()["recorded_total"] == 5
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_batches_and_requeues_failures():
+    buffer = _running_buffer()
+    buffer.record([_change(f"vote-id-{i}", candidate="candidate-id-1") for i in range(5)])
+
+    with patch("app.services.vote_log.settings.vote_settings.VOTE_LOG_BATCH_SIZE", 2), patch(
+        "app.services.vote_log.async_session_maker", MagicMock()
+    ), patch("app.services.vote_log.VoteLogRepository") as repo_cls:
+        repo = AsyncMock()
+        repo.create_many.side_effect = [2, Exception("database unavailable")]
+        repo_cls.return_value = repo
+
+        await buffer.flush()
+
+        assert buffer.written_total == 2
+        assert buffer.failed_flushes_total == 1
+        assert [entry["vote_id"] for entry in buffer._entries] == [
+            "vote-id-2",
+            "vote-id-3",
+            "vote-id-4",
+        ]
+
+        repo.create_many.side_effect = None
+        await buffer.flush()
+
+        assert buffer.written_total == 5
+        assert not buffer._entries
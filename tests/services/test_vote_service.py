@@ -1,11 +1,24 @@
+from datetime import datetime, timedelta
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from app.exceptions.user import PermissionDeniedError, VoteNotFoundError
+from app.exceptions.user import (
+    PermissionDeniedError,
+    VoteNotFoundError,
+    VoteRejectedError,
+)
 from app.models.user import User
-from app.schemas.vote import VoteCreate, VoteUpdate
+from app.schemas.vote import (
+    VoteBatchCreate,
+    VoteChoice,
+    VoteCreate,
+    VoteReceipt,
+    VoteReceiptStatus,
+    VoteRejectionReason,
+    VoteUpdate,
+)
 from app.services.vote import VoteService
 
 
@@ -26,14 +39,345 @@ async def test_create_vote_success(async_session_mock):
 
     with patch("app.services.vote.VoteRepository") as vote_repo_cls:
         vote_repo = AsyncMock()
-        vote_repo.create.return_value = created_vote
+        vote_repo.cast_vote.return_value = (created_vote, None)
         vote_repo_cls.return_value = vote_repo
 
         result = await VoteService.create_vote(async_session_mock, vote_data, current_user)
 
         assert result.id == created_vote.id
         assert result.election_id == vote_data.election_id
-        vote_repo.create.assert_awaited_once()
+        vote_repo.cast_vote.assert_awaited_once()
+        vote_repo.create.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_vote_queue_mode_returns_receipt(async_session_mock):
+    vote_data = VoteCreate(
+        election_id="election-id-1",
+        candidate_id="candidate-id-1",
+    )
+    current_user = SimpleNamespace(id="user-id-1")
+
+    with patch("app.services.vote.VoteRepository") as vote_repo_cls, patch(
+        "app.services.vote.settings.vote_settings.VOTE_INGESTION_MODE", "queue"
+    ), patch(
+        "app.services.vote.VoteQueueService.enqueue_vote",
+        new=AsyncMock(
+            side_effect=lambda vote: VoteReceipt(
+                vote_id=vote.id, status=VoteReceiptStatus.QUEUED
+            )
+        ),
+    ) as enqueue_mock:
+        vote_repo = AsyncMock()
+        vote_repo.read_ballot_rules.return_value = _ballot_rule_rows(
+            "election-id-1", ["candidate-id-1"]
+        )
+        vote_repo_cls.return_value = vote_repo
+
+        result = await VoteService.create_vote(async_session_mock, vote_data, current_user)
+
+        assert result.status == VoteReceiptStatus.QUEUED
+        enqueue_mock.assert_awaited_once()
+        queued_vote = enqueue_mock.await_args.args[0]
+        assert queued_vote.id == result.vote_id
+        assert queued_vote.voter_id == current_user.id
+        vote_repo.cast_vote.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_vote_queue_mode_rejects_before_queueing(async_session_mock):
+    vote_data = VoteCreate(
+        election_id="election-id-1",
+        candidate_id="foreign-candidate",
+    )
+    current_user = SimpleNamespace(id="user-id-1")
+
+    with patch("app.services.vote.VoteRepository") as vote_repo_cls, patch(
+        "app.services.vote.settings.vote_settings.VOTE_INGESTION_MODE", "queue"
+    ), patch(
+        "app.services.vote.VoteQueueService.enqueue_vote", new=AsyncMock()
+    ) as enqueue_mock:
+        vote_repo = AsyncMock()
+        vote_repo.read_ballot_rules.return_value = _ballot_rule_rows(
+            "election-id-1", ["candidate-id-1"]
+        )
+        vote_repo_cls.return_value = vote_repo
+
+        with pytest.raises(VoteRejectedError) as exc_info:
+            await VoteService.create_vote(async_session_mock, vote_data, current_user)
+
+        assert exc_info.value.reason == VoteRejectionReason.CANDIDATE_NOT_IN_ELECTION
+        enqueue_mock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_vote_rejected(async_session_mock):
+    vote_data = VoteCreate(
+        election_id="election-id-1",
+        candidate_id="candidate-id-1",
+    )
+    current_user = SimpleNamespace(id="user-id-1")
+
+    with patch("app.services.vote.VoteRepository") as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.cast_vote.return_value = (
+            None,
+            VoteRejectionReason.ELECTION_ENDED,
+        )
+        vote_repo_cls.return_value = vote_repo
+
+        with pytest.raises(VoteRejectedError) as exc_info:
+            await VoteService.create_vote(async_session_mock, vote_data, current_user)
+
+        assert exc_info.value.status_code == 409
+        assert exc_info.value.detail["reason"] == "election_ended"
+
+
+@pytest.mark.asyncio
+async def test_create_vote_rejected_unknown_election(async_session_mock):
+    vote_data = VoteCreate(
+        election_id="missing-election",
+        candidate_id="candidate-id-1",
+    )
+    current_user = SimpleNamespace(id="user-id-1")
+
+    with patch("app.services.vote.VoteRepository") as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.cast_vote.return_value = (
+            None,
+            VoteRejectionReason.ELECTION_NOT_FOUND,
+        )
+        vote_repo_cls.return_value = vote_repo
+
+        with pytest.raises(VoteRejectedError) as exc_info:
+            await VoteService.create_vote(async_session_mock, vote_data, current_user)
+
+        assert exc_info.value.status_code == 404
+
+
+def _ballot_rule_rows(election_id, candidate_ids, max_votes=1, allow_revoting=True):
+    now = datetime.now()
+    return [
+        SimpleNamespace(
+            election_id=election_id,
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1),
+            max_votes=max_votes,
+            allow_revoting=allow_revoting,
+            candidate_id=candidate_id,
+        )
+        for candidate_id in candidate_ids
+    ]
+
+
+def _insert_all(rows):
+    return {row["id"] for row in rows}
+
+
+@pytest.mark.asyncio
+async def test_create_votes_batch_reports_each_item(async_session_mock):
+    batch_data = VoteBatchCreate(
+        votes=[
+            VoteCreate(election_id="election-id-1", candidate_id="candidate-id-1"),
+            VoteCreate(election_id="election-id-1", candidate_id="candidate-id-2"),
+            VoteCreate(election_id="election-id-2", candidate_id="candidate-id-3"),
+            VoteCreate(election_id="missing-election", candidate_id="candidate-id-1"),
+            VoteCreate(election_id="election-id-2", candidate_id="foreign-candidate"),
+        ]
+    )
+    current_user = SimpleNamespace(id="user-id-1")
+
+    with patch("app.services.vote.VoteRepository") as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.read_ballot_rules.return_value = _ballot_rule_rows(
+            "election-id-1", ["candidate-id-1", "candidate-id-2"]
+        ) + _ballot_rule_rows("election-id-2", ["candidate-id-3"], max_votes=2)
+        vote_repo.read_voter_ballots.return_value = []
+        vote_repo.insert_ballots.side_effect = _insert_all
+        vote_repo_cls.return_value = vote_repo
+
+        result = await VoteService.create_votes_batch(
+            async_session_mock, batch_data, current_user
+        )
+
+        assert result.accepted == 2
+        assert result.rejected == 3
+        assert [item.reason for item in result.results] == [
+            None,
+            VoteRejectionReason.VOTE_LIMIT_REACHED,
+            None,
+            VoteRejectionReason.ELECTION_NOT_FOUND,
+            VoteRejectionReason.CANDIDATE_NOT_IN_ELECTION,
+        ]
+
+        vote_repo.insert_ballots.assert_awaited_once()
+        inserted_rows = vote_repo.insert_ballots.await_args.args[0]
+        assert [row["candidate_id"] for row in inserted_rows] == [
+            "candidate-id-1",
+            "candidate-id-3",
+        ]
+        assert [row["single_choice"] for row in inserted_rows] == [True, False]
+        assert inserted_rows[0]["id"] == result.results[0].vote.id
+
+
+@pytest.mark.asyncio
+async def test_create_votes_batch_counts_existing_votes(async_session_mock):
+    batch_data = VoteBatchCreate(
+        votes=[
+            VoteCreate(election_id="election-id-1", candidate_id="candidate-id-1"),
+            VoteCreate(election_id="election-id-1", candidate_id="candidate-id-2"),
+        ]
+    )
+    current_user = SimpleNamespace(id="user-id-1")
+
+    with patch("app.services.vote.VoteRepository") as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.read_ballot_rules.return_value = _ballot_rule_rows(
+            "election-id-1",
+            ["candidate-id-1", "candidate-id-2"],
+            allow_revoting=False,
+        )
+        vote_repo.read_voter_ballots.return_value = [
+            SimpleNamespace(
+                id="vote-id-1",
+                election_id="election-id-1",
+                voter_id="user-id-1",
+                candidate_id="candidate-id-1",
+            )
+        ]
+        vote_repo_cls.return_value = vote_repo
+
+        result = await VoteService.create_votes_batch(
+            async_session_mock, batch_data, current_user
+        )
+
+        assert result.accepted == 0
+        assert [item.reason for item in result.results] == [
+            VoteRejectionReason.ALREADY_VOTED_FOR_CANDIDATE,
+            VoteRejectionReason.REVOTING_DISABLED,
+        ]
+        vote_repo.insert_ballots.assert_awaited_once_with([])
+
+
+@pytest.mark.asyncio
+async def test_create_votes_batch_rejects_ballots_lost_to_a_concurrent_vote(
+    async_session_mock, tally_changes_mock
+):
+    batch_data = VoteBatchCreate(
+        votes=[
+            VoteCreate(election_id="election-id-1", candidate_id="candidate-id-1"),
+            VoteCreate(election_id="election-id-2", candidate_id="candidate-id-2"),
+        ]
+    )
+    current_user = SimpleNamespace(id="user-id-1")
+
+    with patch("app.services.vote.VoteRepository") as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.read_ballot_rules.return_value = _ballot_rule_rows(
+            "election-id-1", ["candidate-id-1"], allow_revoting=False
+        ) + _ballot_rule_rows("election-id-2", ["candidate-id-2"])
+        vote_repo.read_voter_ballots.return_value = []
+        vote_repo.insert_ballots.side_effect = lambda rows: _insert_all(rows[1:])
+        vote_repo_cls.return_value = vote_repo
+
+        result = await VoteService.create_votes_batch(
+            async_session_mock, batch_data, current_user
+        )
+
+    assert [item.reason for item in result.results] == [
+        VoteRejectionReason.REVOTING_DISABLED,
+        None,
+    ]
+    published = tally_changes_mock.await_args.args[0]
+    assert [change.election_id for change in published] == ["election-id-2"]
+
+
+def _replaced_vote(candidate_id: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id="vote-id-1",
+        election_id="election-id-1",
+        voter_id="user-id-1",
+        candidate_id=candidate_id,
+        created_at=datetime(2025, 1, 1, 12, 0),
+    )
+
+
+@pytest.mark.asyncio
+async def test_replace_user_vote_moves_vote(async_session_mock, tally_changes_mock):
+    current_user = SimpleNamespace(id="user-id-1")
+
+    with patch("app.services.vote.VoteRepository") as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.replace_vote.return_value = (
+            _replaced_vote("candidate-id-2"),
+            "candidate-id-1",
+            None,
+        )
+        vote_repo_cls.return_value = vote_repo
+
+        result = await VoteService.replace_user_vote(
+            async_session_mock,
+            "election-id-1",
+            VoteChoice(candidate_id="candidate-id-2"),
+            current_user,
+        )
+
+        assert result.candidate_id == "candidate-id-2"
+        vote_repo.replace_vote.assert_awaited_once()
+        vote_repo.read_one.assert_not_awaited()
+
+        (change,) = tally_changes_mock.await_args.args[0]
+        assert change.previous_candidate_id == "candidate-id-1"
+        assert change.candidate_id == "candidate-id-2"
+
+
+@pytest.mark.asyncio
+async def test_replace_user_vote_unchanged(async_session_mock, tally_changes_mock):
+    current_user = SimpleNamespace(id="user-id-1")
+
+    with patch("app.services.vote.VoteRepository") as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.replace_vote.return_value = (
+            _replaced_vote("candidate-id-1"),
+            "candidate-id-1",
+            None,
+        )
+        vote_repo_cls.return_value = vote_repo
+
+        result = await VoteService.replace_user_vote(
+            async_session_mock,
+            "election-id-1",
+            VoteChoice(candidate_id="candidate-id-1"),
+            current_user,
+        )
+
+        assert result.id == "vote-id-1"
+        tally_changes_mock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_replace_user_vote_revoting_disabled(async_session_mock):
+    current_user = SimpleNamespace(id="user-id-1")
+
+    with patch("app.services.vote.VoteRepository") as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.replace_vote.return_value = (
+            None,
+            None,
+            VoteRejectionReason.REVOTING_DISABLED,
+        )
+        vote_repo_cls.return_value = vote_repo
+
+        with pytest.raises(VoteRejectedError) as exc_info:
+            await VoteService.replace_user_vote(
+                async_session_mock,
+                "election-id-1",
+                VoteChoice(candidate_id="candidate-id-2"),
+                current_user,
+            )
+
+        assert exc_info.value.status_code == 409
+        assert exc_info.value.reason == VoteRejectionReason.REVOTING_DISABLED
 
 
 @pytest.mark.asyncio
@@ -50,27 +394,22 @@ async def test_get_vote_by_id_not_found(async_session_mock):
 
 
 @pytest.mark.asyncio
-async def test_update_vote_success(async_session_mock):
+async def test_update_vote_success(async_session_mock, tally_changes_mock):
     vote_id = "vote-id-1"
-    existing_vote = SimpleNamespace(
-        id=vote_id,
-        election_id="election-id-1",
-        voter_id="user-id-1",
-        candidate_id="candidate-id-1",
-    )
     updated_vote = SimpleNamespace(
         id=vote_id,
         election_id="election-id-1",
         voter_id="user-id-1",
         candidate_id="candidate-id-2",
+        created_at=None,
+        previous_candidate_id="candidate-id-1",
     )
     current_user = SimpleNamespace(id="user-id-1")
     update_data = VoteUpdate(candidate_id="candidate-id-2")
 
     with patch("app.services.vote.VoteRepository") as vote_repo_cls:
         vote_repo = AsyncMock()
-        vote_repo.read_one.return_value = existing_vote
-        vote_repo.update.return_value = updated_vote
+        vote_repo.update_owned.return_value = (updated_vote, None)
         vote_repo_cls.return_value = vote_repo
 
         result = await VoteService.update_vote(
@@ -78,7 +417,41 @@ async def test_update_vote_success(async_session_mock):
         )
 
         assert result.candidate_id == update_data.candidate_id
-        vote_repo.update.assert_awaited_once()
+        kwargs = vote_repo.update_owned.await_args.kwargs
+        assert (kwargs["vote_id"], kwargs["voter_id"], kwargs["candidate_id"]) == (
+            vote_id,
+            current_user.id,
+            "candidate-id-2",
+        )
+        vote_repo.read_one.assert_not_awaited()
+        vote_repo.read_voter_id.assert_not_awaited()
+
+        (change,) = tally_changes_mock.await_args.args[0]
+        assert change.previous_candidate_id == "candidate-id-1"
+        assert change.candidate_id == "candidate-id-2"
+
+
+@pytest.mark.asyncio
+async def test_update_vote_rejected_by_election_rules(async_session_mock, tally_changes_mock):
+    current_user = SimpleNamespace(id="user-id-1")
+    update_data = VoteUpdate(candidate_id="candidate-id-2")
+
+    with patch("app.services.vote.VoteRepository") as vote_repo_cls:
+        vote_repo = AsyncMock()
+        vote_repo.update_owned.return_value = (
+            None,
+            VoteRejectionReason.REVOTING_DISABLED,
+        )
+        vote_repo_cls.return_value = vote_repo
+
+        with pytest.raises(VoteRejectedError) as exc_info:
+            await VoteService.update_vote(
+                async_session_mock, "vote-id-1", update_data, current_user
+            )
+
+        assert exc_info.value.reason == VoteRejectionReason.REVOTING_DISABLED
+        vote_repo.read_voter_id.assert_not_awaited()
+        tally_changes_mock.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -89,7 +462,8 @@ async def test_update_vote_not_found(async_session_mock):
 
     with patch("app.services.vote.VoteRepository") as vote_repo_cls:
         vote_repo = AsyncMock()
-        vote_repo.read_one.return_value = None
+        vote_repo.update_owned.return_value = (None, None)
+        vote_repo.read_voter_id.return_value = None
         vote_repo_cls.return_value = vote_repo
 
         with pytest.raises(VoteNotFoundError):
@@ -99,20 +473,15 @@ async def test_update_vote_not_found(async_session_mock):
 
 
 @pytest.mark.asyncio
-async def test_update_vote_permission_denied(async_session_mock):
+async def test_update_vote_permission_denied(async_session_mock, tally_changes_mock):
     vote_id = "vote-id-1"
-    existing_vote = SimpleNamespace(
-        id=vote_id,
-        election_id="election-id-1",
-        voter_id="another-user",
-        candidate_id="candidate-id-1",
-    )
     current_user = SimpleNamespace(id="user-id-1")
     update_data = VoteUpdate(candidate_id="candidate-id-2")
 
     with patch("app.services.vote.VoteRepository") as vote_repo_cls:
         vote_repo = AsyncMock()
-        vote_repo.read_one.return_value = existing_vote
+        vote_repo.update_owned.return_value = (None, None)
+        vote_repo.read_voter_id.return_value = "another-user"
         vote_repo_cls.return_value = vote_repo
 
         with pytest.raises(PermissionDeniedError):
@@ -120,22 +489,24 @@ async def test_update_vote_permission_denied(async_session_mock):
                 async_session_mock, vote_id, update_data, current_user
             )
 
+        tally_changes_mock.assert_not_awaited()
+
 
 @pytest.mark.asyncio
-async def test_delete_vote_success(async_session_mock):
+async def test_delete_vote_success(async_session_mock, tally_changes_mock, row_counter_mock):
     vote_id = "vote-id-1"
-    existing_vote = SimpleNamespace(
+    deleted_vote = SimpleNamespace(
         id=vote_id,
         election_id="election-id-1",
         voter_id="user-id-1",
         candidate_id="candidate-id-1",
+        created_at=None,
     )
     current_user = SimpleNamespace(id="user-id-1")
 
     with patch("app.services.vote.VoteRepository") as vote_repo_cls:
         vote_repo = AsyncMock()
-        vote_repo.read_one.return_value = existing_vote
-        vote_repo.delete.return_value = True
+        vote_repo.delete_owned.return_value = deleted_vote
         vote_repo_cls.return_value = vote_repo
 
         result = await VoteService.delete_vote(
@@ -143,7 +514,15 @@ async def test_delete_vote_success(async_session_mock):
         )
 
         assert result is True
-        vote_repo.delete.assert_awaited_once()
+        vote_repo.delete_owned.assert_awaited_once_with(
+            vote_id=vote_id, voter_id=current_user.id
+        )
+        vote_repo.read_voter_id.assert_not_awaited()
+
+        (change,) = tally_changes_mock.await_args.args[0]
+        assert change.previous_candidate_id == "candidate-id-1"
+        assert change.candidate_id is None
+        assert row_counter_mock.await_args.args[1] == -1
 
 
 @pytest.mark.asyncio
@@ -153,35 +532,24 @@ async def test_delete_vote_not_found(async_session_mock):
 
     with patch("app.services.vote.VoteRepository") as vote_repo_cls:
         vote_repo = AsyncMock()
-        vote_repo.read_one.return_value = None
+        vote_repo.delete_owned.return_value = None
+        vote_repo.read_voter_id.return_value = None
         vote_repo_cls.return_value = vote_repo
 
         with pytest.raises(VoteNotFoundError):
-            await VoteService.delete_vote(
-                async_session_mock, vote_id, current_user
-            )
+            await VoteService.delete_vote(async_session_mock, vote_id, current_user)
 
 
 @pytest.mark.asyncio
 async def test_delete_vote_permission_denied(async_session_mock):
     vote_id = "vote-id-1"
-    existing_vote = SimpleNamespace(
-        id=vote_id,
-        election_id="election-id-1",
-        voter_id="another-user",
-        candidate_id="candidate-id-1",
-    )
     current_user = SimpleNamespace(id="user-id-1")
 
     with patch("app.services.vote.VoteRepository") as vote_repo_cls:
         vote_repo = AsyncMock()
-        vote_repo.read_one.return_value = existing_vote
-        vote_repo.delete.return_value = False
+        vote_repo.delete_owned.return_value = None
+        vote_repo.read_voter_id.return_value = "another-user"
         vote_repo_cls.return_value = vote_repo
 
         with pytest.raises(PermissionDeniedError):
-            await VoteService.delete_vote(
-                async_session_mock, vote_id, current_user
-            )
-
-
+            await VoteService.delete_vote(async_session_mock, vote_id, current_user)
@@ -0,0 +1,61 @@
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from app.models.vote import Vote
+from app.services.vote import VoteService
+
+
+async def _seed_votes(session) -> None:
+    session.add_all(
+        [
+            Vote(
+                id=f"vote-id-{index}",
+                election_id="election-id-1" if index < 5 else "election-id-2",
+                voter_id=f"user-id-{index % 3}",
+                candidate_id="candidate-id-1",
+                created_at=datetime(2025, 1, 1, 12, 0, index),
+            )
+            for index in range(7)
+        ]
+    )
+    await session.commit()
+    session.expunge_all()
+
+
+async def _collect(stream) -> list[bytes]:
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_election_votes_are_streamed_in_chunks(sqlite_session):
+    await _seed_votes(sqlite_session)
+
+    with patch("app.services.vote.settings.vote_settings.VOTE_STREAM_CHUNK_SIZE", 2):
+        chunks = await _collect(
+            VoteService.stream_votes_by_election(sqlite_session, "election-id-1")
+        )
+
+    # Opening bracket, three chunks of at most two votes, closing bracket.
+    assert len(chunks) == 5
+    votes = json.loads(b"".join(chunks))
+    assert sorted(vote["id"] for vote in votes) == [f"vote-id-{index}" for index in range(5)]
+    assert votes[0]["created_at"] == "2025-01-01T12:00:00"
+    assert len(sqlite_session.identity_map) == 0
+
+
+@pytest.mark.asyncio
+async def test_user_votes_stream_and_empty_result(sqlite_session):
+    await _seed_votes(sqlite_session)
+
+    user_votes = json.loads(
+        b"".join(await _collect(VoteService.stream_votes_by_user(sqlite_session, "user-id-0")))
+    )
+    no_votes = b"".join(
+        await _collect(VoteService.stream_votes_by_election(sqlite_session, "missing-id"))
+    )
+
+    assert sorted(vote["id"] for vote in user_votes) == ["vote-id-0", "vote-id-3", "vote-id-6"]
+    assert no_votes == b"[]"
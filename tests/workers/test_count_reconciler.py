@@ -0,0 +1,28 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.workers.count_reconciler import RECONCILE_LOCK_KEY, CountReconciler
+
+
+@pytest.mark.asyncio
+async def test_reconcile_runs_only_in_the_worker_holding_the_lock():
+    session_cm = MagicMock()
+    session_cm.__aenter__ = AsyncMock()
+    session_cm.__aexit__ = AsyncMock(return_value=False)
+    reconciler = CountReconciler()
+
+    with patch("app.workers.count_reconciler.redis_client") as redis_mock, patch(
+        "app.workers.count_reconciler.async_session_maker", return_value=session_cm
+    ), patch(
+        "app.workers.count_reconciler.CountService.reconcile", AsyncMock(return_value=True)
+    ) as reconcile_mock:
+        redis_mock.set = AsyncMock(side_effect=[True, None])
+        await reconciler.reconcile_counters()
+        await reconciler.reconcile_counters()
+
+    assert redis_mock.set.await_args.args[0] == RECONCILE_LOCK_KEY
+    assert redis_mock.set.await_args.kwargs["nx"] is True
+    assert reconciler.runs_total == 1
+    assert reconciler.skipped_runs_total == 1
+    assert reconciler.fixed_total == reconcile_mock.await_count
@@ -0,0 +1,35 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.workers.tally_reconciler import RECONCILE_LOCK_KEY, TallyReconciler
+
+
+@pytest.mark.asyncio
+async def test_reconcile_runs_only_in_the_worker_holding_the_lock():
+    session_cm = MagicMock()
+    session_cm.__aenter__ = AsyncMock()
+    session_cm.__aexit__ = AsyncMock(return_value=False)
+    reconciler = TallyReconciler()
+
+    with patch("app.workers.tally_reconciler.redis_client") as redis_mock, patch(
+        "app.workers.tally_reconciler.async_session_maker", return_value=session_cm
+    ), patch("app.workers.tally_reconciler.ElectionRepository") as election_repo_cls, patch(
+        "app.workers.tally_reconciler.TallyService.reconcile", AsyncMock(return_value=True)
+    ) as reconcile_mock:
+        election_repo = AsyncMock()
+        election_repo.read_open_windows.return_value = [
+            ("election-id-1", datetime(2030, 1, 1))
+        ]
+        election_repo_cls.return_value = election_repo
+        redis_mock.set = AsyncMock(side_effect=[True, None])
+
+        await reconciler.reconcile_open_elections()
+        await reconciler.reconcile_open_elections()
+
+    assert redis_mock.set.await_args.args[0] == RECONCILE_LOCK_KEY
+    assert redis_mock.set.await_args.kwargs["nx"] is True
+    reconcile_mock.assert_awaited_once()
+    assert reconciler.runs_total == 1
+    assert reconciler.skipped_runs_total == 1
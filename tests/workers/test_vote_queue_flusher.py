@@ -0,0 +1,103 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.schemas.vote import VoteRejectionReason
+from app.workers.vote_queue import VoteQueueFlusher
+
+
+def _entry(vote_id: str, candidate_id: str = "candidate-id-1") -> dict:
+    return {
+        "id": vote_id,
+        "election_id": "election-id-1",
+        "voter_id": "user-id-1",
+        "candidate_id": candidate_id,
+        "created_at": datetime(2025, 1, 1, 12, 0).isoformat(),
+    }
+
+
+def _redis_mock() -> MagicMock:
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    pipeline_cm = MagicMock()
+    pipeline_cm.__aenter__ = AsyncMock(return_value=pipe)
+    pipeline_cm.__aexit__ = AsyncMock(return_value=False)
+
+    redis_mock = MagicMock()
+    redis_mock.pipeline.return_value = pipeline_cm
+    redis_mock.pipe = pipe
+    return redis_mock
+
+
+@pytest.mark.asyncio
+async def test_flush_applies_batch_and_acknowledges_entries():
+    entries = [
+        ("1-0", _entry("vote-id-1")),
+        ("2-0", _entry("vote-id-2", candidate_id="candidate-id-2")),
+        ("3-0", None),
+    ]
+    redis_mock = _redis_mock()
+
+    with patch("app.workers.vote_queue.redis_client", redis_mock), patch(
+        "app.workers.vote_queue.async_session_maker", MagicMock()
+    ), patch(
+        "app.workers.vote_queue.VoteService.apply_ballots",
+        new=AsyncMock(return_value=[None, VoteRejectionReason.VOTE_LIMIT_REACHED]),
+    ) as apply_mock, patch(
+        "app.workers.vote_queue.VoteQueueService.record_outcomes", new=AsyncMock()
+    ) as record_mock:
+        flusher = VoteQueueFlusher()
+        await flusher._flush(entries)
+
+        ballots = apply_mock.await_args.args[1]
+        assert [ballot.id for ballot in ballots] == ["vote-id-1", "vote-id-2"]
+        assert ballots[0].created_at == datetime(2025, 1, 1, 12, 0)
+
+        record_mock.assert_awaited_once_with(
+            [
+                ("vote-id-1", None),
+                ("vote-id-2", VoteRejectionReason.VOTE_LIMIT_REACHED),
+            ]
+        )
+        redis_mock.pipe.xack.assert_called_once()
+        assert redis_mock.pipe.xack.call_args.args[2:] == ("1-0", "2-0", "3-0")
+        redis_mock.pipe.xdel.assert_called_once()
+
+        assert flusher.accepted_total == 1
+        assert flusher.rejected_total == 1
+        assert flusher.last_batch_size == 3
+
+
+@pytest.mark.asyncio
+async def test_flush_retries_one_by_one_after_constraint_violation():
+    entries = [
+        ("1-0", _entry("vote-id-1")),
+        ("2-0", _entry("vote-id-2", candidate_id="deleted-candidate")),
+    ]
+    redis_mock = _redis_mock()
+
+    async def apply_ballots(session, ballots):
+        if any(ballot.candidate_id == "deleted-candidate" for ballot in ballots):
+            raise ValueError("foreign key violation")
+        return [None for _ in ballots]
+
+    with patch("app.workers.vote_queue.redis_client", redis_mock), patch(
+        "app.workers.vote_queue.async_session_maker", MagicMock()
+    ), patch(
+        "app.workers.vote_queue.VoteService.apply_ballots",
+        new=AsyncMock(side_effect=apply_ballots),
+    ) as apply_mock, patch(
+        "app.workers.vote_queue.VoteQueueService.record_outcomes", new=AsyncMock()
+    ) as record_mock:
+        flusher = VoteQueueFlusher()
+        await flusher._flush(entries)
+
+        assert apply_mock.await_count == 3
+        record_mock.assert_awaited_once_with(
+            [
+                ("vote-id-1", None),
+                ("vote-id-2", VoteRejectionReason.ELECTION_CHANGED),
+            ]
+        )
+        assert redis_mock.pipe.xack.call_args.args[2:] == ("1-0", "2-0")